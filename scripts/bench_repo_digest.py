@@ -0,0 +1,59 @@
+"""Time build_repo_digest on synthetic monorepo trees of growing size.
+
+Usage: python scripts/bench_repo_digest.py [--sizes 25000,50000,100000,200000]
+
+Every tree holds one package per 50 files, each with its own package.json, so the
+number of project roots grows with the tree. Digest time should grow linearly:
+the per-path column stays roughly flat across sizes.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from lms_llmsTxt.models import RepositoryMaterial
+from lms_llmsTxt.repo_digest import build_repo_digest
+
+FILES_PER_PACKAGE = 50
+
+
+def synthetic_tree(size: int) -> str:
+    paths: list[str] = []
+    for index in range(size):
+        package = index // FILES_PER_PACKAGE
+        slot = index % FILES_PER_PACKAGE
+        if slot == 0:
+            paths.append(f"packages/group{package % 40}/pkg{package}/package.json")
+        else:
+            paths.append(f"packages/group{package % 40}/pkg{package}/src/module{slot % 7}/file{slot}.ts")
+    return "\n".join(paths)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="25000,50000,100000,200000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'paths':>8} {'roots':>6} {'best s':>8} {'us/path':>8}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        material = RepositoryMaterial(
+            repo_url="https://github.com/example/monorepo",
+            file_tree=synthetic_tree(size),
+            readme_content="# Monorepo\n\nSynthetic benchmark tree.",
+            package_files="",
+            default_branch="main",
+            is_private=False,
+        )
+        material.path_index  # parse the tree outside the timed region
+        best = float("inf")
+        for _ in range(max(1, args.repeat)):
+            started = time.perf_counter()
+            build_repo_digest(material, topic="Monorepo")
+            best = min(best, time.perf_counter() - started)
+        roots = -(-size // FILES_PER_PACKAGE)
+        print(f"{size:>8} {roots:>6} {best:>8.2f} {best / size * 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
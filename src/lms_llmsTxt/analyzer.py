@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import heapq
 import logging
 import re
 from collections import defaultdict
-from typing import Any, Dict, Iterable, List, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 
 import requests
 
 from .github import construct_github_file_url, fetch_file_content, owner_repo_from_url
+from .http_client import shared_session
+from .lm_cache import CachedPredict
 try:
     import dspy
 except ImportError:
@@ -19,11 +26,15 @@ except Exception:  # pragma: no cover - only used when real DSPy is installed
     AdapterParseError = ()  # type: ignore[assignment]
 
 from .models import AnalyzerTrace, LLMsDocument, LLMsLinkEntry, LLMsSection
+from .path_index import RepoPathIndex
+from .url_liveness import cached_liveness, record_liveness
 from .repo_digest import RepoDigest
 from .signatures import (
     AnalyzeCodeStructure,
     AnalyzeRepository,
     AnalyzeRepositoryFromDigest,
+    AnalyzeRepositoryFused,
+    AnalyzeRepositoryFusedFromDigest,
     GenerateUsageExamples,
     PlanLLMsSections,
     SynthesizeLLMsSectionNotes,
@@ -32,30 +43,66 @@ from .signatures import (
 logger = logging.getLogger(__name__)
 
 _URL_VALIDATION_TIMEOUT = 5
-_URL_SESSION = requests.Session()
+# "network" probes every page URL. "trust-tree" assumes the fetched tree matches the
+# linked ref: links into this repository for a path in that tree are kept without
+# any check, and every other URL is still probed.
+LINK_VALIDATION_MODES = ("network", "trust-tree")
+_URL_VALIDATION_WORKERS = 8
+_URL_VALIDATION_BUDGET_SECONDS: float | None = 30.0
+_URL_SESSION = shared_session()
 _URL_HEADERS = {"User-Agent": "lms-lmstxt"}
-
-
+# "staged" makes one structured-output call per analyzer step; "fused" asks for every
+# field in one call (from the digest when one is given) and re-runs only the steps
+# whose fields came back unusable.
+ANALYZER_MODES = ("staged", "fused")
+_FUSED_STAGE_FIELDS: dict[str, tuple[str, ...]] = {
+    "analyze_repo": ("project_purpose", "key_concepts", "architecture_overview"),
+    "analyze_repo_digest": ("project_purpose", "key_concepts", "architecture_overview"),
+    "analyze_structure": ("important_directories", "entry_points", "development_info"),
+    "generate_examples": ("usage_examples",),
+    "plan_sections": ("included_sections", "preferred_section_order", "remember_bullets"),
+    "synthesize_section_notes": ("section_notes",),
+}
+
+
+def configure_url_validation(*, workers: int | None = None, budget_seconds: float | None = None) -> None:
+    """Set the worker count and wall-clock budget (``<= 0`` disables it) for link validation."""
+    global _URL_VALIDATION_WORKERS, _URL_VALIDATION_BUDGET_SECONDS
+    if workers is not None:
+        _URL_VALIDATION_WORKERS = max(1, int(workers))
+    if budget_seconds is not None:
+        _URL_VALIDATION_BUDGET_SECONDS = float(budget_seconds) if budget_seconds > 0 else None
+
+
+_PART_SUFFIX_RE = re.compile(r"\.(mdx?|rst|txt|py|ipynb|js|ts|html)$", re.I)
+_PART_ORDINAL_RE = re.compile(r"^\d+[_-]*")
+_PART_SEPARATOR_RE = re.compile(r"[-_\s]+")
+_README_RE = re.compile(r"(^|/)README\.md$", re.I)
+_INDEX_PAGE_RE = re.compile(r"(^|/)index(\.mdx?|\.html?)?$")
+_ACRONYMS = {
+    "api": "API",
+    "sdk": "SDK",
+    "cli": "CLI",
+    "ui": "UI",
+    "llm": "LLM",
+    "mcp": "MCP",
+    "rest": "REST",
+    "json": "JSON",
+    "faq": "FAQ",
+    "repl": "REPL",
+}
+
+
+@lru_cache(maxsize=8192)
 def _clean_path_part(part: str) -> str:
-    part = re.sub(r"\.(mdx?|rst|txt|py|ipynb|js|ts|html)$", "", part, flags=re.I)
+    # Directory names repeat across thousands of paths, so segments are cleaned once.
+    part = _PART_SUFFIX_RE.sub("", part)
     part = part.strip("_-. ")
-    part = re.sub(r"^\d+[_-]*", "", part)
+    part = _PART_ORDINAL_RE.sub("", part)
     lower = part.lower()
-    acronyms = {
-        "api": "API",
-        "sdk": "SDK",
-        "cli": "CLI",
-        "ui": "UI",
-        "llm": "LLM",
-        "mcp": "MCP",
-        "rest": "REST",
-        "json": "JSON",
-        "faq": "FAQ",
-        "repl": "REPL",
-    }
-    if lower in acronyms:
-        return acronyms[lower]
-    return " ".join(piece.capitalize() for piece in re.split(r"[-_\s]+", part) if piece)
+    if lower in _ACRONYMS:
+        return _ACRONYMS[lower]
+    return " ".join(piece.capitalize() for piece in _PART_SEPARATOR_RE.split(part) if piece)
 
 
 def _platform_from_path(path: str) -> str:
@@ -90,7 +137,7 @@ def _topic_from_path(path: str) -> str:
 
 
 def _nicify_title(path: str) -> str:
-    if re.search(r"(^|/)README\.md$", path, flags=re.I):
+    if _README_RE.search(path):
         return "README"
     return _topic_from_path(path) or path
 
@@ -138,7 +185,7 @@ def _score(path: str) -> float:
         score += 5
     if any(hint in lower for hint in ["tutorial", "example", "how-to", "demo"]):
         score += 3
-    if re.search(r"(^|/)index(\.mdx?|\.html?)?$", lower):
+    if _INDEX_PAGE_RE.search(lower):
         score += 2
     score -= lower.count("/") * 0.1
     return score
@@ -157,16 +204,58 @@ TAXONOMY: List[Tuple[str, re.Pattern]] = [
         re.compile(r"(contributing|changelog|release|security|license|benchmark)", re.I),
     ),
 ]
+# One pass over "path\ntitle" picks the first TAXONOMY entry matching either: each
+# branch is a lookahead tried in TAXONOMY order, so earlier sections still win.
+_TAXONOMY_RE = re.compile(
+    "^(?:"
+    + "|".join(f"(?=.*?{regex.pattern})(?P<t{position}>)" for position, (_, regex) in enumerate(TAXONOMY))
+    + ")",
+    re.I | re.S,
+)
+_PAGE_EXTENSIONS = frozenset({".md", ".mdx", ".py", ".ipynb", ".js", ".ts", ".rst", ".txt", ".html"})
+_BUCKET_LIMIT = 10
+
+
+def _classify_page(path: str, title: str) -> str | None:
+    match = _TAXONOMY_RE.match(f"{path}\n{title}")
+    if match is None:
+        return None
+    position = next(int(name[1:]) for name, value in match.groupdict().items() if value is not None)
+    return TAXONOMY[position][0]
+
+
+@dataclass(slots=True)
+class _RankedPage:
+    """Heap entry ordered so the weakest kept page (lowest score, then last title) is the root."""
+
+    score: float
+    title: str
+    seq: int
+    path: str
+
+    def __lt__(self, other: _RankedPage) -> bool:
+        return (self.score, other.title, other.seq) < (other.score, self.title, self.seq)
 
 
 def _url_alive(url: str) -> bool:
+    cached = cached_liveness(url)
+    if cached is not None:
+        return cached
+    status = _probe_url(url)
+    alive = status is not None and status < 400
+    record_liveness(url, alive, status)
+    return alive
+
+
+def _probe_url(url: str) -> int | None:
+    """Return the HTTP status for ``url`` (HEAD, then GET), or ``None`` if unreachable."""
     try:
         response = _URL_SESSION.head(
             url, allow_redirects=True, timeout=_URL_VALIDATION_TIMEOUT, headers=_URL_HEADERS
         )
         status = response.status_code
         if status and status < 400:
-            return True
+            return status
         response = _URL_SESSION.get(
             url,
             stream=True,
@@ -174,9 +263,9 @@ def _url_alive(url: str) -> bool:
             headers=_URL_HEADERS,
         )
         response.close()
-        return response.status_code < 400
+        return response.status_code
     except requests.RequestException:
-        return False
+        return None
 
 
 def _github_path_exists(
@@ -197,6 +286,63 @@ def _github_path_exists(
     return content is not None
 
 
+def _validate_pages(
+    pages: List[dict],
+    check: Callable[[dict], bool],
+    *,
+    max_workers: int,
+    budget_seconds: float | None,
+) -> Dict[str, bool | None]:
+    """
+    Check each distinct page URL on a bounded pool and return ``url -> alive``.
+
+    Checks still running when ``budget_seconds`` elapses are abandoned and reported
+    as ``None`` (unknown). Results are keyed by URL, so the caller's bucket order and
+    membership do not depend on completion order.
+    """
+    unique: Dict[str, dict] = {}
+    for page in pages:
+        unique.setdefault(page["url"], page)
+    if not unique:
+        return {}
+
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(unique)), thread_name_prefix="url-check")
+    try:
+        futures = {pool.submit(check, page): url for url, page in unique.items()}
+        done, not_done = wait(futures, timeout=budget_seconds)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    verdicts: Dict[str, bool | None] = {url: None for url in unique}
+    for future in done:
+        try:
+            verdicts[futures[future]] = bool(future.result())
+        except Exception as exc:
+            logger.debug("Link check for %s failed: %s", futures[future], exc)
+            verdicts[futures[future]] = False
+    if not_done:
+        logger.warning(
+            "Link validation budget of %.0fs exhausted; keeping %d unchecked page(s).",
+            budget_seconds or 0,
+            len(not_done),
+        )
+    return verdicts
+
+
+def _repo_link_prefixes(repo_url: str, ref: str | None) -> tuple[str, ...]:
+    """URL prefixes of files in ``repo_url`` at ``ref``; empty when either is unknown."""
+    if not ref:
+        return ()
+    try:
+        owner, repo = owner_repo_from_url(repo_url)
+    except ValueError:
+        return ()
+    return (
+        f"https://github.com/{owner}/{repo}/blob/{ref}/",
+        f"https://raw.githubusercontent.com/{owner}/{repo}/{ref}/",
+    )
+
+
 def build_dynamic_buckets(
     repo_url: str,
     file_tree: str,
@@ -205,60 +351,73 @@ def build_dynamic_buckets(
     is_private: bool = False,
     github_token: str | None = None,
     link_style: str = "blob",
+    link_validation: str = "network",
+    verdict_memo: LinkVerdictMemo | None = None,
 ) -> List[Tuple[str, List[Tuple[str, str, str]]]]:
-    paths = [p.strip() for p in file_tree.splitlines() if p.strip()]
-    pages = []
-    for path in paths:
-        if not re.search(r"\.(md|mdx|py|ipynb|js|ts|rst|txt|html)$", path, flags=re.I):
+    index = RepoPathIndex.for_tree(file_tree)
+    # Classify and rank every page on path and title alone, keeping a bounded heap per
+    # bucket; URLs and notes are only built for the pages that make the cut.
+    heaps: Dict[str, List[_RankedPage]] = {}
+    for seq, (path, extension) in enumerate(zip(index.paths, index.extensions)):
+        if extension not in _PAGE_EXTENSIONS:
             continue
-        pages.append(
-            {
-                "path": path,
-                "url": construct_github_file_url(
-                    repo_url, path, ref=default_ref, style=link_style
-                ),
-                "title": (
-                    "README"
-                    if re.search(r"(^|/)README\.md$", path, flags=re.I)
-                    else _nicify_title(path)
-                ),
-                "note": _short_note(path),
-                "score": _score(path),
-            }
-        )
+        title = _nicify_title(path)
+        name = _classify_page(path, title)
+        if name is None:
+            top = path.strip("/").split("/")[0] or "Misc"
+            name = top.replace("-", " ").replace("_", " ").title()
+        ranked = _RankedPage(_score(path), title, seq, path)
+        heap = heaps.setdefault(name, [])
+        if len(heap) < _BUCKET_LIMIT:
+            heapq.heappush(heap, ranked)
+        elif heap[0] < ranked:
+            heapq.heapreplace(heap, ranked)
 
     buckets: Dict[str, List[dict]] = defaultdict(list)
-    for page in pages:
-        matched = False
-        for name, regex in TAXONOMY:
-            if regex.search(page["path"]) or regex.search(page["title"]):
-                buckets[name].append(page)
-                matched = True
-                break
-        if not matched:
-            top = page["path"].strip("/").split("/")[0] or "Misc"
-            buckets[top.replace("-", " ").replace("_", " ").title()].append(page)
-
-    for name, items in list(buckets.items()):
-        items.sort(key=lambda item: (-item["score"], item["title"]))
-        buckets[name] = items[:10]
-        if not buckets[name]:
-            buckets.pop(name, None)
+    for name, heap in heaps.items():
+        buckets[name] = [
+            {
+                "path": ranked.path,
+                "url": construct_github_file_url(repo_url, ranked.path, ref=default_ref, style=link_style),
+                "title": ranked.title,
+                "note": _short_note(ranked.path),
+                "score": ranked.score,
+            }
+            for ranked in sorted(heap, reverse=True)
+        ]
 
     if validate_urls:
+
+        def probe(page: dict) -> bool:
+            if is_private and github_token:
+                return _github_path_exists(repo_url, page["path"], default_ref, github_token)
+            return _url_alive(page["url"])
+
+        def check(page: dict) -> bool:
+            if verdict_memo is None:
+                return probe(page)
+            return verdict_memo.check(page["url"], lambda: probe(page))
+
+        candidates = [page for items in buckets.values() for page in items]
+        verdicts: Dict[str, bool | None] = {}
+        if link_validation == "trust-tree":
+            repo_prefixes = _repo_link_prefixes(repo_url, default_ref)
+            for page in candidates:
+                if page["url"].startswith(repo_prefixes) and page["path"] in index:
+                    verdicts[page["url"]] = True
+        verdicts.update(
+            _validate_pages(
+                [page for page in candidates if page["url"] not in verdicts],
+                check,
+                max_workers=_URL_VALIDATION_WORKERS,
+                budget_seconds=_URL_VALIDATION_BUDGET_SECONDS,
+            )
+        )
         for name, items in list(buckets.items()):
             filtered = []
             for page in items:
-                if is_private and github_token:
-                    ok = _github_path_exists(
-                        repo_url,
-                        page["path"],
-                        default_ref,
-                        github_token,
-                    )
-                else:
-                    ok = _url_alive(page["url"])
-                if ok:
+                # Pages the budget ran out on (None) are kept rather than dropped.
+                if verdicts.get(page["url"]) is not False:
                     filtered.append(page)
                 else:
                     logger.debug("Dropping %s due to missing resource.", page["url"])
@@ -288,6 +447,35 @@ def build_dynamic_buckets(
     return ordered
 
 
+class LinkVerdictMemo:
+    """
+    Run-scoped, single-flight memo of link-check verdicts keyed by URL.
+
+    The analyzer and the speculative fallback build buckets over their own trees
+    (compaction may shrink the analyzer's), but most of their candidate links are
+    the same. Whichever asks about a URL first checks it while the other waits for
+    that verdict instead of probing the link again.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Future] = {}
+
+    def check(self, url: str, probe: Callable[[], bool]) -> bool:
+        with self._lock:
+            future = self._entries.get(url)
+            owner = future is None
+            if owner:
+                future = self._entries[url] = Future()
+        if owner:
+            try:
+                future.set_result(bool(probe()))
+            except BaseException as exc:
+                future.set_exception(exc)
+                raise
+        return future.result()
+
+
 def build_document_from_buckets(
     project_name: str,
     project_purpose: str,
@@ -392,18 +580,87 @@ def _is_adapter_parse_error(exc: Exception) -> bool:
     return bool(AdapterParseError) and isinstance(exc, AdapterParseError)
 
 
+class _FusedAnalysis:
+    """One fused prediction shared by the staged steps, plus which fields fell back."""
+
+    def __init__(self, prediction: Any | None, fallback_reason: str | None = None) -> None:
+        self.prediction = prediction
+        self.fallback_reason = fallback_reason
+        self.fused_stages: list[str] = []
+        self.staged_fields: dict[str, list[str]] = {}
+
+    def stage(self, stage: str, call: Callable[[], Any]) -> Any:
+        """Return the fused fields for ``stage``, calling its staged predictor only for unusable ones."""
+        fields = _FUSED_STAGE_FIELDS[stage]
+        usable = {
+            name: value
+            for name in fields
+            if (value := _pred_get(self.prediction, name)) is not None
+            and not (isinstance(value, str) and not value.strip())
+        }
+        if len(usable) == len(fields):
+            self.fused_stages.append(stage)
+            return dspy.Prediction(**usable)
+        self.staged_fields[stage] = [name for name in fields if name not in usable]
+        staged = call()
+        return dspy.Prediction(**{name: usable.get(name, _pred_get(staged, name)) for name in fields})
+
+    def report(self) -> dict[str, Any]:
+        report: dict[str, Any] = {
+            "used": bool(self.fused_stages) or any(
+                len(missing) < len(_FUSED_STAGE_FIELDS[stage]) for stage, missing in self.staged_fields.items()
+            ),
+            "fused_stages": self.fused_stages,
+            "staged_fields": self.staged_fields,
+        }
+        if self.fallback_reason:
+            report["fallback_reason"] = self.fallback_reason
+        return report
+
+
+def _call_stage(fused: _FusedAnalysis | None, stage: str, call: Callable[[], Any]) -> Any:
+    return call() if fused is None else fused.stage(stage, call)
+
+
+def _digest_summary(repo_digest: RepoDigest) -> str:
+    return (
+        f"Architecture: {repo_digest.architecture_summary}\n"
+        f"Primary language: {repo_digest.primary_language}\n"
+        f"Entry points: {', '.join(repo_digest.entry_points[:10])}\n"
+        f"Dependencies: {', '.join(repo_digest.key_dependencies[:20])}\n"
+    )
+
+
+def _effective_file_tree(file_tree: str, repo_digest: RepoDigest | None) -> str:
+    """Return the tree used for evidence planning; digest paths stand in for an empty tree."""
+    if file_tree or repo_digest is None:
+        return file_tree
+    return "\n".join(
+        path
+        for sub in repo_digest.subsystems
+        for path in sub.get("paths", [])[:6]
+    )
+
+
 class RepositoryAnalyzer(dspy.Module):
     """DSPy module that synthesizes an llms.txt summary for a GitHub repository."""
 
-    def __init__(self, production_mode: bool = True) -> None:
+    def __init__(self, production_mode: bool = True, mode: str = "staged") -> None:
         super().__init__()
+        if mode not in ANALYZER_MODES:
+            raise ValueError(f"Unknown analyzer mode {mode!r}; expected one of {', '.join(ANALYZER_MODES)}.")
+        self.mode = mode
         predictor = getattr(dspy, "Predict", dspy.ChainOfThought) if production_mode else dspy.ChainOfThought
-        self.analyze_repo = predictor(AnalyzeRepository)
-        self.analyze_repo_digest = predictor(AnalyzeRepositoryFromDigest)
-        self.analyze_structure = predictor(AnalyzeCodeStructure)
-        self.generate_examples = predictor(GenerateUsageExamples)
-        self.plan_sections = predictor(PlanLLMsSections)
-        self.synthesize_section_notes = predictor(SynthesizeLLMsSectionNotes)
+        self.analyze_repo = CachedPredict(predictor(AnalyzeRepository), AnalyzeRepository)
+        self.analyze_repo_digest = CachedPredict(predictor(AnalyzeRepositoryFromDigest), AnalyzeRepositoryFromDigest)
+        self.analyze_structure = CachedPredict(predictor(AnalyzeCodeStructure), AnalyzeCodeStructure)
+        self.generate_examples = CachedPredict(predictor(GenerateUsageExamples), GenerateUsageExamples)
+        self.plan_sections = CachedPredict(predictor(PlanLLMsSections), PlanLLMsSections)
+        self.synthesize_section_notes = CachedPredict(predictor(SynthesizeLLMsSectionNotes), SynthesizeLLMsSectionNotes)
+        self.analyze_fused = CachedPredict(predictor(AnalyzeRepositoryFused), AnalyzeRepositoryFused)
+        self.analyze_fused_digest = CachedPredict(
+            predictor(AnalyzeRepositoryFusedFromDigest), AnalyzeRepositoryFusedFromDigest
+        )
 
     def _resolve_project_name(self, repo_url: str) -> str:
         try:
@@ -419,18 +676,17 @@ class RepositoryAnalyzer(dspy.Module):
         readme_content: str,
         package_files: str,
         repo_digest: RepoDigest | None,
+        fused: _FusedAnalysis | None = None,
     ) -> tuple[Any, Any, str]:
         if repo_digest is not None:
-            digest_summary = (
-                f"Architecture: {repo_digest.architecture_summary}\n"
-                f"Primary language: {repo_digest.primary_language}\n"
-                f"Entry points: {', '.join(repo_digest.entry_points[:10])}\n"
-                f"Dependencies: {', '.join(repo_digest.key_dependencies[:20])}\n"
-            )
             try:
-                repo_analysis = self.analyze_repo_digest(
-                    digest_summary=digest_summary,
-                    repo_url=effective_repo_url,
+                repo_analysis = _call_stage(
+                    fused,
+                    "analyze_repo_digest",
+                    lambda: self.analyze_repo_digest(
+                        digest_summary=_digest_summary(repo_digest),
+                        repo_url=effective_repo_url,
+                    ),
                 )
             except Exception as exc:
                 if not _is_adapter_parse_error(exc):
@@ -454,18 +710,17 @@ class RepositoryAnalyzer(dspy.Module):
                 entry_points=repo_digest.entry_points[:10],
                 development_info=repo_digest.architecture_summary,
             )
-            effective_file_tree = file_tree or "\n".join(
-                path
-                for sub in repo_digest.subsystems
-                for path in sub.get("paths", [])[:6]
-            )
-            return repo_analysis, structure_analysis, effective_file_tree
+            return repo_analysis, structure_analysis, _effective_file_tree(file_tree, repo_digest)
 
         try:
-            repo_analysis = self.analyze_repo(
-                repo_url=effective_repo_url,
-                file_tree=file_tree,
-                readme_content=readme_content,
+            repo_analysis = _call_stage(
+                fused,
+                "analyze_repo",
+                lambda: self.analyze_repo(
+                    repo_url=effective_repo_url,
+                    file_tree=file_tree,
+                    readme_content=readme_content,
+                ),
             )
         except Exception as exc:
             if not _is_adapter_parse_error(exc):
@@ -480,9 +735,13 @@ class RepositoryAnalyzer(dspy.Module):
                 architecture_overview="",
             )
         try:
-            structure_analysis = self.analyze_structure(
-                file_tree=file_tree,
-                package_files=package_files,
+            structure_analysis = _call_stage(
+                fused,
+                "analyze_structure",
+                lambda: self.analyze_structure(
+                    file_tree=file_tree,
+                    package_files=package_files,
+                ),
             )
         except Exception as exc:
             if not _is_adapter_parse_error(exc):
@@ -506,6 +765,8 @@ class RepositoryAnalyzer(dspy.Module):
         is_private: bool,
         github_token: str | None,
         link_style: str,
+        link_validation: str = "network",
+        verdict_memo: LinkVerdictMemo | None = None,
     ) -> tuple[list[tuple[str, list[tuple[str, str, str]]]], AnalyzerTrace]:
         buckets = build_dynamic_buckets(
             repo_url,
@@ -515,6 +776,8 @@ class RepositoryAnalyzer(dspy.Module):
             is_private=is_private,
             github_token=github_token,
             link_style=link_style,
+            link_validation=link_validation,
+            verdict_memo=verdict_memo,
         )
         trace = AnalyzerTrace(
             selected_evidence=[
@@ -579,14 +842,19 @@ class RepositoryAnalyzer(dspy.Module):
         project_purpose: str,
         key_concepts: list[str],
         entry_points: list[str],
+        fused: _FusedAnalysis | None = None,
     ) -> LLMsSection | None:
         try:
-            usage_prediction = self.generate_examples(
-                repo_info=(
-                    f"Purpose: {project_purpose}\n\n"
-                    f"Concepts: {', '.join(key_concepts)}\n\n"
-                    f"Entry points: {', '.join(entry_points)}\n"
-                )
+            usage_prediction = _call_stage(
+                fused,
+                "generate_examples",
+                lambda: self.generate_examples(
+                    repo_info=(
+                        f"Purpose: {project_purpose}\n\n"
+                        f"Concepts: {', '.join(key_concepts)}\n\n"
+                        f"Entry points: {', '.join(entry_points)}\n"
+                    )
+                ),
             )
         except Exception as exc:
             if not _is_adapter_parse_error(exc):
@@ -655,6 +923,7 @@ class RepositoryAnalyzer(dspy.Module):
         buckets: list[tuple[str, list[tuple[str, str, str]]]],
         usage_section: LLMsSection | None,
         trace: AnalyzerTrace,
+        fused: _FusedAnalysis | None = None,
     ) -> LLMsDocument:
         document = build_document_from_buckets(
             project_name=project_name,
@@ -674,14 +943,18 @@ class RepositoryAnalyzer(dspy.Module):
         }
 
         try:
-            section_plan_prediction = self.plan_sections(
-                project_name=project_name,
-                project_purpose=project_purpose,
-                key_concepts=key_concepts,
-                important_directories=important_directories,
-                entry_points=entry_points,
-                development_info=development_info,
-                available_sections=deterministic_sections,
+            section_plan_prediction = _call_stage(
+                fused,
+                "plan_sections",
+                lambda: self.plan_sections(
+                    project_name=project_name,
+                    project_purpose=project_purpose,
+                    key_concepts=key_concepts,
+                    important_directories=important_directories,
+                    entry_points=entry_points,
+                    development_info=development_info,
+                    available_sections=deterministic_sections,
+                ),
             )
         except Exception as exc:
             if not _is_adapter_parse_error(exc):
@@ -714,7 +987,7 @@ class RepositoryAnalyzer(dspy.Module):
             "filtered_sections": filtered_sections,
             "final_sections": final_sections,
         }
-        self._synthesize_section_content(project_name, project_purpose, document, trace)
+        self._synthesize_section_content(project_name, project_purpose, document, trace, fused)
         trace.section_plan = [
             {
                 "name": section.name,
@@ -774,6 +1047,7 @@ class RepositoryAnalyzer(dspy.Module):
         project_purpose: str,
         document: LLMsDocument,
         trace: AnalyzerTrace,
+        fused: _FusedAnalysis | None = None,
     ) -> None:
         """Ask DSPy for concise section notes and render them deterministically."""
         if not document.sections:
@@ -786,11 +1060,15 @@ class RepositoryAnalyzer(dspy.Module):
             for entry in section.entries[:10]
         ]
         try:
-            synthesis_prediction = self.synthesize_section_notes(
-                project_name=project_name,
-                project_purpose=project_purpose,
-                section_plan=[section.name for section in document.sections],
-                candidate_entries=candidate_entries,
+            synthesis_prediction = _call_stage(
+                fused,
+                "synthesize_section_notes",
+                lambda: self.synthesize_section_notes(
+                    project_name=project_name,
+                    project_purpose=project_purpose,
+                    section_plan=[section.name for section in document.sections],
+                    candidate_entries=candidate_entries,
+                ),
             )
         except Exception as exc:
             if not _is_adapter_parse_error(exc):
@@ -846,6 +1124,49 @@ class RepositoryAnalyzer(dspy.Module):
             "rejected_notes": rejected_notes,
         }
 
+    def _run_fused_analysis(
+        self,
+        repo_url: str,
+        file_tree: str,
+        readme_content: str,
+        package_files: str,
+        buckets: list[tuple[str, list[tuple[str, str, str]]]],
+        repo_digest: RepoDigest | None = None,
+    ) -> _FusedAnalysis:
+        """Request every analyzer field in one call; the staged steps fill in what it misses."""
+        candidate_entries = [
+            f"{section_name} | {title} | {url} | {note}"
+            for section_name, items in buckets
+            for title, url, note in items[:10]
+        ]
+        available_sections = ["Usage", *(section_name for section_name, _ in buckets)]
+        try:
+            if repo_digest is not None:
+                prediction = self.analyze_fused_digest(
+                    digest_summary=_digest_summary(repo_digest),
+                    repo_url=repo_url,
+                    available_sections=available_sections,
+                    candidate_entries=candidate_entries,
+                )
+            else:
+                prediction = self.analyze_fused(
+                    repo_url=repo_url,
+                    file_tree=file_tree,
+                    readme_content=readme_content,
+                    package_files=package_files,
+                    available_sections=available_sections,
+                    candidate_entries=candidate_entries,
+                )
+        except Exception as exc:
+            if not _is_adapter_parse_error(exc):
+                raise
+            logger.warning(
+                "DSPy fused analysis response was not parseable; using the staged analyzer calls. Reason: %s",
+                exc,
+            )
+            return _FusedAnalysis(None, fallback_reason="adapter-parse-error")
+        return _FusedAnalysis(prediction)
+
     def _render_document(self, document: LLMsDocument) -> str:
         return render_llms_markdown(document)
 
@@ -860,31 +1181,57 @@ class RepositoryAnalyzer(dspy.Module):
         github_token: str | None = None,
         link_style: str = "blob",
         repo_digest: RepoDigest | None = None,
+        link_validation: str = "network",
+        verdict_memo: LinkVerdictMemo | None = None,
     ):
         effective_repo_url = repo_url or "https://github.com/unknown/repo"
-        repo_analysis, structure_analysis, effective_file_tree = self._run_repository_analysis(
-            effective_repo_url,
-            file_tree,
-            readme_content,
-            package_files,
-            repo_digest,
-        )
-        project_purpose, key_concepts, important_directories, entry_points, development_info = self._inspect_evidence(
-            repo_analysis,
-            structure_analysis,
-            readme_content,
-            repo_digest,
-        )
-        project_name = self._resolve_project_name(effective_repo_url)
-        buckets, trace = self._plan_evidence(
-            effective_repo_url,
-            effective_file_tree,
-            default_branch,
-            is_private,
-            github_token,
-            link_style,
-        )
-        usage_section = self._build_usage_section(project_purpose, key_concepts, entry_points)
+        # Evidence planning (bucket building and link checks) only needs the file
+        # tree, so it runs on a worker thread while the LM analysis round trips
+        # happen here. LM calls stay on the calling thread and its DSPy context.
+        stages = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analyzer-stage")
+        try:
+            evidence_future = stages.submit(
+                self._plan_evidence,
+                effective_repo_url,
+                _effective_file_tree(file_tree, repo_digest),
+                default_branch,
+                is_private,
+                github_token,
+                link_style,
+                link_validation,
+                verdict_memo,
+            )
+            fused = None
+            if self.mode == "fused":
+                # The fused call plans sections too, so it needs the candidate evidence first.
+                fused = self._run_fused_analysis(
+                    effective_repo_url,
+                    file_tree,
+                    readme_content,
+                    package_files,
+                    evidence_future.result()[0],
+                    repo_digest,
+                )
+            repo_analysis, structure_analysis, _ = self._run_repository_analysis(
+                effective_repo_url,
+                file_tree,
+                readme_content,
+                package_files,
+                repo_digest,
+                fused,
+            )
+            project_purpose, key_concepts, important_directories, entry_points, development_info = self._inspect_evidence(
+                repo_analysis,
+                structure_analysis,
+                readme_content,
+                repo_digest,
+            )
+            project_name = self._resolve_project_name(effective_repo_url)
+            buckets, trace = evidence_future.result()
+        finally:
+            # On an LM failure, do not block the error on pending link checks.
+            stages.shutdown(wait=False, cancel_futures=True)
+        usage_section = self._build_usage_section(project_purpose, key_concepts, entry_points, fused)
         document = self._plan_sections(
             project_name,
             project_purpose,
@@ -895,7 +1242,10 @@ class RepositoryAnalyzer(dspy.Module):
             buckets,
             usage_section,
             trace,
+            fused,
         )
+        if fused is not None:
+            trace.model_section_planning["fused_analysis"] = fused.report()
         llms_txt_content = self._render_document(document)
 
         return dspy.Prediction(
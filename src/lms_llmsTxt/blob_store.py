@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+from .disk_budget import DirectoryBudget, touch
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+def git_blob_sha(data: bytes) -> str:
+    """Return the SHA-1 git assigns to a blob with this exact content."""
+    header = f"blob {len(data)}\0".encode("ascii")
+    return hashlib.sha1(header + data).hexdigest()
+
+
+class BlobStore:
+    """
+    Content-addressed file store keyed by git blob SHA.
+
+    Blobs live at ``root/<sha[:2]>/<sha[2:]>``. Because the key is the git object id,
+    an entry written while processing one repository is valid for every ref, fork or
+    later run that reports the same blob SHA in its tree. Once the store grows past
+    ``max_bytes``, the least recently written or served blobs are pruned.
+    """
+
+    def __init__(self, root: Path, *, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root)
+        self._budget = DirectoryBudget(self.root, max_bytes)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, sha: str) -> Path:
+        return self.root / sha[:2] / sha[2:]
+
+    def get(self, sha: str | None) -> bytes | None:
+        if not sha or len(sha) < 4:
+            return None
+        path = self._path(sha)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            data = None
+        # Verify on read so a truncated or corrupted entry is refetched instead of served.
+        if data is None or git_blob_sha(data) != sha:
+            with self._lock:
+                self.misses += 1
+            return None
+        touch(path)
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, data: bytes) -> str:
+        sha = git_blob_sha(data)
+        path = self._path(sha)
+        if path.exists():
+            return sha
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return sha
+        self._budget.charge(len(data))
+        return sha
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evicted": self._budget.evicted}
@@ -15,7 +15,9 @@ from urllib.error import HTTPError, URLError
 from urllib.parse import urljoin, urlparse, urlencode
 from urllib.request import Request, urlopen
 
+from .analyzer import ANALYZER_MODES, LINK_VALIDATION_MODES
 from .config import AppConfig
+from .github import GITHUB_FETCH_MODES
 from .graph_builder import build_repo_graph_from_llms_markdown, emit_graph_files
 from .pipeline import run_generation
 
@@ -539,6 +541,26 @@ def build_parser() -> argparse.ArgumentParser:
         choices=["blob", "raw"],
         help="Style of GitHub file links to generate (default: blob).",
     )
+    parser.add_argument(
+        "--github-fetch-mode",
+        choices=list(GITHUB_FETCH_MODES),
+        help="How repository files are downloaded: per-file contents requests, one tarball, or batched GraphQL lookups (default: contents).",
+    )
+    parser.add_argument(
+        "--link-validation",
+        choices=list(LINK_VALIDATION_MODES),
+        help="Probe every link (network) or keep links to paths in the fetched file tree unchecked (trust-tree) (default: network).",
+    )
+    parser.add_argument(
+        "--analyzer-mode",
+        choices=list(ANALYZER_MODES),
+        help="Make one LM call per analyzer step (staged) or one call for all fields with per-step fallback (fused) (default: staged).",
+    )
+    parser.add_argument(
+        "--local-path",
+        type=Path,
+        help="Read repository files from this local checkout instead of the GitHub API (links still use the repo URL).",
+    )
     parser.add_argument(
         "--stamp",
         action="store_true",
@@ -666,6 +688,14 @@ def main(argv: list[str] | None = None) -> int:
         config.output_dir = args.output_dir
     if args.link_style:
         config.link_style = args.link_style
+    if args.github_fetch_mode:
+        config.github_fetch_mode = args.github_fetch_mode
+    if args.link_validation:
+        config.link_validation_mode = args.link_validation
+    if args.local_path:
+        config.local_repo_path = args.local_path
+    if args.analyzer_mode:
+        config.analyzer_mode = args.analyzer_mode
     if args.no_ctx:
         config.enable_ctx = False
     if args.max_context_tokens is not None:
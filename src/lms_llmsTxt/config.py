@@ -46,6 +46,42 @@ class AppConfig:
       - ``OUTPUT_DIR``: Root folder for generated artifacts.
       - ``ENABLE_CTX``: Set truthy to emit llms-ctx.txt files when llms_txt.create_ctx
         is available.
+      - ``GITHUB_FETCH_MODE``: ``contents`` (default, one request per file),
+        ``archive`` (download the repository tarball once and read files from it) or
+        ``graphql`` (batch README/manifest/evidence lookups into GraphQL queries;
+        requires a token).
+      - ``LMSTXT_CACHE_DIR``: Root for persistent caches (defaults to ``<OUTPUT_DIR>/.cache``).
+      - ``LMSTXT_LOCAL_PATH``: Read repository files from this local checkout instead of
+        the GitHub API; links still point at the GitHub repository URL and are
+        validated in ``trust-tree`` mode, whatever ``LINK_VALIDATION_MODE`` says.
+      - ``GITHUB_HTTP_CACHE``: Set falsy to disable ETag/If-None-Match revalidation of
+        GitHub API responses; ``GITHUB_HTTP_CACHE_MAX_MB`` caps its on-disk size
+        before least recently used responses are pruned.
+      - ``GITHUB_BLOB_CACHE``: Set falsy to disable the content-addressed store that
+        serves files with an unchanged git blob SHA from disk;
+        ``GITHUB_BLOB_CACHE_MAX_MB`` caps its size the same way.
+      - ``GITHUB_RATE_LIMIT_RESERVE`` / ``GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS``: Requests
+        kept in reserve per GitHub rate-limit bucket and the longest wait for a reset.
+      - ``LINK_VALIDATION_MODE``: ``network`` (default) probes every link;
+        ``trust-tree`` keeps links to paths in the fetched file tree unchecked and only
+        probes other URLs.
+      - ``URL_VALIDATION_CONCURRENCY`` / ``URL_VALIDATION_BUDGET_SECONDS``: Parallel link
+        checks and the wall-clock budget after which unchecked links are kept as-is.
+      - ``URL_LIVENESS_CACHE``: Set falsy to stop remembering link-check results on disk;
+        ``URL_LIVENESS_TTL_SECONDS`` / ``URL_LIVENESS_NEGATIVE_TTL_SECONDS`` set how long
+        live and dead verdicts are reused.
+      - ``LM_RESPONSE_CACHE``: Set falsy to stop reusing analyzer and graph-node LM
+        responses whose inputs are unchanged; ``LM_RESPONSE_CACHE_MAX_MB`` caps the
+        on-disk size before least recently used responses are evicted.
+      - ``REPO_DIGEST_CACHE``: Set falsy to stop reusing repository digests stored for
+        an unchanged snapshot (git tree or commit SHA) and unchanged digest inputs.
+      - ``CAPSULE_EXTRACTION_WORKERS``: Processes used to extract digest capsules from
+        large README and evidence chunks, capped at the usable cores (``0``/``1``, the
+        default, extracts in-process); ``CAPSULE_PARALLEL_MIN_CHARS`` is the chunk
+        size that goes to the pool.
+      - ``ANALYZER_MODE``: ``staged`` (default, one LM call per analyzer step) or
+        ``fused`` (one call for every field; steps whose fields come back unusable
+        are re-run on their own).
     """
     lm_model: str | None = field(
         default_factory=lambda: _env_value("LMSTUDIO_MODEL") or None
@@ -67,6 +103,62 @@ class AppConfig:
     link_style: str = field(
         default_factory=lambda: _env_value("LINK_STYLE", "blob") or "blob"
     )
+    github_fetch_mode: str = field(
+        default_factory=lambda: (_env_value("GITHUB_FETCH_MODE", "contents") or "contents").lower()
+    )
+    cache_dir: Path | None = field(
+        default_factory=lambda: Path(value) if (value := _env_value("LMSTXT_CACHE_DIR")) else None
+    )
+    local_repo_path: Path | None = field(
+        default_factory=lambda: Path(value) if (value := _env_value("LMSTXT_LOCAL_PATH")) else None
+    )
+    github_http_cache: bool = field(default_factory=lambda: _env_flag("GITHUB_HTTP_CACHE", True))
+    github_blob_cache: bool = field(default_factory=lambda: _env_flag("GITHUB_BLOB_CACHE", True))
+    github_http_cache_max_mb: float = field(
+        default_factory=lambda: float(_env_value("GITHUB_HTTP_CACHE_MAX_MB", "256") or "256")
+    )
+    github_blob_cache_max_mb: float = field(
+        default_factory=lambda: float(_env_value("GITHUB_BLOB_CACHE_MAX_MB", "1024") or "1024")
+    )
+    evidence_fetch_concurrency: int = field(
+        default_factory=lambda: int(_env_value("EVIDENCE_FETCH_CONCURRENCY", "8") or "8")
+    )
+    github_rate_limit_reserve: int = field(
+        default_factory=lambda: int(_env_value("GITHUB_RATE_LIMIT_RESERVE", "5") or "5")
+    )
+    github_rate_limit_max_wait_seconds: float = field(
+        default_factory=lambda: float(_env_value("GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS", "900") or "900")
+    )
+    link_validation_mode: str = field(
+        default_factory=lambda: (_env_value("LINK_VALIDATION_MODE", "network") or "network").lower()
+    )
+    url_validation_concurrency: int = field(
+        default_factory=lambda: int(_env_value("URL_VALIDATION_CONCURRENCY", "8") or "8")
+    )
+    url_validation_budget_seconds: float = field(
+        default_factory=lambda: float(_env_value("URL_VALIDATION_BUDGET_SECONDS", "30") or "30")
+    )
+    url_liveness_cache: bool = field(default_factory=lambda: _env_flag("URL_LIVENESS_CACHE", True))
+    url_liveness_ttl_seconds: float = field(
+        default_factory=lambda: float(_env_value("URL_LIVENESS_TTL_SECONDS", "1209600") or "1209600")
+    )
+    url_liveness_negative_ttl_seconds: float = field(
+        default_factory=lambda: float(_env_value("URL_LIVENESS_NEGATIVE_TTL_SECONDS", "86400") or "86400")
+    )
+    lm_response_cache: bool = field(default_factory=lambda: _env_flag("LM_RESPONSE_CACHE", True))
+    lm_response_cache_max_mb: float = field(
+        default_factory=lambda: float(_env_value("LM_RESPONSE_CACHE_MAX_MB", "256") or "256")
+    )
+    repo_digest_cache: bool = field(default_factory=lambda: _env_flag("REPO_DIGEST_CACHE", True))
+    capsule_extraction_workers: int = field(
+        default_factory=lambda: int(_env_value("CAPSULE_EXTRACTION_WORKERS", "0") or "0")
+    )
+    capsule_parallel_min_chars: int = field(
+        default_factory=lambda: int(_env_value("CAPSULE_PARALLEL_MIN_CHARS", "262144") or "262144")
+    )
+    analyzer_mode: str = field(
+        default_factory=lambda: (_env_value("ANALYZER_MODE", "staged") or "staged").lower()
+    )
     enable_ctx: bool = field(default_factory=lambda: _env_flag("ENABLE_CTX", False))
     lm_streaming: bool = field(default_factory=lambda: _env_flag("LMSTUDIO_STREAMING", True))
     lm_auto_unload: bool = field(default_factory=lambda: _env_flag("LMSTUDIO_AUTO_UNLOAD", True))
@@ -122,6 +214,10 @@ class AppConfig:
         default_factory=lambda: _env_flag("ENABLE_SESSION_MEMORY", False)
     )
 
+    def resolve_cache_dir(self) -> Path:
+        """Return the persistent cache root shared across runs and repositories."""
+        return self.cache_dir or self.output_dir / ".cache"
+
     def ensure_output_root(self, owner: str, repo: str) -> Path:
         """Return ``<output_root>/<owner>/<repo>`` and create it if missing."""
         repo_root = self.output_dir / owner / repo
@@ -4,6 +4,8 @@ from dataclasses import asdict, dataclass, field
 from enum import Enum
 from typing import Any
 
+from .path_index import RepoPathIndex
+
 
 class BudgetDecision(str, Enum):
     APPROVED = "approved"
@@ -55,10 +57,10 @@ def _truncate_chars(value: str, max_chars: int) -> str:
 def _trim_file_tree(tree: str, max_lines: int) -> str:
     if max_lines <= 0:
         return ""
-    lines = tree.splitlines()
-    if len(lines) <= max_lines:
+    index = RepoPathIndex.for_tree(tree)
+    if len(index.lines) <= max_lines:
         return tree
-    return "\n".join(lines[:max_lines])
+    return "\n".join(index.head(max_lines))
 
 
 def build_context_budget(config: Any, material: Any) -> ContextBudget:
@@ -4,13 +4,14 @@ from dataclasses import replace
 
 from .context_budget import ContextBudget
 from .models import RepositoryMaterial
+from .path_index import RepoPathIndex
 
 
 def _trim_file_tree(file_tree: str, max_lines: int) -> str:
-    lines = file_tree.splitlines()
-    if len(lines) <= max_lines:
+    index = RepoPathIndex.for_tree(file_tree)
+    if len(index.lines) <= max_lines:
         return file_tree
-    return "\n".join(lines[:max_lines]) + "\n... (trimmed file tree)"
+    return "\n".join(index.head(max_lines)) + "\n... (trimmed file tree)"
 
 
 def _trim_text(content: str, max_chars: int, label: str) -> str:
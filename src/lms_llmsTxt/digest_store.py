@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Mapping
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+
+class DigestSnapshotStore:
+    """
+    On-disk ``key -> repository digest snapshot`` table backed by SQLite.
+
+    Keys are derived from the material's ``snapshot_ref``, the digest schema version and the
+    digest inputs, so an unchanged repository is served its previous digest
+    without chunking or capsule extraction. Payloads are zlib-compressed JSON;
+    once the table exceeds ``max_bytes`` the least recently used snapshots are
+    evicted.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+        with self._conn:
+            # Superseded layout whose keys were built from unprefixed refs; nothing in it can hit.
+            self._conn.execute("DROP TABLE IF EXISTS repo_digests")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS digest_snapshots ("
+                "key TEXT PRIMARY KEY, snapshot_ref TEXT NOT NULL, schema_version INTEGER NOT NULL, "
+                "payload BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS digest_snapshots_last_used ON digest_snapshots (last_used)")
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            try:
+                row = self._conn.execute("SELECT payload FROM digest_snapshots WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    with self._conn:
+                        self._conn.execute("UPDATE digest_snapshots SET last_used = ? WHERE key = ?", (self._clock(), key))
+                payload = json.loads(zlib.decompress(row[0])) if row is not None else None
+            except (sqlite3.Error, zlib.error, ValueError) as exc:
+                logger.debug("Digest snapshot read failed: %s", exc)
+                payload = None
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return payload
+
+    def put(self, key: str, snapshot_ref: str, schema_version: int, payload: Mapping[str, Any]) -> None:
+        try:
+            encoded = zlib.compress(json.dumps(dict(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        except (TypeError, ValueError) as exc:
+            logger.debug("Not storing digest snapshot: %s", exc)
+            return
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO digest_snapshots "
+                        "(key, snapshot_ref, schema_version, payload, size, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, snapshot_ref, schema_version, encoded, len(encoded), self._clock()),
+                    )
+                    self._evict_locked()
+                self.writes += 1
+            except sqlite3.Error as exc:
+                # The store is an optimization; a locked or read-only file must not fail the run.
+                logger.debug("Digest snapshot write failed: %s", exc)
+
+    def _evict_locked(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM digest_snapshots").fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+        victims: list[str] = []
+        for key, size in self._conn.execute("SELECT key, size FROM digest_snapshots ORDER BY last_used"):
+            victims.append(key)
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM digest_snapshots WHERE key = ?", [(key,) for key in victims])
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.writes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "writes": self.writes}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_DIGEST_STORE: DigestSnapshotStore | None = None
+
+
+def configure_digest_store(path: Path | None, *, max_bytes: int = DEFAULT_MAX_BYTES) -> DigestSnapshotStore | None:
+    """Enable (or disable with ``None``) the snapshot store consulted by ``build_repo_digest``."""
+    global _DIGEST_STORE
+    current = _DIGEST_STORE
+    if current is not None and path is not None and current.path == Path(path):
+        current.max_bytes = max_bytes
+        current.reset_counters()
+        return current
+    if current is not None:
+        current.close()
+    try:
+        _DIGEST_STORE = DigestSnapshotStore(path, max_bytes=max_bytes) if path is not None else None
+    except (OSError, sqlite3.Error) as exc:
+        logger.warning("Digest snapshot store disabled: %s", exc)
+        _DIGEST_STORE = None
+    return _DIGEST_STORE
+
+
+def digest_store_enabled() -> bool:
+    return _DIGEST_STORE is not None
+
+
+def load_digest_snapshot(key: str) -> dict[str, Any] | None:
+    return _DIGEST_STORE.get(key) if _DIGEST_STORE is not None else None
+
+
+def save_digest_snapshot(key: str, snapshot_ref: str, schema_version: int, payload: Mapping[str, Any]) -> None:
+    if _DIGEST_STORE is not None:
+        _DIGEST_STORE.put(key, snapshot_ref, schema_version, payload)
+
+
+def digest_store_stats() -> dict[str, int] | None:
+    return _DIGEST_STORE.stats() if _DIGEST_STORE is not None else None
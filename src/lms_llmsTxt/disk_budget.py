@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Pruning stops below this share of the cap so the next few writes do not prune again.
+_PRUNE_TARGET_RATIO = 0.9
+
+
+def touch(path: Path) -> None:
+    """Mark a cache file as recently used; pruning removes the oldest modification times first."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+class DirectoryBudget:
+    """
+    Size cap for a file-per-entry cache directory.
+
+    The bytes under ``root`` are counted once, on the first :meth:`charge`, and
+    tracked from then on. When a write takes the total past ``max_bytes``, the files
+    with the oldest modification time are deleted until it is back under 90% of
+    the cap. Stores :func:`touch` entries they serve, so this evicts the least
+    recently used ones.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._used: int | None = None
+        self.evicted = 0
+
+    def charge(self, size: int) -> None:
+        """Account for ``size`` newly written bytes and prune if the cap is exceeded."""
+        with self._lock:
+            if self._used is None:
+                self._used = sum(size for _, size, _ in self._scan())
+            self._used += size
+            if self._used > self.max_bytes:
+                self._prune_locked()
+
+    def _scan(self) -> list[tuple[float, int, str]]:
+        entries: list[tuple[float, int, str]] = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _prune_locked(self) -> None:
+        entries = sorted(self._scan())
+        used = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * _PRUNE_TARGET_RATIO)
+        for _, size, path in entries:
+            if used <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError as exc:
+                logger.debug("Could not prune cache file %s: %s", path, exc)
+                continue
+            used -= size
+            self.evicted += 1
+        self._used = used
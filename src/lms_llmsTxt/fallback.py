@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import textwrap
+import threading
 from typing import Dict, List, Tuple
 
-from .analyzer import build_document_from_buckets, build_dynamic_buckets, render_llms_markdown
+from .analyzer import LinkVerdictMemo, build_document_from_buckets, build_dynamic_buckets, render_llms_markdown
 from .schema import LLMS_JSON_SCHEMA
 
 
@@ -47,7 +48,11 @@ def fallback_llms_payload(
     is_private: bool = False,
     github_token: str | None = None,
     link_style: str = "blob",
-) -> Dict[str, object]:
+    link_validation: str = "network",
+    verdict_memo: LinkVerdictMemo | None = None,
+    cancel_event: threading.Event | None = None,
+) -> Dict[str, object] | None:
+    """Build the no-LM payload; returns ``None`` when ``cancel_event`` is set once links are validated."""
     buckets = build_dynamic_buckets(
         repo_url,
         file_tree,
@@ -56,7 +61,11 @@ def fallback_llms_payload(
         is_private=is_private,
         github_token=github_token,
         link_style=link_style,
+        link_validation=link_validation,
+        verdict_memo=verdict_memo,
     )
+    if cancel_event is not None and cancel_event.is_set():
+        return None
     summary = _summary_from_readme(readme_content)
     remember = _remember_bullets()
     sections: List[Dict[str, object]] = []
@@ -5,11 +5,13 @@ import os
 import re
 import textwrap
 from dataclasses import dataclass
-from typing import Iterable, Optional, Tuple
+from typing import Callable, Iterable, Optional, Tuple
 from urllib.parse import urljoin
 import posixpath
 import requests
-from .github import  _normalize_repo_path
+from .github import _normalize_repo_path, github_request, remember_blob
+from .http_client import shared_session
+from .url_liveness import cached_liveness, record_liveness
 
 @dataclass
 class GhRef:
@@ -49,7 +51,7 @@ def gh_get_file(
     }
     if token:
         headers["Authorization"] = f"Bearer {token}"
-    response = requests.get(url, params=params, headers=headers, timeout=30)
+    response = github_request("GET", url, params=params, headers=headers, timeout=30)
     if response.status_code == 404:
         raise FileNotFoundError(f"GitHub 404 for {owner}/{repo}/{path}@{ref or 'default'}")
     response.raise_for_status()
@@ -69,8 +71,10 @@ def fetch_raw_file(
     ref: str,
 ) -> bytes:
     url = f"https://raw.githubusercontent.com/{owner}/{repo}/{ref}/{path}"
-    response = requests.get(
+    response = github_request(
+        "GET",
         url,
+        resource="raw",
         headers={"User-Agent": "lms-lmstxt"},
         timeout=30,
     )
@@ -212,7 +216,7 @@ def _html_to_text(html: str) -> str:
 
 
 def _fetch_website(url: str, user_agent: str = "lms-lmstxt", timeout: int = 30) -> str:
-    resp = requests.get(url, headers={"User-Agent": user_agent}, timeout=timeout)
+    resp = shared_session().get(url, headers={"User-Agent": user_agent}, timeout=timeout)
     resp.raise_for_status()
     # prefer text; if bytes fallback, requests gives .text with encoding guess
     return resp.text
@@ -227,10 +231,14 @@ def build_llms_full_from_repo(
     default_ref: Optional[str] = None,
     token: Optional[str] = None,
     link_style: str = "blob",
+    content_lookup: Optional[Callable[[GhRef, str], Optional[bytes]]] = None,
 ) -> str:
     """
     Extended: also accepts general website URLs in the curated list.
     GitHub URLs are fetched via API/raw as before. Non-GitHub URLs are fetched as HTML.
+
+    ``content_lookup`` may return already-known bytes for a GitHub link (for example
+    from the blob store); only links it cannot resolve go to the network.
     """
     resolved_token = (
         token
@@ -260,8 +268,12 @@ def build_llms_full_from_repo(
             # GitHub path fetch
             resolved_ref = gh.ref or default_ref or "main"
             try:
-                if prefer_raw:
+                known = content_lookup(gh, resolved_ref) if content_lookup is not None else None
+                if known is not None:
+                    body = known
+                elif prefer_raw:
                     body = fetch_raw_file(gh.owner, gh.repo, gh.path, resolved_ref)
+                    remember_blob(body)
                 else:
                     _, body = gh_get_file(
                         gh.owner,
@@ -270,6 +282,7 @@ def build_llms_full_from_repo(
                         resolved_ref,
                         resolved_token,
                     )
+                    remember_blob(body)
             except requests.HTTPError as exc:
                 message = _format_http_error(gh, resolved_ref, exc, auth_used=not prefer_raw)
                 body = message.encode("utf-8")
@@ -295,13 +308,19 @@ def build_llms_full_from_repo(
             count += 1
 
         else:
-            # General website fetch
-            try:
-                html = _fetch_website(url)
-            except Exception as exc:
-                text_body = f"[fetch-error] {url} :: {exc}"
+            # General website fetch; skip pages a recent check already found dead.
+            if cached_liveness(url) is False:
+                text_body = f"[fetch-error] {url} :: unreachable on a recent check (cached)"
             else:
-                text_body = _html_to_text(html)
+                try:
+                    html = _fetch_website(url)
+                except Exception as exc:
+                    status = getattr(getattr(exc, "response", None), "status_code", None)
+                    record_liveness(url, False, status)
+                    text_body = f"[fetch-error] {url} :: {exc}"
+                else:
+                    record_liveness(url, True, 200)
+                    text_body = _html_to_text(html)
 
             # enforce size after text conversion for websites
             encoded = text_body.encode("utf-8", "ignore")
@@ -1,13 +1,30 @@
 from __future__ import annotations
 
 import base64
+import hashlib
+import json
+import logging
 import os
 import re
-from typing import Iterable
+import tarfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Sequence
 
 import requests
 import posixpath
+from pathlib import Path
+
+from .blob_store import DEFAULT_MAX_BYTES as BLOB_STORE_MAX_BYTES, BlobStore, git_blob_sha
+from .http_cache import DEFAULT_MAX_BYTES as HTTP_CACHE_MAX_BYTES, ConditionalHTTPCache
+from .http_client import shared_session
 from .models import RepositoryMaterial
+from .rate_limit import GitHubRateLimiter
+
+logger = logging.getLogger(__name__)
 
 def _normalize_repo_path(path: str) -> str:
     """
@@ -35,7 +52,16 @@ _GITHUB_URL = re.compile(
     re.IGNORECASE | re.VERBOSE,
 )
 
-_SESSION = requests.Session()
+_SESSION = shared_session()
+_HTTP_CACHE: ConditionalHTTPCache | None = None
+_BLOB_STORE: BlobStore | None = None
+_RATE_LIMITER = GitHubRateLimiter()
+_RATE_LIMIT_RETRIES = 3
+_METADATA_TTL_SECONDS = 900.0
+_METADATA_NEGATIVE_TTL_SECONDS = 60.0
+_METADATA_CACHE: dict[tuple[str, str, str], tuple[float, dict[str, object] | Exception]] = {}
+_METADATA_KEY_LOCKS: dict[tuple[str, str, str], threading.Lock] = {}
+_METADATA_LOCK = threading.Lock()
 
 _DEFAULT_IGNORED_PATH_PREFIXES = (
     ".agents/",
@@ -75,10 +101,160 @@ def _auth_headers(token: str | None) -> dict[str, str]:
     return headers
 
 
+def configure_http_cache(
+    cache_dir: Path | None, *, max_bytes: int = HTTP_CACHE_MAX_BYTES
+) -> ConditionalHTTPCache | None:
+    """Enable (or disable with ``None``) the on-disk conditional-request cache for GitHub GETs."""
+    global _HTTP_CACHE
+    _HTTP_CACHE = ConditionalHTTPCache(cache_dir, max_bytes=max_bytes) if cache_dir is not None else None
+    return _HTTP_CACHE
+
+
+def http_cache_stats() -> dict[str, int] | None:
+    return _HTTP_CACHE.stats() if _HTTP_CACHE is not None else None
+
+
+def configure_blob_store(store_dir: Path | None, *, max_bytes: int = BLOB_STORE_MAX_BYTES) -> BlobStore | None:
+    """Enable (or disable with ``None``) the content-addressed blob store for file bodies."""
+    global _BLOB_STORE
+    _BLOB_STORE = BlobStore(store_dir, max_bytes=max_bytes) if store_dir is not None else None
+    return _BLOB_STORE
+
+
+def blob_store_stats() -> dict[str, int] | None:
+    return _BLOB_STORE.stats() if _BLOB_STORE is not None else None
+
+
+def read_cached_blob(blob_sha: str | None) -> bytes | None:
+    """Return stored bytes for ``blob_sha`` without touching the network."""
+    if _BLOB_STORE is None or not blob_sha:
+        return None
+    return _BLOB_STORE.get(blob_sha)
+
+
+def remember_blob(data: bytes) -> str | None:
+    """Store file bytes under their git blob SHA so later runs can skip the download."""
+    if _BLOB_STORE is None:
+        return None
+    return _BLOB_STORE.put(data)
+
+
+def configure_rate_limiter(*, reserve: int | None = None, max_wait_seconds: float | None = None) -> GitHubRateLimiter:
+    """Tune the shared GitHub rate limiter and reset its per-run counters."""
+    _RATE_LIMITER.configure(reserve=reserve, max_wait_seconds=max_wait_seconds)
+    _RATE_LIMITER.reset_counters()
+    return _RATE_LIMITER
+
+
+def rate_limit_stats() -> dict[str, object]:
+    return _RATE_LIMITER.snapshot()
+
+
+def github_request(
+    method: str,
+    url: str,
+    *,
+    resource: str = "core",
+    **kwargs: object,
+) -> requests.Response:
+    """
+    Send a GitHub request through the shared rate limiter.
+
+    The limiter may sleep before the request when the remaining budget is low, and
+    throttled (403/429) responses are retried after the delay GitHub asks for, up to
+    ``_RATE_LIMIT_RETRIES`` times. The last response is returned either way.
+    """
+    send = _SESSION.get if method.upper() == "GET" else _SESSION.post
+    attempt = 0
+    while True:
+        _RATE_LIMITER.acquire(resource)
+        resp = send(url, **kwargs)
+        delay = _RATE_LIMITER.observe(resp, resource)
+        if delay is None or attempt >= _RATE_LIMIT_RETRIES:
+            return resp
+        attempt += 1
+        logger.warning("GitHub rate limited %s; retrying in %.0fs (attempt %d).", url, delay, attempt)
+        if getattr(resp, "raw", None) is not None:
+            resp.close()
+        _RATE_LIMITER.wait(delay)
+
+
+def _github_get(
+    url: str,
+    token: str | None,
+    *,
+    params: dict[str, object] | None = None,
+    timeout: int = 20,
+) -> requests.Response:
+    """GET a GitHub API URL, sending conditional headers when the HTTP cache is enabled."""
+    cache = _HTTP_CACHE
+    headers = _auth_headers(token)
+    if cache is None:
+        return github_request("GET", url, params=params, headers=headers, timeout=timeout)
+
+    key = cache.key_for(url, params, token)
+    validators = cache.validators(key)
+    resp = github_request("GET", url, params=params, headers={**headers, **validators}, timeout=timeout)
+    resolved = cache.resolve(key, resp)
+    if resolved.status_code == 304:
+        # Cached body vanished between the validator read and the replay.
+        resolved = cache.resolve(
+            key, github_request("GET", url, params=params, headers=headers, timeout=timeout)
+        )
+    return resolved
+
+
+def clear_repository_metadata_cache() -> None:
+    with _METADATA_LOCK:
+        _METADATA_CACHE.clear()
+
+
+def _metadata_key_lock(key: tuple[str, str, str]) -> threading.Lock:
+    with _METADATA_LOCK:
+        return _METADATA_KEY_LOCKS.setdefault(key, threading.Lock())
+
+
+def _cached_metadata(key: tuple[str, str, str]) -> dict[str, object] | Exception | None:
+    with _METADATA_LOCK:
+        cached = _METADATA_CACHE.get(key)
+    if cached is None or cached[0] < time.monotonic():
+        return None
+    return cached[1]
+
+
 def get_repository_metadata(owner: str, repo: str, token: str | None) -> dict[str, object]:
-    resp = _SESSION.get(
+    """
+    Return default branch and visibility for ``owner/repo``.
+
+    Results are cached per process for ``_METADATA_TTL_SECONDS`` (failures for
+    ``_METADATA_NEGATIVE_TTL_SECONDS``), so link building and fallbacks never
+    repeat the lookup ``gather_repository_material`` already made. Entries are scoped
+    to the token, so an anonymous 404 for a private repository is not replayed to
+    authenticated callers.
+    """
+    # Same credential scope as ConditionalHTTPCache.key_for.
+    scope = hashlib.sha256(token.encode("utf-8")).hexdigest()[:12] if token else "anon"
+    key = (owner.lower(), repo.lower(), scope)
+    with _metadata_key_lock(key):
+        cached = _cached_metadata(key)
+        if cached is None:
+            try:
+                cached = _fetch_repository_metadata(owner, repo, token)
+                ttl = _METADATA_TTL_SECONDS
+            except (FileNotFoundError, requests.HTTPError) as exc:
+                cached = exc
+                ttl = _METADATA_NEGATIVE_TTL_SECONDS
+            with _METADATA_LOCK:
+                _METADATA_CACHE[key] = (time.monotonic() + ttl, cached)
+    if isinstance(cached, Exception):
+        raise cached
+    return dict(cached)
+
+
+def _fetch_repository_metadata(owner: str, repo: str, token: str | None) -> dict[str, object]:
+    resp = _github_get(
         f"https://api.github.com/repos/{owner}/{repo}",
-        headers=_auth_headers(token),
+        token,
         timeout=20,
     )
     if resp.status_code == 404:
@@ -97,33 +273,189 @@ def get_default_branch(owner: str, repo: str, token: str | None) -> str:
     return str(metadata.get("default_branch", "main"))
 
 
-def fetch_file_tree(
-    owner: str, repo: str, ref: str, token: str | None
-) -> Iterable[str]:
-    resp = _SESSION.get(
-        f"https://api.github.com/repos/{owner}/{repo}/git/trees/{ref}",
-        params={"recursive": 1},
-        headers=_auth_headers(token),
+@dataclass(frozen=True, slots=True)
+class RepoTreeEntry:
+    """One blob from the git tree, with the object id needed for content-addressed caching."""
+
+    path: str
+    sha: str
+    size: int | None = None
+
+
+_TREE_WALK_WORKERS = 8
+# GitHub truncates a recursive tree listing beyond this many entries.
+_TREE_ENTRY_LIMIT = 100_000
+
+
+@dataclass(slots=True)
+class TreeWalkStatus:
+    """Outcome of a tree walk; ``complete`` is False when a subtree could not be listed."""
+
+    truncated: bool = False
+    complete: bool = True
+    tree_sha: str | None = None
+    subtrees_walked: int = 0
+    failed_subtrees: list[str] = field(default_factory=list)
+
+
+def _list_tree(owner: str, repo: str, tree_ref: str, token: str | None, *, recursive: bool) -> dict[str, object]:
+    resp = _github_get(
+        f"https://api.github.com/repos/{owner}/{repo}/git/trees/{tree_ref}",
+        token,
+        params={"recursive": 1} if recursive else None,
         timeout=30,
     )
     resp.raise_for_status()
-    payload = resp.json()
-    return [
-        item["path"]
-        for item in payload.get("tree", [])
-        if item.get("type") == "blob"
-        and "path" in item
-        and not is_default_ignored_repo_path(str(item["path"]))
-    ]
+    return resp.json()
+
+
+def _split_tree_items(
+    payload: dict[str, object], prefix: str
+) -> tuple[list[RepoTreeEntry], list[tuple[str, str]]]:
+    """Return the non-ignored blobs and ``(sha, path)`` subtrees of a tree listing."""
+    blobs: list[RepoTreeEntry] = []
+    subtrees: list[tuple[str, str]] = []
+    for item in payload.get("tree", []):
+        if "path" not in item:
+            continue
+        path = f"{prefix}{item['path']}"
+        if is_default_ignored_repo_path(path):
+            continue
+        if item.get("type") == "blob":
+            blobs.append(RepoTreeEntry(path=path, sha=str(item.get("sha") or ""), size=item.get("size")))
+        elif item.get("type") == "tree" and item.get("sha"):
+            subtrees.append((str(item["sha"]), path))
+    return blobs, subtrees
+
+
+def _oversized_subtrees(payload: dict[str, object]) -> set[str]:
+    """Return the top-level directories a truncated listing already shows at GitHub's entry limit."""
+    counts: Counter[str] = Counter()
+    for item in payload.get("tree", []):
+        head, sep, _ = str(item.get("path", "")).partition("/")
+        if sep:
+            counts[head] += 1
+    return {name for name, count in counts.items() if count >= _TREE_ENTRY_LIMIT}
+
+
+def _walk_subtree(
+    owner: str, repo: str, tree_sha: str, path: str, token: str | None, *, recursive: bool = True
+) -> tuple[list[RepoTreeEntry], list[tuple[str, str, bool]]]:
+    """
+    List one subtree, returning its blobs and the ``(sha, path, recursive)`` children still to walk.
+
+    ``recursive=False`` skips the recursive request for a subtree already known to exceed the
+    entry limit, so no listing is fetched only to be discarded.
+    """
+    prefix = f"{path}/"
+    oversized: set[str] = set()
+    if recursive:
+        payload = _list_tree(owner, repo, tree_sha, token, recursive=True)
+        if not payload.get("truncated"):
+            blobs, _ = _split_tree_items(payload, prefix)
+            return blobs, []
+        oversized = _oversized_subtrees(payload)
+    # Still too large for one response: list this level and split again.
+    blobs, subtrees = _split_tree_items(_list_tree(owner, repo, tree_sha, token, recursive=False), prefix)
+    return blobs, [(sha, child, child[len(prefix):] not in oversized) for sha, child in subtrees]
+
+
+def iter_file_tree_entries(
+    owner: str,
+    repo: str,
+    ref: str,
+    token: str | None,
+    *,
+    status: TreeWalkStatus | None = None,
+    max_workers: int = _TREE_WALK_WORKERS,
+) -> Iterator[RepoTreeEntry]:
+    """
+    Iterate over the blobs of ``ref``.
+
+    One recursive request covers most repositories. When GitHub marks that response
+    ``truncated``, the root is listed non-recursively and its subtrees are walked in
+    parallel, each one split again only if its own recursive listing is truncated. A
+    subtree that a truncated listing already shows at GitHub's entry limit is listed
+    non-recursively straight away instead of being fetched recursively and discarded.
+    ``status`` records whether truncation happened and whether every subtree was listed.
+
+    Entries arrive in the order subtree listings finish, not in path order. Callers
+    collect the whole walk and sort it before building the tree listing.
+    """
+    status = status if status is not None else TreeWalkStatus()
+    payload = _list_tree(owner, repo, ref, token, recursive=True)
+    status.tree_sha = str(payload.get("sha") or "") or None
+    if not payload.get("truncated"):
+        blobs, _ = _split_tree_items(payload, "")
+        yield from blobs
+        return
+
+    status.truncated = True
+    logger.warning("Recursive tree for %s/%s@%s is truncated; walking subtrees.", owner, repo, ref)
+    oversized = _oversized_subtrees(payload)
+    blobs, subtrees = _split_tree_items(_list_tree(owner, repo, ref, token, recursive=False), "")
+    yield from blobs
+
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="tree-walk")
+    try:
+        pending = {
+            pool.submit(_walk_subtree, owner, repo, sha, path, token, recursive=path not in oversized): path
+            for sha, path in subtrees
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                status.subtrees_walked += 1
+                try:
+                    blobs, children = future.result()
+                except (requests.RequestException, ValueError) as exc:
+                    logger.warning("Could not list subtree %s of %s/%s: %s", path, owner, repo, exc)
+                    status.complete = False
+                    status.failed_subtrees.append(path)
+                    continue
+                yield from blobs
+                for sha, child_path, recursive in children:
+                    future = pool.submit(_walk_subtree, owner, repo, sha, child_path, token, recursive=recursive)
+                    pending[future] = child_path
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_file_tree_entries(
+    owner: str,
+    repo: str,
+    ref: str,
+    token: str | None,
+    *,
+    status: TreeWalkStatus | None = None,
+) -> list[RepoTreeEntry]:
+    return list(iter_file_tree_entries(owner, repo, ref, token, status=status))
+
+
+def fetch_file_tree(
+    owner: str, repo: str, ref: str, token: str | None
+) -> Iterable[str]:
+    return [entry.path for entry in fetch_file_tree_entries(owner, repo, ref, token)]
 
 
 def fetch_file_content(
-    owner: str, repo: str, path: str, ref: str, token: str | None
+    owner: str,
+    repo: str,
+    path: str,
+    ref: str,
+    token: str | None,
+    *,
+    blob_sha: str | None = None,
 ) -> str | None:
-    resp = _SESSION.get(
+    cached = read_cached_blob(blob_sha)
+    if cached is not None:
+        return cached.decode("utf-8", "replace")
+
+    resp = _github_get(
         f"https://api.github.com/repos/{owner}/{repo}/contents/{path}",
+        token,
         params={"ref": ref},
-        headers=_auth_headers(token),
         timeout=20,
     )
     if resp.status_code == 404:
@@ -132,31 +464,314 @@ def fetch_file_content(
     payload = resp.json()
     content = payload.get("content")
     if content and payload.get("encoding") == "base64":
-        return base64.b64decode(content).decode("utf-8", "replace")
+        data = base64.b64decode(content)
+        remember_blob(data)
+        return data.decode("utf-8", "replace")
     if isinstance(content, str):
         return content
     return None
 
 
-def gather_repository_material(repo_url: str, token: str | None = None) -> RepositoryMaterial:
+_GRAPHQL_URL = "https://api.github.com/graphql"
+_GRAPHQL_BATCH_SIZE = 50
+
+
+def _graphql_blob_query(ref: str, paths: Sequence[str]) -> str:
+    fields = "\n".join(
+        f"    f{index}: object(expression: {json.dumps(f'{ref}:{path}')}) {{ ... on Blob {{ text isBinary isTruncated }} }}"
+        for index, path in enumerate(paths)
+    )
+    return (
+        "query($owner: String!, $name: String!) {\n"
+        "  repository(owner: $owner, name: $name) {\n"
+        f"{fields}\n"
+        "  }\n"
+        "}"
+    )
+
+
+def fetch_file_contents_graphql(
+    owner: str,
+    repo: str,
+    ref: str,
+    paths: Sequence[str],
+    token: str | None,
+    *,
+    batch_size: int = _GRAPHQL_BATCH_SIZE,
+) -> dict[str, str | None]:
+    """
+    Resolve many ``ref:path`` blobs with aliased GraphQL ``object`` lookups.
+
+    Missing or binary paths map to ``None``. Blobs GitHub reports as truncated are
+    left out of the result so callers can fall back to the contents API for them.
+    GraphQL requires authentication, so ``token`` must be set.
+    """
+    if not token:
+        raise ValueError("GitHub GraphQL requests require a token.")
+    unique_paths = list(dict.fromkeys(paths))
+    results: dict[str, str | None] = {}
+    for start in range(0, len(unique_paths), max(1, batch_size)):
+        batch = unique_paths[start : start + max(1, batch_size)]
+        resp = github_request(
+            "POST",
+            _GRAPHQL_URL,
+            resource="graphql",
+            json={
+                "query": _graphql_blob_query(ref, batch),
+                "variables": {"owner": owner, "name": repo},
+            },
+            headers=_auth_headers(token),
+            timeout=30,
+        )
+        resp.raise_for_status()
+        payload = resp.json()
+        repository = (payload.get("data") or {}).get("repository")
+        if repository is None:
+            errors = payload.get("errors") or [{"message": "repository not found"}]
+            raise FileNotFoundError(f"GraphQL lookup failed for {owner}/{repo}: {errors[0].get('message')}")
+        for index, path in enumerate(batch):
+            blob = repository.get(f"f{index}")
+            if not blob or blob.get("isBinary") or blob.get("text") is None:
+                results[path] = None
+                continue
+            if blob.get("isTruncated"):
+                continue
+            text = str(blob["text"])
+            remember_blob(text.encode("utf-8"))
+            results[path] = text
+    return results
+
+
+PACKAGE_FILE_CANDIDATES = (
+    "pyproject.toml",
+    "setup.cfg",
+    "setup.py",
+    "requirements.txt",
+    "package.json",
+)
+
+GITHUB_FETCH_MODES = ("contents", "archive", "graphql")
+
+_ARCHIVE_MAX_FILE_BYTES = 256_000
+_ARCHIVE_MAX_TOTAL_BYTES = 48_000_000
+_ARCHIVE_BINARY_SUFFIXES = (
+    ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".icns", ".webp", ".svgz",
+    ".pdf", ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".tar", ".jar", ".whl",
+    ".woff", ".woff2", ".ttf", ".otf", ".eot", ".mp3", ".mp4", ".mov", ".wav",
+    ".so", ".dylib", ".dll", ".exe", ".bin", ".o", ".a", ".pyc", ".class", ".wasm",
+)
+
+
+@dataclass(slots=True)
+class RepositoryArchive:
+    """Paths and capped text contents streamed from a single repository tarball."""
+
+    paths: list[str] = field(default_factory=list)
+    contents: dict[str, str] = field(default_factory=dict)
+    blob_shas: dict[str, str] = field(default_factory=dict)
+    # Commit the tarball was cut from, from its pax header or top-level directory name.
+    commit_sha: str | None = None
+    skipped_large: int = 0
+    total_bytes: int = 0
+
+
+def _archive_member_path(name: str) -> str:
+    # GitHub tarballs wrap everything in a single "<owner>-<repo>-<sha>/" directory.
+    _, _, relative = name.partition("/")
+    return relative
+
+
+_FULL_SHA_RE = re.compile(r"[0-9a-f]{40}|[0-9a-f]{64}")
+
+
+def _archive_commit_sha(tar: tarfile.TarFile, member_name: str) -> str | None:
+    # git archive stores the full commit SHA as the global pax comment; the wrapper
+    # directory only carries an abbreviated one.
+    comment = tar.pax_headers.get("comment", "").strip()
+    if _FULL_SHA_RE.fullmatch(comment):
+        return comment
+    top = member_name.partition("/")[0]
+    _, sep, short_sha = top.rpartition("-")
+    return short_sha if sep and re.fullmatch(r"[0-9a-f]{7,64}", short_sha) else None
+
+
+def fetch_repository_archive(
+    owner: str,
+    repo: str,
+    ref: str,
+    token: str | None,
+    *,
+    max_file_bytes: int | None = None,
+    max_total_bytes: int | None = None,
+) -> RepositoryArchive:
+    """
+    Download the tarball for ``ref`` once and stream out the files the pipeline can use.
+
+    Every non-ignored blob path is recorded. Text contents are kept only for files
+    at or below ``max_file_bytes`` while the running total stays under
+    ``max_total_bytes``; larger or binary files keep their path but no content, so
+    callers fall back to per-file fetches for them.
+    """
+    resp = github_request(
+        "GET",
+        f"https://api.github.com/repos/{owner}/{repo}/tarball/{ref}",
+        headers=_auth_headers(token),
+        timeout=60,
+        stream=True,
+    )
+    if resp.status_code == 404:
+        resp.close()
+        raise FileNotFoundError(f"Repository archive not found: {owner}/{repo}@{ref}")
+    resp.raise_for_status()
+    resp.raw.decode_content = True
+    max_file_bytes = _ARCHIVE_MAX_FILE_BYTES if max_file_bytes is None else max_file_bytes
+    max_total_bytes = _ARCHIVE_MAX_TOTAL_BYTES if max_total_bytes is None else max_total_bytes
+
+    archive = RepositoryArchive()
+    try:
+        with tarfile.open(fileobj=resp.raw, mode="r|*") as tar:
+            for member in tar:
+                if archive.commit_sha is None:
+                    archive.commit_sha = _archive_commit_sha(tar, member.name)
+                if not member.isfile():
+                    continue
+                path = _archive_member_path(member.name)
+                if not path or is_default_ignored_repo_path(path):
+                    continue
+                archive.paths.append(path)
+                if path.lower().endswith(_ARCHIVE_BINARY_SUFFIXES):
+                    continue
+                if member.size > max_file_bytes or archive.total_bytes + member.size > max_total_bytes:
+                    archive.skipped_large += 1
+                    continue
+                handle = tar.extractfile(member)
+                if handle is None:
+                    continue
+                data = handle.read()
+                if b"\0" in data[:8192]:
+                    continue
+                archive.blob_shas[path] = remember_blob(data) or git_blob_sha(data)
+                archive.contents[path] = data.decode("utf-8", "replace")
+                archive.total_bytes += len(data)
+    finally:
+        resp.close()
+    return archive
+
+
+def _material_from_archive(
+    repo_url: str,
+    owner: str,
+    repo: str,
+    ref: str,
+    token: str | None,
+    metadata: dict[str, object],
+    archive: RepositoryArchive,
+) -> RepositoryMaterial:
+    known_paths = set(archive.paths)
+
+    def content_for(path: str) -> str | None:
+        if path in archive.contents:
+            return archive.contents[path]
+        if path not in known_paths:
+            return None
+        # Present in the tree but too large or binary for the archive pass.
+        return fetch_file_content(owner, repo, path, ref, token)
+
+    package_blobs = []
+    for candidate in PACKAGE_FILE_CANDIDATES:
+        content = content_for(candidate)
+        if content:
+            package_blobs.append(f"=== {candidate} ===\n{content}")
+
+    return RepositoryMaterial(
+        repo_url=repo_url,
+        file_tree="\n".join(sorted(known_paths)),
+        readme_content=content_for("README.md") or "",
+        package_files="\n\n".join(package_blobs),
+        default_branch=ref,
+        is_private=bool(metadata.get("is_private", False)),
+        prefetched_content=archive.contents,
+        blob_shas=archive.blob_shas,
+        # The wrapper directory only carries an abbreviated SHA, which is too weak to name a snapshot.
+        snapshot_ref=f"commit:{archive.commit_sha}" if _FULL_SHA_RE.fullmatch(archive.commit_sha or "") else None,
+    )
+
+
+def gather_repository_material(
+    repo_url: str,
+    token: str | None = None,
+    *,
+    fetch_mode: str = "contents",
+) -> RepositoryMaterial:
     owner, repo = owner_repo_from_url(repo_url)
     metadata = get_repository_metadata(owner, repo, token)
     ref = str(metadata.get("default_branch", "main"))
 
-    file_paths = fetch_file_tree(owner, repo, ref, token)
-    file_tree = "\n".join(sorted(file_paths))
-
-    readme = fetch_file_content(owner, repo, "README.md", ref, token) or ""
+    if fetch_mode == "archive":
+        try:
+            archive = fetch_repository_archive(owner, repo, ref, token)
+        except (requests.RequestException, tarfile.TarError, OSError) as exc:
+            logger.warning(
+                "Archive fetch failed for %s/%s@%s; falling back to per-file contents requests: %s",
+                owner,
+                repo,
+                ref,
+                exc,
+            )
+        else:
+            return _material_from_archive(repo_url, owner, repo, ref, token, metadata, archive)
+
+    tree_status = TreeWalkStatus()
+    paths: list[str] = []
+    blob_shas: dict[str, str] = {}
+    # README and manifests sit at the root, which is listed before any subtree, so in
+    # contents mode their fetches start as soon as they stream in and overlap the walk.
+    streamed = set() if fetch_mode == "graphql" and token else {"README.md", *PACKAGE_FILE_CANDIDATES}
+    prefetched: dict[str, Future[str | None]] = {}
+    prefetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="material-fetch")
+    try:
+        for entry in iter_file_tree_entries(owner, repo, ref, token, status=tree_status):
+            paths.append(entry.path)
+            if entry.sha:
+                blob_shas[entry.path] = entry.sha
+            if entry.path in streamed:
+                prefetched[entry.path] = prefetch_pool.submit(
+                    fetch_file_content, owner, repo, entry.path, ref, token, blob_sha=entry.sha or None
+                )
+    except BaseException:
+        prefetch_pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    prefetch_pool.shutdown(wait=False)
+    file_tree = "\n".join(sorted(paths))
+
+    batched: dict[str, str | None] = {}
+    if fetch_mode == "graphql" and token:
+        # Only ask for candidates that exist in the tree and are not already in the blob store.
+        wanted = [
+            path
+            for path in ("README.md", *PACKAGE_FILE_CANDIDATES)
+            if path in blob_shas and read_cached_blob(blob_shas[path]) is None
+        ]
+        if wanted:
+            try:
+                batched = fetch_file_contents_graphql(owner, repo, ref, wanted, token)
+            except (requests.RequestException, ValueError, FileNotFoundError) as exc:
+                logger.warning("GraphQL batch fetch failed for %s/%s; using contents requests: %s", owner, repo, exc)
+
+    def content_for(path: str) -> str | None:
+        if path in prefetched:
+            return prefetched[path].result()
+        if path in batched:
+            return batched[path]
+        if fetch_mode == "graphql" and token and path not in blob_shas:
+            return None
+        return fetch_file_content(owner, repo, path, ref, token, blob_sha=blob_shas.get(path))
+
+    readme = content_for("README.md") or ""
 
     package_blobs = []
-    for candidate in (
-        "pyproject.toml",
-        "setup.cfg",
-        "setup.py",
-        "requirements.txt",
-        "package.json",
-    ):
-        content = fetch_file_content(owner, repo, candidate, ref, token)
+    for candidate in PACKAGE_FILE_CANDIDATES:
+        content = content_for(candidate)
         if content:
             package_blobs.append(f"=== {candidate} ===\n{content}")
 
@@ -169,6 +784,9 @@ def gather_repository_material(repo_url: str, token: str | None = None) -> Repos
         package_files=package_files,
         default_branch=ref,
         is_private=bool(metadata.get("is_private", False)),
+        blob_shas=blob_shas,
+        tree_complete=tree_status.complete,
+        snapshot_ref=f"tree:{tree_status.tree_sha}" if tree_status.tree_sha else None,
     )
 
 
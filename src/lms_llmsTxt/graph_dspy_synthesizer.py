@@ -14,6 +14,7 @@ except ImportError:  # pragma: no cover - test fallback
 from .config import AppConfig
 from .graph_builder import _template_heading_count, validate_semantic_graph
 from .graph_models import GraphNodeEvidence, RepoGraphNode, RepoSkillGraph
+from .lm_cache import CachedPredict
 from .models import RepositoryMaterial
 from .repo_digest import RepoDigest
 from .signatures import SynthesizeRepoGraphNodes
@@ -118,7 +119,11 @@ def enrich_repo_graph_with_dspy(
 class RepoGraphDSPySynthesizer(dspy.Module):
     def __init__(self) -> None:
         super().__init__()
-        self.synthesize = dspy.ChainOfThought(SynthesizeRepoGraphNodes)
+        self.synthesize = CachedPredict(
+            dspy.ChainOfThought(SynthesizeRepoGraphNodes),
+            SynthesizeRepoGraphNodes,
+            validate=lambda outputs: bool(_parse_updates(outputs["node_updates_json"])),
+        )
 
     def forward(self, repo_topic: str, repo_summary: str, node_specs_json: str) -> Any:
         return self.synthesize(
@@ -11,12 +11,15 @@ from typing import Any, Iterator
 import requests
 
 from .config import AppConfig
+from .http_client import shared_session
 from .graph_models import GraphNodeEvidence, RepoGraphNode, RepoSkillGraph
 from .models import RepositoryMaterial
 from .repo_digest import RepoDigest
 
 logger = logging.getLogger(__name__)
 
+_SESSION = shared_session()
+
 DEFAULT_MAX_SOURCE_CHARS = 12_000
 DEFAULT_MAX_EXCERPT_CHARS = 2_000
 DEFAULT_MAX_SUBSYSTEMS = 10
@@ -298,7 +301,7 @@ def _post_chat_completion(
         )
 
     try:
-        response = requests.post(
+        response = _SESSION.post(
             url,
             headers=headers,
             json=payload,
@@ -344,7 +347,7 @@ def _post_streaming_chat_completion(
     chunks: list[str] = []
     response: requests.Response | None = None
     try:
-        response = requests.post(
+        response = _SESSION.post(
             url,
             headers=headers,
             json=streamed_payload,
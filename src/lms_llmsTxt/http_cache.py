@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Mapping
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .disk_budget import DirectoryBudget, touch
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+_REPLAYED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class ConditionalHTTPCache:
+    """
+    On-disk ETag/Last-Modified cache for idempotent GET requests.
+
+    Each entry is a ``<key>.json`` metadata file plus a ``<key>.body`` payload under
+    ``root/<key[:2]>/``. Callers add :meth:`validators` to outgoing headers and hand
+    the response to :meth:`resolve`, which stores fresh 200 responses and replays the
+    stored body when the server answers 304 Not Modified. Once the directory grows
+    past ``max_bytes``, the least recently stored or replayed entries are pruned.
+    """
+
+    def __init__(self, root: Path, *, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root)
+        self._budget = DirectoryBudget(self.root, max_bytes)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(
+        self,
+        url: str,
+        params: Mapping[str, object] | None = None,
+        token: str | None = None,
+    ) -> str:
+        # Private responses differ per credential, so the token scopes the key.
+        scope = hashlib.sha256(token.encode("utf-8")).hexdigest()[:12] if token else "anon"
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        raw = f"{scope}|{url}?{query}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        bucket = self.root / key[:2]
+        return bucket / f"{key}.json", bucket / f"{key}.body"
+
+    def _load_meta(self, key: str) -> dict[str, object] | None:
+        meta_path, body_path = self._paths(key)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            return json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def validators(self, key: str) -> dict[str, str]:
+        meta = self._load_meta(key)
+        if not meta:
+            return {}
+        headers: dict[str, str] = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = str(meta["etag"])
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = str(meta["last_modified"])
+        return headers
+
+    def replay(self, key: str) -> requests.Response | None:
+        meta = self._load_meta(key)
+        if meta is None:
+            return None
+        _, body_path = self._paths(key)
+        try:
+            body = body_path.read_bytes()
+        except OSError:
+            return None
+        touch(body_path)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.headers = CaseInsensitiveDict(meta.get("headers") or {})
+        response.url = str(meta.get("url", ""))
+        return response
+
+    def store(self, key: str, response: requests.Response) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        meta_path, body_path = self._paths(key)
+        meta = {
+            "url": response.url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": {name: response.headers[name] for name in _REPLAYED_HEADERS if name in response.headers},
+        }
+        try:
+            meta_path.parent.mkdir(parents=True, exist_ok=True)
+            encoded_meta = json.dumps(meta, sort_keys=True).encode("utf-8")
+            _atomic_write(body_path, response.content)
+            _atomic_write(meta_path, encoded_meta)
+        except OSError:
+            # The cache is an optimization; a read-only or full disk must not fail the run.
+            return
+        self._budget.charge(len(response.content) + len(encoded_meta))
+
+    def resolve(self, key: str, response: requests.Response) -> requests.Response:
+        """Return the response to hand to callers, replaying the cached body on 304."""
+        if response.status_code == 304:
+            cached = self.replay(key)
+            if cached is not None:
+                with self._lock:
+                    self.hits += 1
+                return cached
+        with self._lock:
+            self.misses += 1
+        if response.status_code == 200:
+            self.store(key, response)
+        return response
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evicted": self._budget.evicted}
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = (10, 30)
+DEFAULT_POOL_MAXSIZE = 16
+_TRANSIENT_STATUSES = (502, 503, 504)
+# Only GitHub API reads are retried. Link liveness probes must report what they saw,
+# and LM Studio POSTs are not idempotent.
+_RETRIED_PREFIXES = ("https://api.github.com/",)
+
+
+def _retry_policy(retries: int) -> Retry:
+    # Only GETs are retried; GitHub 403/429 handling lives in the rate limiter.
+    return Retry(
+        total=retries,
+        connect=min(1, retries),
+        read=retries,
+        status=retries,
+        backoff_factor=0.3,
+        status_forcelist=_TRANSIENT_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+
+
+class PooledSession(requests.Session):
+    """
+    Keep-alive session shared by every module that talks HTTP.
+
+    urllib3 keeps one connection pool per host; ``pool_maxsize`` bounds how many
+    connections each pool keeps open for concurrent callers. Requests without an
+    explicit ``timeout`` get :data:`DEFAULT_TIMEOUT`, GitHub API GETs are retried on
+    connection errors and 502/503/504 (every other request is sent once), and every
+    response is counted per host.
+    """
+
+    def __init__(self, *, pool_maxsize: int = DEFAULT_POOL_MAXSIZE, retries: int = 2) -> None:
+        super().__init__()
+        self._stats_lock = threading.Lock()
+        self._host_stats: dict[str, dict[str, float]] = {}
+        self.retries = retries
+        self.resize(pool_maxsize)
+
+    def resize(self, pool_maxsize: int) -> None:
+        """Remount adapters so each per-host pool keeps up to ``pool_maxsize`` connections."""
+        pool_maxsize = max(1, int(pool_maxsize))
+        if getattr(self, "pool_maxsize", None) == pool_maxsize:
+            # Keep the existing pools (and their open connections).
+            return
+        self.pool_maxsize = pool_maxsize
+        for prefix in ("https://", "http://"):
+            self.mount(prefix, HTTPAdapter(pool_connections=16, pool_maxsize=self.pool_maxsize, max_retries=0))
+        for prefix in _RETRIED_PREFIXES:
+            self.mount(
+                prefix,
+                HTTPAdapter(
+                    pool_connections=16,
+                    pool_maxsize=self.pool_maxsize,
+                    max_retries=_retry_policy(self.retries),
+                ),
+            )
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = DEFAULT_TIMEOUT
+        return super().request(method, url, *args, **kwargs)
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        host = urlsplit(request.url or "").netloc or "unknown"
+        started_at = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        except requests.RequestException:
+            self._record(host, time.perf_counter() - started_at, 0, error=True)
+            raise
+        if kwargs.get("stream"):
+            size = int(response.headers.get("Content-Length") or 0)
+        else:
+            size = len(response.content or b"")
+        self._record(host, time.perf_counter() - started_at, size, error=False)
+        return response
+
+    def _record(self, host: str, seconds: float, size: int, *, error: bool) -> None:
+        with self._stats_lock:
+            stats = self._host_stats.setdefault(
+                host, {"requests": 0, "errors": 0, "bytes": 0, "seconds": 0.0, "max_seconds": 0.0}
+            )
+            stats["requests"] += 1
+            stats["errors"] += int(error)
+            stats["bytes"] += size
+            stats["seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        with self._stats_lock:
+            return {
+                host: {
+                    "requests": int(values["requests"]),
+                    "errors": int(values["errors"]),
+                    "bytes": int(values["bytes"]),
+                    "seconds": round(values["seconds"], 3),
+                    "max_seconds": round(values["max_seconds"], 3),
+                }
+                for host, values in sorted(self._host_stats.items())
+            }
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._host_stats.clear()
+
+
+_SHARED_SESSION = PooledSession()
+
+
+def shared_session() -> PooledSession:
+    """Return the process-wide pooled session."""
+    return _SHARED_SESSION
+
+
+def http_stats() -> dict[str, dict[str, float]]:
+    return _SHARED_SESSION.stats()
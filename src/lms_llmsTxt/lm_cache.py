@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Mapping, get_origin
+
+try:
+    import dspy
+except ImportError:  # pragma: no cover - test fallback
+    from .signatures import dspy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.replace("\r\n", "\n").strip()
+    if isinstance(value, Mapping):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def lm_cache_key(
+    signature_name: str,
+    model: str,
+    inputs: Mapping[str, Any],
+    digest_id: str | None = None,
+) -> str:
+    """Hash the signature name, model id, repository digest id and normalized inputs into a cache key."""
+    payload = json.dumps(
+        {"signature": signature_name, "model": model, "digest": digest_id, "inputs": _normalize(inputs)},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LMResponseCache:
+    """
+    On-disk ``key -> outputs`` table for structured LM responses, backed by SQLite.
+
+    Keys cover the exact prompt inputs, so a stage whose inputs did not change is
+    served from disk even when other parts of the repository did. Entries carry
+    their size and last use; once the table exceeds ``max_bytes`` the least
+    recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._counts: dict[str, dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self.evictions = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS lm_responses ("
+                "key TEXT PRIMARY KEY, signature TEXT NOT NULL, model TEXT NOT NULL, digest_id TEXT, "
+                "outputs TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS lm_responses_last_used ON lm_responses (last_used)")
+
+    def get(self, key: str, signature_name: str) -> dict[str, Any] | None:
+        with self._lock:
+            try:
+                row = self._conn.execute("SELECT outputs FROM lm_responses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    with self._conn:
+                        self._conn.execute(
+                            "UPDATE lm_responses SET last_used = ? WHERE key = ?", (self._clock(), key)
+                        )
+            except sqlite3.Error as exc:
+                logger.debug("LM response cache read failed: %s", exc)
+                row = None
+            if row is None:
+                self._counts[signature_name]["misses"] += 1
+                return None
+            self._counts[signature_name]["hits"] += 1
+            return json.loads(row[0])
+
+    def put(
+        self,
+        key: str,
+        signature_name: str,
+        model: str,
+        outputs: Mapping[str, Any],
+        *,
+        digest_id: str | None = None,
+    ) -> None:
+        try:
+            encoded = json.dumps(dict(outputs), ensure_ascii=False)
+        except (TypeError, ValueError) as exc:
+            logger.debug("Not caching %s response: %s", signature_name, exc)
+            return
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO lm_responses "
+                        "(key, signature, model, digest_id, outputs, size, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (key, signature_name, model, digest_id, encoded, len(encoded.encode("utf-8")), self._clock()),
+                    )
+                    self._evict_locked()
+            except sqlite3.Error as exc:
+                # The cache is an optimization; a locked or read-only file must not fail the run.
+                logger.debug("LM response cache write failed: %s", exc)
+
+    def _evict_locked(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM lm_responses").fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+        victims: list[str] = []
+        for key, size in self._conn.execute("SELECT key, size FROM lm_responses ORDER BY last_used"):
+            victims.append(key)
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM lm_responses WHERE key = ?", [(key,) for key in victims])
+        self.evictions += len(victims)
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self.evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": sum(counts["hits"] for counts in self._counts.values()),
+                "misses": sum(counts["misses"] for counts in self._counts.values()),
+                "evictions": self.evictions,
+                "signatures": {name: dict(counts) for name, counts in sorted(self._counts.items())},
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_LM_CACHE: LMResponseCache | None = None
+_LM_CACHE_MODEL = ""
+_LM_CACHE_DIGEST_ID: str | None = None
+
+
+def configure_lm_cache(
+    path: Path | None,
+    *,
+    model: str | None = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> LMResponseCache | None:
+    """Enable (or disable with ``None``) the response cache used by analyzer stages and graph nodes."""
+    global _LM_CACHE, _LM_CACHE_MODEL, _LM_CACHE_DIGEST_ID
+    _LM_CACHE_MODEL = model or ""
+    _LM_CACHE_DIGEST_ID = None
+    current = _LM_CACHE
+    if current is not None and path is not None and current.path == Path(path):
+        current.max_bytes = max_bytes
+        current.reset_counters()
+        return current
+    if current is not None:
+        current.close()
+    try:
+        _LM_CACHE = LMResponseCache(path, max_bytes=max_bytes) if path is not None else None
+    except (OSError, sqlite3.Error) as exc:
+        logger.warning("LM response cache disabled: %s", exc)
+        _LM_CACHE = None
+    return _LM_CACHE
+
+
+def set_lm_cache_digest(digest_id: str | None) -> None:
+    """Tag entries written from now on with the repository digest they belong to."""
+    global _LM_CACHE_DIGEST_ID
+    _LM_CACHE_DIGEST_ID = digest_id
+
+
+def lm_cache_stats() -> dict[str, Any] | None:
+    return _LM_CACHE.stats() if _LM_CACHE is not None else None
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return not value.strip()
+    if isinstance(value, (list, tuple, Mapping)):
+        return not value
+    return False
+
+
+class CachedPredict(dspy.Module):
+    """
+    Serve a predictor's structured outputs from the LM response cache when its inputs repeat.
+
+    Only usable responses are written: every output field must be non-empty, list
+    and dict fields must have been parsed into lists and dicts, and ``validate``
+    (when given) must accept the outputs. A response the caller would fall back
+    from is therefore asked for again next run instead of being replayed.
+    """
+
+    def __init__(
+        self,
+        predictor: Any,
+        signature: Any,
+        *,
+        validate: Callable[[Mapping[str, Any]], bool] | None = None,
+    ) -> None:
+        super().__init__()
+        self.predictor = predictor
+        self.signature_name = signature.__name__
+        self.output_names = tuple(signature.output_fields)
+        self.structured_names = frozenset(
+            name
+            for name, info in signature.output_fields.items()
+            if get_origin(getattr(info, "annotation", None)) in (list, dict)
+        )
+        self.validate = validate
+
+    def _usable(self, outputs: Mapping[str, Any]) -> bool:
+        for name, value in outputs.items():
+            if _is_empty(value):
+                return False
+            if name in self.structured_names and not isinstance(value, (list, tuple, Mapping)):
+                return False
+        return self.validate is None or bool(self.validate(outputs))
+
+    def forward(self, **kwargs: Any) -> Any:
+        cache = _LM_CACHE
+        if cache is None:
+            return self.predictor(**kwargs)
+        digest_id = _LM_CACHE_DIGEST_ID
+        key = lm_cache_key(self.signature_name, _LM_CACHE_MODEL, kwargs, digest_id)
+        outputs = cache.get(key, self.signature_name)
+        if outputs is not None:
+            return dspy.Prediction(**outputs)
+        prediction = self.predictor(**kwargs)
+        outputs = {name: getattr(prediction, name, None) for name in self.output_names}
+        if self._usable(outputs):
+            cache.put(key, self.signature_name, _LM_CACHE_MODEL, outputs, digest_id=digest_id)
+        else:
+            logger.debug("Not caching %s response with missing or unparsed fields.", self.signature_name)
+        return prediction
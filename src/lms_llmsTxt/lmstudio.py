@@ -8,6 +8,7 @@ from urllib.parse import urlparse
 import requests
 
 from .config import AppConfig
+from .http_client import shared_session
 
 try:
     import dspy
@@ -21,6 +22,8 @@ except Exception:  # pragma: no cover - private helper exists in supported DSPy
 
 logger = logging.getLogger(__name__)
 
+_SESSION = shared_session()
+
 try:  # Optional dependency recommended for managed unload
     import lmstudio as _LMSTUDIO_SDK  # type: ignore
 except Exception:  # pragma: no cover - SDK is optional at runtime
@@ -129,7 +132,7 @@ def _fetch_models(
     for endpoint in _MODEL_ENDPOINTS:
         url = _build_lmstudio_url(base_url, endpoint)
         try:
-            response = requests.get(url, headers=headers, timeout=5)
+            response = _SESSION.get(url, headers=headers, timeout=5)
             response.raise_for_status()
             payload = response.json()
         except requests.RequestException as exc:
@@ -208,7 +211,7 @@ def _load_model_rest(config: AppConfig) -> bool:
             payload.get("ttl", "default"),
             payload.get("context_length", "default"),
         )
-        response = requests.post(
+        response = _SESSION.post(
             url,
             headers=_lmstudio_headers(config, json_content=True),
             json=payload,
@@ -359,7 +362,7 @@ def _unload_model_rest(config: AppConfig) -> bool:
         return False
     url = f"{_rest_api_base(config.lm_api_base)}/api/v1/models/unload"
     try:
-        response = requests.post(
+        response = _SESSION.post(
             url,
             headers=_lmstudio_headers(config, json_content=True),
             json={"instance_id": instance_id},
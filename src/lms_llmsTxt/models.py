@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any
 
+from .path_index import RepoPathIndex
+
 
 @dataclass(slots=True)
 class RepositoryMaterial:
@@ -14,6 +16,25 @@ class RepositoryMaterial:
     package_files: str
     default_branch: str
     is_private: bool
+    # Full-file text already downloaded in bulk (for example from the repository
+    # tarball), keyed by repo-relative path. Evidence fetches consult this first.
+    prefetched_content: dict[str, str] = field(default_factory=dict, repr=False, compare=False)
+    # Git blob SHA per repo-relative path, used to serve unchanged files from the blob store.
+    blob_shas: dict[str, str] = field(default_factory=dict, repr=False, compare=False)
+    # False when part of a truncated GitHub tree could not be listed.
+    tree_complete: bool = field(default=True, compare=False)
+    # Identifies the snapshot the material was read from and namespaces persisted
+    # digest snapshots. The prefix names what the value is, per source:
+    #   "tree:<sha>"     git tree SHA of the ref (GitHub contents and GraphQL modes)
+    #   "commit:<sha>"   full commit SHA (GitHub archive mode, local checkout HEAD)
+    #   "listing:<hash>" hash of the path listing (local checkout without a HEAD)
+    # None when the source cannot name the snapshot, which disables snapshot reuse.
+    snapshot_ref: str | None = field(default=None, compare=False)
+
+    @property
+    def path_index(self) -> RepoPathIndex:
+        """Parsed view of ``file_tree``, shared by every stage that reads the same tree."""
+        return RepoPathIndex.for_tree(self.file_tree)
 
 
 @dataclass(slots=True)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import posixpath
+import sys
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterable
+
+
+@dataclass(frozen=True, slots=True)
+class RepoPathIndex:
+    """
+    Immutable view of a newline-joined file tree, parsed once.
+
+    ``lines`` keeps the raw lines in their original order (what trimming and
+    prompts see); ``paths`` is the sorted, de-duplicated set of stripped, interned
+    paths with ``extensions`` and ``depths`` as aligned columns. Indexes are cached
+    by tree text, so every stage that asks for the same tree shares one instance.
+    """
+
+    lines: tuple[str, ...]
+    paths: tuple[str, ...]
+    extensions: tuple[str, ...] = field(repr=False)
+    depths: tuple[int, ...] = field(repr=False)
+    line_count: int = 0
+
+    @classmethod
+    def for_tree(cls, file_tree: str) -> RepoPathIndex:
+        return _index_for_tree(file_tree or "")
+
+    @classmethod
+    def from_paths(cls, paths: Iterable[str]) -> RepoPathIndex:
+        return cls.for_tree("\n".join(paths))
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __contains__(self, path: object) -> bool:
+        if not isinstance(path, str):
+            return False
+        pos = bisect_left(self.paths, path)
+        return pos < len(self.paths) and self.paths[pos] == path
+
+    def with_prefix(self, prefix: str) -> tuple[str, ...]:
+        """Return every path starting with ``prefix``, in sorted order."""
+        start = bisect_left(self.paths, prefix)
+        # "\U0010ffff" sorts after any character that can follow the prefix.
+        end = bisect_left(self.paths, prefix + "\U0010ffff", start)
+        return self.paths[start:end]
+
+    def with_extension(self, *extensions: str) -> tuple[str, ...]:
+        """Return paths whose lowercased extension (``".md"``) is one of ``extensions``."""
+        wanted = {ext.lower() for ext in extensions}
+        return tuple(path for path, ext in zip(self.paths, self.extensions) if ext in wanted)
+
+    def head(self, max_lines: int) -> tuple[str, ...]:
+        """Return the first ``max_lines`` raw lines in original order."""
+        return self.lines[: max(0, max_lines)]
+
+
+@lru_cache(maxsize=16)
+def _index_for_tree(file_tree: str) -> RepoPathIndex:
+    lines = tuple(file_tree.splitlines())
+    unique = sorted({sys.intern(line.strip()) for line in lines if line.strip()})
+    return RepoPathIndex(
+        lines=lines,
+        paths=tuple(unique),
+        extensions=tuple(posixpath.splitext(path)[1].lower() for path in unique),
+        depths=tuple(path.count("/") for path in unique),
+        line_count=sum(1 for line in lines if line.strip()),
+    )
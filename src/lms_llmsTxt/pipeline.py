@@ -7,27 +7,53 @@ import requests
 import threading
 import time
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import asdict, is_dataclass
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional, Sequence
 
-from .analyzer import RepositoryAnalyzer
+from .analyzer import LinkVerdictMemo, RepositoryAnalyzer, configure_url_validation
 from .context_budget import BudgetDecision, build_context_budget
 from .config import AppConfig
 from .context_compaction import compact_material
-from .full_builder import build_llms_full_from_repo
+from .full_builder import GhRef, build_llms_full_from_repo
 from .fallback import (
     fallback_llms_payload,
     fallback_markdown_from_payload,
 )
-from .github import fetch_file_content, gather_repository_material, owner_repo_from_url
+from .github import (
+    blob_store_stats,
+    configure_blob_store,
+    configure_http_cache,
+    configure_rate_limiter,
+    fetch_file_contents_graphql,
+    http_cache_stats,
+    owner_repo_from_url,
+    rate_limit_stats,
+    read_cached_blob,
+)
 from .graph_builder import build_repo_graph, emit_graph_files
+from .http_client import DEFAULT_POOL_MAXSIZE, shared_session
+from .sources import LocalRepositorySource, RepositorySource, open_repository_source
+from .digest_store import configure_digest_store, digest_store_stats
+from .lm_cache import configure_lm_cache, lm_cache_stats, set_lm_cache_digest
+from .url_liveness import configure_liveness_cache, liveness_cache_stats
 from .graph_dspy_synthesizer import enrich_repo_graph_with_dspy
 from .lmstudio import configure_lmstudio_lm, LMStudioConnectivityError, unload_lmstudio_model
 from .models import GenerationArtifacts, RepositoryMaterial
 from .reasoning import sanitize_final_output
-from .repo_digest import EvidenceFetchLimits, apply_evidence_plan, build_repo_digest, plan_evidence_paths, suggested_evidence_limit
+from .repo_digest import (
+    DigestMemo,
+    EvidenceFetchLimits,
+    apply_evidence_plan,
+    build_repo_digest,
+    capsule_extraction_stats,
+    configure_capsule_extraction,
+    plan_evidence_paths,
+    suggested_evidence_limit,
+)
 from .retry_policy import ErrorClass, classify_generation_error, next_retry_budget
 from .schema import LLMS_JSON_SCHEMA
 
@@ -143,7 +169,7 @@ class RunLog:
 
 def _material_metrics(material: RepositoryMaterial) -> dict[str, int | bool]:
     return {
-        "file_tree_lines": len([line for line in material.file_tree.splitlines() if line.strip()]),
+        "file_tree_lines": material.path_index.line_count,
         "readme_chars": len(material.readme_content),
         "package_chars": len(material.package_files),
         "is_private": material.is_private,
@@ -223,22 +249,104 @@ def _graph_enrichment_auto_decision(material: RepositoryMaterial, config: AppCon
     return True, "per-node graph synthesis uses bounded node specs and can run on large repository trees"
 
 
-def _fetch_graph_evidence_content(
-    owner: str,
-    repo: str,
-    path: str,
-    ref: str,
-    token: str | None,
-) -> str | None:
+def _evidence_reader(source: RepositorySource, ref: str) -> Callable[[str], str | None]:
+    """Per-file evidence reader over the run's repository source, pinned to ``ref``."""
+    return lambda path: source.read_file(path, ref)
+
+
+def _fetch_graph_evidence_content(read: Callable[[str], str | None], path: str) -> str | None:
     """Best-effort graph evidence fetch; graph depth must not break generation."""
     try:
-        return fetch_file_content(owner, repo, path, ref, token)
+        return read(path)
     except Exception as exc:  # pragma: no cover - exact HTTP failures vary by GitHub state
         logger.debug("Skipping graph evidence fetch for %s: %s", path, exc)
         return None
 
-def prepare_repository_material(config: AppConfig, repo_url: str) -> RepositoryMaterial:
-    return gather_repository_material(repo_url, config.github_token)
+def _cached_or_fetch(material: RepositoryMaterial, path: str, fetch: Callable[[str], str | None]) -> str | None:
+    """Serve evidence from bulk-downloaded content or the blob store before issuing a per-file request."""
+    content = material.prefetched_content.get(path)
+    if content:
+        return content
+    cached = read_cached_blob(material.blob_shas.get(path))
+    if cached is not None:
+        return cached.decode("utf-8", "replace")
+    return fetch(path)
+
+
+def _graphql_batch_fetcher(
+    material: RepositoryMaterial,
+    owner: str,
+    repo: str,
+    config: AppConfig,
+) -> Callable[[Sequence[str]], dict[str, str | None]] | None:
+    """Return a one-query evidence fetcher when GraphQL mode is enabled and authenticated."""
+    if config.github_fetch_mode != "graphql" or not config.github_token or config.local_repo_path is not None:
+        return None
+
+    def fetch_many(paths: Sequence[str]) -> dict[str, str | None]:
+        pending = [
+            path
+            for path in paths
+            if not material.prefetched_content.get(path)
+            and read_cached_blob(material.blob_shas.get(path)) is None
+        ]
+        if not pending:
+            return {}
+        try:
+            return fetch_file_contents_graphql(owner, repo, material.default_branch, pending, config.github_token)
+        except (requests.RequestException, ValueError, FileNotFoundError) as exc:
+            logger.warning("GraphQL evidence batch failed; falling back to per-file fetches: %s", exc)
+            return {}
+
+    return fetch_many
+
+
+def _full_content_lookup(
+    material: RepositoryMaterial,
+    owner: str,
+    repo: str,
+    read_local: Callable[[str], str | None] | None = None,
+) -> Callable[[GhRef, str], bytes | None]:
+    """Resolve llms-full GitHub links for this repository/ref from already-known content."""
+
+    def lookup(gh: GhRef, ref: str) -> bytes | None:
+        if (gh.owner.lower(), gh.repo.lower()) != (owner.lower(), repo.lower()) or ref != material.default_branch:
+            return None
+        content = material.prefetched_content.get(gh.path)
+        if content is None and read_local is not None:
+            content = read_local(gh.path)
+        if content is not None:
+            return content.encode("utf-8")
+        return read_cached_blob(material.blob_shas.get(gh.path))
+
+    return lookup
+
+
+def _link_validation_mode(config: AppConfig) -> str:
+    """Local checkouts may be private, unpushed or offline, so their tree links are trusted."""
+    if config.local_repo_path is not None:
+        return "trust-tree"
+    return config.link_validation_mode
+
+
+def _open_source(config: AppConfig, repo_url: str) -> RepositorySource:
+    return open_repository_source(
+        repo_url,
+        local_path=config.local_repo_path,
+        token=config.github_token,
+        fetch_mode=config.github_fetch_mode,
+    )
+
+
+def prepare_repository_material(
+    config: AppConfig,
+    repo_url: str,
+    *,
+    source: RepositorySource | None = None,
+) -> RepositoryMaterial:
+    if source is None:
+        source = _open_source(config, repo_url)
+    return source.load_material()
 
 
 def run_generation(
@@ -274,9 +382,48 @@ def run_generation(
         generate_graph=generate_graph if generate_graph is not None else config.enable_repo_graph,
     )
 
+    configure_http_cache(
+        config.resolve_cache_dir() / "http" if config.github_http_cache else None,
+        max_bytes=int(config.github_http_cache_max_mb * 1024 * 1024),
+    )
+    configure_blob_store(
+        config.resolve_cache_dir() / "blobs" if config.github_blob_cache else None,
+        max_bytes=int(config.github_blob_cache_max_mb * 1024 * 1024),
+    )
+    configure_rate_limiter(
+        reserve=config.github_rate_limit_reserve,
+        max_wait_seconds=config.github_rate_limit_max_wait_seconds,
+    )
+    http_session = shared_session()
+    # Evidence prefetch and subtree walks share the GitHub pool; leave room for both.
+    http_session.resize(max(DEFAULT_POOL_MAXSIZE, 2 * int(config.evidence_fetch_concurrency)))
+    http_session.reset_stats()
+    configure_url_validation(
+        workers=config.url_validation_concurrency,
+        budget_seconds=config.url_validation_budget_seconds,
+    )
+    configure_liveness_cache(
+        config.resolve_cache_dir() / "url-liveness.sqlite3" if config.url_liveness_cache else None,
+        positive_ttl=config.url_liveness_ttl_seconds,
+        negative_ttl=config.url_liveness_negative_ttl_seconds,
+    )
+    configure_lm_cache(
+        config.resolve_cache_dir() / "lm-responses.sqlite3" if config.lm_response_cache else None,
+        model=config.lm_model,
+        max_bytes=int(config.lm_response_cache_max_mb * 1024 * 1024),
+    )
+    configure_digest_store(
+        config.resolve_cache_dir() / "repo-digests.sqlite3" if config.repo_digest_cache else None
+    )
+    configure_capsule_extraction(
+        workers=config.capsule_extraction_workers,
+        min_chars=config.capsule_parallel_min_chars,
+    )
     logger.debug("Preparing repository material for %s", repo_url)
     material_started_at = time.perf_counter()
-    material = prepare_repository_material(config, repo_url)
+    # One source per run: material and every later evidence read share its root and ref.
+    source = _open_source(config, repo_url)
+    material = prepare_repository_material(config, repo_url, source=source)
     _record_run_event(
         events_path=run_events_path,
         log_path=run_log_path,
@@ -284,13 +431,14 @@ def run_generation(
         stage="prepare_repository_material",
         status="completed",
         started_at=material_started_at,
-        file_tree_lines=len([line for line in material.file_tree.splitlines() if line.strip()]),
+        file_tree_lines=material.path_index.line_count,
         readme_chars=len(material.readme_content or ""),
         package_chars=len(material.package_files or ""),
+        tree_complete=material.tree_complete,
     )
     analyzer_construct_started_at = time.perf_counter()
     try:
-        analyzer = RepositoryAnalyzer(production_mode=True)
+        analyzer = RepositoryAnalyzer(production_mode=True, mode=config.analyzer_mode)
     except TypeError:
         # Compatibility with tests that monkeypatch RepositoryAnalyzer as a zero-arg callable.
         analyzer = RepositoryAnalyzer()
@@ -311,6 +459,31 @@ def run_generation(
     analyzer_trace = None
 
     model_loaded = False
+    # Planning, final, retry and graph digests reuse capsules of unchanged chunks.
+    digest_memo = DigestMemo()
+
+    # The deterministic fallback keeps building over the full tree while the LM
+    # stages run on the possibly compacted one. Link verdicts are shared through
+    # verdict_memo, so a link both sides keep is checked once, and an LM failure
+    # costs no second round of network checks. A successful LM run cancels the
+    # fallback before it renders.
+    verdict_memo = LinkVerdictMemo()
+    fallback_cancel = threading.Event()
+    build_fallback = partial(
+        fallback_llms_payload,
+        repo_name=project_name,
+        repo_url=repo_url,
+        file_tree=material.file_tree,
+        readme_content=material.readme_content,
+        default_branch=material.default_branch,
+        is_private=material.is_private,
+        github_token=config.github_token,
+        link_style=config.link_style,
+        link_validation=_link_validation_mode(config),
+        verdict_memo=verdict_memo,
+        cancel_event=fallback_cancel,
+    )
+    speculative_fallback: Future | None = None
 
     try:
         logger.info("Configuring LM Studio model '%s'", config.lm_model)
@@ -335,6 +508,10 @@ def run_generation(
             started_at=lm_config_started_at,
             model=config.lm_model,
         )
+        # Start link checks only once the model is configured and the run is going ahead.
+        fallback_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculative-fallback")
+        speculative_fallback = fallback_pool.submit(build_fallback)
+        fallback_pool.shutdown(wait=False)
 
         working_material = material
         budget = build_context_budget(config, working_material)
@@ -357,7 +534,7 @@ def run_generation(
             )
 
         digest_stage = run_log.stage_start("repo_digest.initial")
-        planning_digest = build_repo_digest(material, topic=project_name)
+        planning_digest = build_repo_digest(material, topic=project_name, memo=digest_memo)
         run_log.stage_end("repo_digest.initial", digest_stage, subsystem_count=len(planning_digest.subsystems))
         evidence_plan = None
         if budget.decision != BudgetDecision.APPROVED:
@@ -378,18 +555,18 @@ def run_generation(
                 dropped_count=evidence_plan.dropped_count,
                 budget_reason=evidence_plan.budget_reason,
             )
-            if evidence_plan.dropped_paths:
+            if evidence_plan.dropped_count:
                 apply_stage = run_log.stage_start("evidence_apply", selected_count=evidence_plan.selected_count)
                 working_material = apply_evidence_plan(
                     material,
                     evidence_plan,
-                    fetch_content=lambda path: fetch_file_content(
-                        owner,
-                        repo,
+                    fetch_content=lambda path: _cached_or_fetch(
+                        material,
                         path,
-                        material.default_branch,
-                        config.github_token,
+                        _evidence_reader(source, material.default_branch),
                     ),
+                    fetch_many=_graphql_batch_fetcher(material, owner, repo, config),
+                    limits=EvidenceFetchLimits(max_concurrency=max(1, int(config.evidence_fetch_concurrency))),
                 )
                 run_log.stage_end("evidence_apply", apply_stage, **_material_metrics(working_material))
                 budget_stage = run_log.stage_start("context_budget.after_evidence")
@@ -408,7 +585,7 @@ def run_generation(
                         budget.available_tokens,
                         budget.decision,
                         len(evidence_plan.selected_paths),
-                        len(evidence_plan.dropped_paths),
+                        evidence_plan.dropped_count,
                     )
 
         if budget.decision != BudgetDecision.APPROVED:
@@ -433,7 +610,8 @@ def run_generation(
                 )
 
         digest_stage = run_log.stage_start("repo_digest.final")
-        repo_digest = build_repo_digest(working_material, topic=project_name)
+        repo_digest = build_repo_digest(working_material, topic=project_name, memo=digest_memo)
+        set_lm_cache_digest(repo_digest.digest_id)
         run_log.stage_end("repo_digest.final", digest_stage, subsystem_count=len(repo_digest.subsystems))
         llms_text = ""
         retry_step = 0
@@ -459,6 +637,8 @@ def run_generation(
                     "github_token": config.github_token,
                     "link_style": config.link_style,
                     "repo_digest": repo_digest,
+                    "link_validation": _link_validation_mode(config),
+                    "verdict_memo": verdict_memo,
                 }
                 analyzer_stage = run_log.stage_start(
                     "analyzer.generate",
@@ -489,7 +669,7 @@ def run_generation(
                     output_chars=len(llms_text or ""),
                 )
                 analyzer_trace = getattr(result, "trace", None)
-                if analyzer_trace is not None and evidence_plan is not None and evidence_plan.dropped_paths:
+                if analyzer_trace is not None and evidence_plan is not None and evidence_plan.dropped_count:
                     analyzer_trace.selected_evidence = [
                         *[
                             {
@@ -549,7 +729,8 @@ def run_generation(
                         raise
                     current_budget = reduced
                     working_material = compact_material(working_material, current_budget, config)
-                    repo_digest = build_repo_digest(working_material, topic=project_name)
+                    repo_digest = build_repo_digest(working_material, topic=project_name, memo=digest_memo)
+                    set_lm_cache_digest(repo_digest.digest_id)
                     run_log.event(
                         "analyzer.retry_budget_reduced",
                         retry_step=retry_step,
@@ -566,6 +747,8 @@ def run_generation(
                         )
                     continue
                 raise
+        fallback_cancel.set()
+        speculative_fallback.cancel()
     except (
         LiteLLMBadRequestError,
         LiteLLMRateLimitError,
@@ -575,7 +758,12 @@ def run_generation(
     ) as exc:
         used_fallback = True
         fallback_reason = str(exc)
-        run_log.event("generation.fallback", reason=fallback_reason, error_type=type(exc).__name__)
+        run_log.event(
+            "generation.fallback",
+            reason=fallback_reason,
+            error_type=type(exc).__name__,
+            fallback_ready=speculative_fallback is not None and speculative_fallback.done(),
+        )
         logger.warning("LM generation unavailable; using fallback output. Reason: %s", exc)
         _record_run_event(
             events_path=run_events_path,
@@ -585,21 +773,18 @@ def run_generation(
             status="fallback",
             error=str(exc),
         )
-        fallback_payload = fallback_llms_payload(
-            repo_name=project_name,
-            repo_url=repo_url,
-            file_tree=material.file_tree,
-            readme_content=material.readme_content,
-            default_branch=material.default_branch,
-            is_private=material.is_private,
-            github_token=config.github_token,
-            link_style=config.link_style,
-        )
+        fallback_payload = speculative_fallback.result() if speculative_fallback is not None else build_fallback()
         llms_text = fallback_markdown_from_payload(project_name, fallback_payload)
     except Exception as exc:  # pragma: no cover - defensive fallback
         used_fallback = True
         fallback_reason = str(exc)
-        run_log.event("generation.fallback", reason=fallback_reason, error_type=type(exc).__name__, unexpected=True)
+        run_log.event(
+            "generation.fallback",
+            reason=fallback_reason,
+            error_type=type(exc).__name__,
+            unexpected=True,
+            fallback_ready=speculative_fallback is not None and speculative_fallback.done(),
+        )
         logger.exception("Unexpected error during DSPy generation: %s", exc)
         logger.warning("Falling back to heuristic llms.txt generation using %s.", LLMS_JSON_SCHEMA["title"])
         _record_run_event(
@@ -610,16 +795,7 @@ def run_generation(
             status="fallback",
             error=str(exc),
         )
-        fallback_payload = fallback_llms_payload(
-            repo_name=project_name,
-            repo_url=repo_url,
-            file_tree=material.file_tree,
-            readme_content=material.readme_content,
-            default_branch=material.default_branch,
-            is_private=material.is_private,
-            github_token=config.github_token,
-            link_style=config.link_style,
-        )
+        fallback_payload = speculative_fallback.result() if speculative_fallback is not None else build_fallback()
         llms_text = fallback_markdown_from_payload(project_name, fallback_payload)
 
     sanitized = sanitize_final_output(llms_text, strict=True)
@@ -668,6 +844,14 @@ def run_generation(
             default_ref=material.default_branch,
             token=config.github_token,
             link_style=config.link_style,
+            content_lookup=_full_content_lookup(
+                material,
+                owner,
+                repo,
+                _evidence_reader(source, material.default_branch)
+                if isinstance(source, LocalRepositorySource)
+                else None,
+            ),
         )
         llms_full_path = repo_root / f"{base_name}-llms-full.txt"
         logger.debug("Writing llms-full to %s", llms_full_path)
@@ -687,7 +871,7 @@ def run_generation(
     should_generate_graph = config.enable_repo_graph if generate_graph is None else bool(generate_graph)
     if should_generate_graph:
         graph_material = working_material if 'working_material' in locals() else material
-        graph_planning_digest = build_repo_digest(graph_material, topic=project_name)
+        graph_planning_digest = build_repo_digest(graph_material, topic=project_name, memo=digest_memo)
         graph_evidence_stage = run_log.stage_start("graph.evidence_planning")
         graph_evidence_max_paths = max(24, int(config.semantic_graph_max_subsystems) * 8)
         graph_evidence_plan = plan_evidence_paths(
@@ -699,18 +883,21 @@ def run_generation(
             graph_material = apply_evidence_plan(
                 graph_material,
                 graph_evidence_plan,
-                fetch_content=lambda path: _fetch_graph_evidence_content(
-                    owner,
-                    repo,
+                fetch_content=lambda path: _cached_or_fetch(
+                    graph_material,
                     path,
-                    graph_material.default_branch,
-                    config.github_token,
+                    lambda missing: _fetch_graph_evidence_content(
+                        _evidence_reader(source, graph_material.default_branch),
+                        missing,
+                    ),
                 ),
+                fetch_many=_graphql_batch_fetcher(graph_material, owner, repo, config),
                 limits=EvidenceFetchLimits(
                     max_fetches=min(graph_evidence_max_paths, max(12, int(config.semantic_graph_max_subsystems) * 4)),
                     max_bytes_per_fetch=max(1_200, int(config.semantic_graph_max_excerpt_chars) * 3),
                     max_total_bytes=max(8_000, int(config.semantic_graph_max_source_chars)),
                     max_path_depth=8,
+                    max_concurrency=max(1, int(config.evidence_fetch_concurrency)),
                 ),
             )
         run_log.stage_end(
@@ -721,7 +908,8 @@ def run_generation(
             fetched_count=len(graph_evidence_plan.fetched_paths),
             skipped_count=len(graph_evidence_plan.fetch_skipped),
         )
-        digest = build_repo_digest(graph_material, topic=project_name)
+        digest = build_repo_digest(graph_material, topic=project_name, memo=digest_memo)
+        set_lm_cache_digest(digest.digest_id)
         graph = build_repo_graph(digest)
         decision_stage = run_log.stage_start("graph.dspy_enrichment_decision")
         should_enrich_graph, enrichment_reason = _graph_enrichment_auto_decision(graph_material, config)
@@ -832,6 +1020,26 @@ def run_generation(
             started_at=unload_started_at,
         )
 
+    cache_stats = http_cache_stats()
+    if cache_stats is not None:
+        run_log.event("github.http_cache", **cache_stats)
+    blob_stats = blob_store_stats()
+    if blob_stats is not None:
+        run_log.event("github.blob_store", **blob_stats)
+    run_log.event("github.rate_limit", **rate_limit_stats())
+    run_log.event("http.hosts", hosts=http_session.stats())
+    liveness_stats = liveness_cache_stats()
+    if liveness_stats is not None:
+        run_log.event("url_liveness.cache", **liveness_stats)
+    run_log.event("repo_digest.memo", **digest_memo.stats())
+    snapshot_stats = digest_store_stats()
+    if snapshot_stats is not None:
+        run_log.event("repo_digest.snapshots", **snapshot_stats)
+    run_log.event("repo_digest.extraction", **capsule_extraction_stats())
+    response_cache_stats = lm_cache_stats()
+    if response_cache_stats is not None:
+        run_log.event("lm.response_cache", **response_cache_stats)
+
     _record_run_event(
         events_path=run_events_path,
         log_path=run_log_path,
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+
+logger = logging.getLogger(__name__)
+
+# Below this fraction of the hourly limit, requests are paced across the reset window.
+_PACING_FRACTION = 0.1
+# GitHub asks clients to wait at least a minute on secondary limits without Retry-After.
+_SECONDARY_LIMIT_BACKOFF_SECONDS = 60.0
+
+
+@dataclass(slots=True)
+class _BucketState:
+    limit: int | None = None
+    remaining: int | None = None
+    reset_at: float | None = None
+    next_slot: float = 0.0
+
+
+class GitHubRateLimiter:
+    """
+    Token bucket fed by GitHub's ``X-RateLimit-*`` and ``Retry-After`` headers.
+
+    ``acquire`` runs before every request and sleeps when the bucket for that
+    resource (``core``, ``graphql``, ...) is down to ``reserve`` tokens or when
+    pacing is needed to stretch the remaining budget to the reset time.
+    ``observe`` reads the response headers and returns how long to wait before a
+    retry when the response was throttled (403/429), or ``None`` otherwise.
+    """
+
+    def __init__(
+        self,
+        *,
+        reserve: int = 5,
+        max_wait_seconds: float = 900.0,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.reserve = reserve
+        self.max_wait_seconds = max_wait_seconds
+        self._sleep = sleep
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: dict[str, _BucketState] = {}
+        self.reset_counters()
+
+    def configure(self, *, reserve: int | None = None, max_wait_seconds: float | None = None) -> None:
+        with self._lock:
+            if reserve is not None:
+                self.reserve = max(0, int(reserve))
+            if max_wait_seconds is not None:
+                self.max_wait_seconds = max(0.0, float(max_wait_seconds))
+
+    def reset_counters(self) -> None:
+        self.requests = 0
+        self.throttled_requests = 0
+        self.waited_seconds = 0.0
+
+    def _bucket(self, resource: str) -> _BucketState:
+        return self._buckets.setdefault(resource, _BucketState())
+
+    def acquire(self, resource: str = "core") -> None:
+        with self._lock:
+            self.requests += 1
+            bucket = self._bucket(resource)
+            now = self._clock()
+            wait = 0.0
+            if bucket.remaining is not None and bucket.reset_at is not None and bucket.reset_at > now:
+                if bucket.remaining <= self.reserve:
+                    wait = bucket.reset_at - now
+                elif bucket.limit and bucket.remaining <= bucket.limit * _PACING_FRACTION:
+                    interval = (bucket.reset_at - now) / max(1, bucket.remaining - self.reserve)
+                    slot = max(now, bucket.next_slot)
+                    bucket.next_slot = slot + interval
+                    wait = slot - now
+                # Spend a token optimistically so concurrent callers see the drain.
+                bucket.remaining = max(0, bucket.remaining - 1)
+            wait = min(wait, self.max_wait_seconds)
+            if wait > 0:
+                self.waited_seconds += wait
+        if wait > 0:
+            logger.info("GitHub %s rate limit low; waiting %.1fs before the next request.", resource, wait)
+            self._sleep(wait)
+
+    def observe(self, response: Any, resource: str = "core") -> float | None:
+        headers: Mapping[str, str] = getattr(response, "headers", None) or {}
+        status = int(getattr(response, "status_code", 0) or 0)
+        now = self._clock()
+        resource = str(headers.get("X-RateLimit-Resource") or resource)
+        with self._lock:
+            bucket = self._bucket(resource)
+            limit = _int_header(headers, "X-RateLimit-Limit")
+            remaining = _int_header(headers, "X-RateLimit-Remaining")
+            reset = _int_header(headers, "X-RateLimit-Reset")
+            if limit is not None:
+                bucket.limit = limit
+            if remaining is not None:
+                bucket.remaining = remaining
+            if reset is not None:
+                bucket.reset_at = float(reset)
+
+            if status not in (403, 429):
+                return None
+            retry_after = _int_header(headers, "Retry-After")
+            if retry_after is not None:
+                delay = float(retry_after)
+            elif remaining == 0 and bucket.reset_at is not None:
+                delay = max(0.0, bucket.reset_at - now) + 1.0
+            elif status == 429:
+                delay = _SECONDARY_LIMIT_BACKOFF_SECONDS
+            else:
+                # A plain 403 without rate-limit signals is a permissions error.
+                return None
+            self.throttled_requests += 1
+        if delay > self.max_wait_seconds:
+            logger.warning(
+                "GitHub %s rate limit requires waiting %.0fs, above the %.0fs limit; not retrying.",
+                resource,
+                delay,
+                self.max_wait_seconds,
+            )
+            return None
+        return delay
+
+    def wait(self, seconds: float) -> None:
+        with self._lock:
+            self.waited_seconds += seconds
+        self._sleep(seconds)
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "throttled_requests": self.throttled_requests,
+                "waited_seconds": round(self.waited_seconds, 2),
+                "buckets": {
+                    name: {
+                        "limit": bucket.limit,
+                        "remaining": bucket.remaining,
+                        "reset_at": int(bucket.reset_at) if bucket.reset_at is not None else None,
+                    }
+                    for name, bucket in sorted(self._buckets.items())
+                },
+            }
+
+
+def _int_header(headers: Mapping[str, str], name: str) -> int | None:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
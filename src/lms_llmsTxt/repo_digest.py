@@ -2,11 +2,31 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 import hashlib
+import heapq
+import logging
 import math
+import multiprocessing
+import os
 import re
-from collections.abc import Callable, Iterable
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
+from .digest_store import digest_store_enabled, load_digest_snapshot, save_digest_snapshot
 from .models import RepositoryMaterial
+from .path_index import RepoPathIndex
+from .symbol_lexer import language_for_path, lex_symbols
+
+# Bump whenever chunking, capsule extraction or the reduce step changes output, so
+# persisted digest snapshots from older code are not served.
+DIGEST_SCHEMA_VERSION = 4
+# Content chunks at least this long are worth a round trip to the extraction pool.
+DEFAULT_PARALLEL_MIN_CHARS = 256 * 1024
+_SLOWEST_CHUNKS = 5
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(slots=True)
@@ -42,6 +62,7 @@ class RepoDigest:
 @dataclass(slots=True)
 class EvidencePlan:
     selected_paths: list[str]
+    # The highest-ranked paths left out, capped at _DROPPED_PREVIEW_LIMIT.
     dropped_paths: list[str]
     selected_reasons: dict[str, str] = field(default_factory=dict)
     candidate_count: int = 0
@@ -59,6 +80,8 @@ class EvidenceFetchLimits:
     max_bytes_per_fetch: int = 8_000
     max_total_bytes: int = 24_000
     max_path_depth: int = 8
+    # Parallel fetch workers; 1 fetches one path at a time.
+    max_concurrency: int = 1
 
 
 PROJECT_MANIFEST_FILENAMES = {
@@ -124,13 +147,13 @@ def _project_root_candidates(paths: Iterable[str]) -> set[tuple[str, ...]]:
 
 
 def _longest_project_root(parts: list[str], roots: set[tuple[str, ...]]) -> tuple[str, ...]:
-    best: tuple[str, ...] = ()
-    for root in roots:
-        if len(root) <= len(best):
-            continue
-        if len(parts) > len(root) and tuple(parts[: len(root)]) == root:
-            best = root
-    return best
+    # Probe the path's own directory prefixes, longest first: O(depth) set lookups
+    # instead of a scan over every manifest root in the repository.
+    for depth in range(len(parts) - 1, 0, -1):
+        prefix = tuple(parts[:depth])
+        if prefix in roots:
+            return prefix
+    return ()
 
 
 def _subsystem_key_for_path(path: str, project_roots: set[tuple[str, ...]]) -> str:
@@ -187,16 +210,6 @@ def _chunk_type(path: str) -> str:
     return "code"
 
 
-def _extract_symbols(content: str) -> list[str]:
-    symbols = set(re.findall(r"(?:def|class|function|const|let|var|pub\\s+fn)\\s+([A-Za-z_][A-Za-z0-9_]*)", content))
-    return sorted(symbols)[:10]
-
-
-def _extract_dependencies(content: str) -> list[str]:
-    deps = set(re.findall(r"(?:import|from|require|use)\\s+([A-Za-z0-9_./:@-]+)", content))
-    return sorted(deps)[:20]
-
-
 def _summarize(content: str, max_chars: int = 180) -> str:
     flat = " ".join(line.strip() for line in content.splitlines() if line.strip())
     if len(flat) <= max_chars:
@@ -204,68 +217,120 @@ def _summarize(content: str, max_chars: int = 180) -> str:
     return flat[:max_chars] + "..."
 
 
+_DOC_TOKENS = ("docs/", "guide", "tutorial", "example", "quickstart", "getting-started")
+_MANIFEST_SUFFIXES = (
+    "pyproject.toml",
+    "package.json",
+    "requirements.txt",
+    "package-lock.json",
+    "pnpm-lock.yaml",
+    "go.mod",
+    "cargo.toml",
+    "pom.xml",
+    "build.gradle",
+    "build.gradle.kts",
+    "composer.json",
+    "gemfile",
+    "mix.exs",
+)
+_RUNTIME_ENTRY_SUFFIXES = ("/cli.py", "/app.py", "/main.py", "/__main__.py", "/index.ts", "/index.js")
+_RUNTIME_ENTRY_FILES = {"cli.py", "app.py", "main.py", "__main__.py", "index.ts", "index.js"}
+_ROOT_READMES = {"readme.md", "readme.rst", "readme.txt"}
+
+
+class _EvidenceScorer:
+    """
+    Evidence priority for one digest, with the per-digest lookups built once.
+
+    Subsystem directories (the first eight, as before) map to their rank so a path
+    finds its first matching subsystem by probing its own prefixes. ``score`` does
+    no allocation beyond the lowercased path; reasons are only rendered for the
+    paths that are kept.
+    """
+
+    def __init__(self, repo_digest: RepoDigest) -> None:
+        self.entry_points = frozenset(repo_digest.entry_points)
+        self.has_tests = repo_digest.test_coverage_hint == "has_tests"
+        self.primary_language = repo_digest.primary_language
+        self.subsystem_rank: dict[str, int] = {}
+        for rank, subsystem in enumerate(repo_digest.subsystems[:8]):
+            name = str(subsystem.get("name", "")).strip("/")
+            if not name or "/" not in name or "." in name.rsplit("/", 1)[-1]:
+                continue
+            self.subsystem_rank.setdefault(name, rank)
+
+    def subsystem_for(self, path: str) -> str | None:
+        best: str | None = None
+        best_rank = len(self.subsystem_rank) + 8
+        end = path.find("/")
+        while True:
+            prefix = path if end < 0 else path[:end]
+            rank = self.subsystem_rank.get(prefix)
+            if rank is not None and rank < best_rank:
+                best, best_rank = prefix, rank
+            if end < 0:
+                return best
+            end = path.find("/", end + 1)
+
+    def score(self, path: str, reasons: list[str] | None = None) -> float:
+        lower = path.lower()
+        score = max(0.0, 10.0 - lower.count("/") * 0.1)
+        if lower in _ROOT_READMES:
+            score += 120
+            if reasons is not None:
+                reasons.append("root-readme")
+        if path in self.entry_points:
+            score += 110
+            if reasons is not None:
+                reasons.append("entry-point")
+        if any(token in lower for token in _DOC_TOKENS):
+            score += 60
+            if reasons is not None:
+                reasons.append("documentation")
+        if lower.endswith(_MANIFEST_SUFFIXES):
+            score += 55
+            if reasons is not None:
+                reasons.append("dependency-manifest")
+        if (
+            lower.endswith(_RUNTIME_ENTRY_SUFFIXES)
+            or lower in _RUNTIME_ENTRY_FILES
+            or "/cmd/" in lower
+            or "/bin/" in lower
+        ):
+            score += 50
+            if reasons is not None:
+                reasons.append("runtime-entry")
+        if self.has_tests and ("/test" in lower or lower.startswith("tests/") or "test_" in lower):
+            score += 10
+            if reasons is not None:
+                reasons.append("tests")
+        if self.subsystem_rank:
+            subsystem = self.subsystem_for(path)
+            if subsystem is not None:
+                score += 35
+                if reasons is not None:
+                    reasons.append(f"subsystem:{subsystem}")
+        if _language_from_path(path) == self.primary_language:
+            score += 10
+            if reasons is not None:
+                reasons.append(f"primary-language:{self.primary_language}")
+        return score
+
+    def reason(self, path: str) -> str:
+        reasons: list[str] = []
+        self.score(path, reasons)
+        return ", ".join(reasons) or "fallback-ranking"
+
+
 def _path_priority(path: str, repo_digest: RepoDigest) -> tuple[float, str]:
-    lower = path.lower()
-    depth_penalty = lower.count("/") * 0.1
-    score = max(0.0, 10.0 - depth_penalty)
+    scorer = _EvidenceScorer(repo_digest)
     reasons: list[str] = []
+    score = scorer.score(path, reasons)
+    return score, ", ".join(reasons) or "fallback-ranking"
 
-    if lower in {"readme.md", "readme.rst", "readme.txt"}:
-        score += 120
-        reasons.append("root-readme")
-    if path in repo_digest.entry_points:
-        score += 110
-        reasons.append("entry-point")
-    if any(token in lower for token in ("docs/", "guide", "tutorial", "example", "quickstart", "getting-started")):
-        score += 60
-        reasons.append("documentation")
-    if lower.endswith((
-        "pyproject.toml",
-        "package.json",
-        "requirements.txt",
-        "package-lock.json",
-        "pnpm-lock.yaml",
-        "go.mod",
-        "cargo.toml",
-        "pom.xml",
-        "build.gradle",
-        "build.gradle.kts",
-        "composer.json",
-        "gemfile",
-        "mix.exs",
-    )):
-        score += 55
-        reasons.append("dependency-manifest")
-    if lower.endswith(("/cli.py", "/app.py", "/main.py", "/__main__.py", "/index.ts", "/index.js")) or lower in {
-        "cli.py",
-        "app.py",
-        "main.py",
-        "__main__.py",
-        "index.ts",
-        "index.js",
-    } or any(token in lower for token in ("/cmd/", "/bin/")):
-        score += 50
-        reasons.append("runtime-entry")
-    if repo_digest.test_coverage_hint == "has_tests" and ("/test" in lower or lower.startswith("tests/") or "test_" in lower):
-        score += 10
-        reasons.append("tests")
-
-    for subsystem in repo_digest.subsystems[:8]:
-        subsystem_name = str(subsystem.get("name", "")).strip("/")
-        if not subsystem_name or "/" not in subsystem_name:
-            continue
-        if "." in subsystem_name.rsplit("/", 1)[-1]:
-            continue
-        if path == subsystem_name or path.startswith(f"{subsystem_name}/"):
-            score += 35
-            reasons.append(f"subsystem:{subsystem_name}")
-            break
-
-    if _language_from_path(path) == repo_digest.primary_language:
-        score += 10
-        reasons.append(f"primary-language:{repo_digest.primary_language}")
 
-    return score, ", ".join(reasons) or "fallback-ranking"
+# Dropped paths kept for the analyzer trace; ``dropped_count`` carries the total.
+_DROPPED_PREVIEW_LIMIT = 50
 
 
 def plan_evidence_paths(
@@ -274,11 +339,12 @@ def plan_evidence_paths(
     *,
     max_paths: int,
 ) -> EvidencePlan:
-    paths = sorted({path.strip() for path in material.file_tree.splitlines() if path.strip()})
+    index = material.path_index
+    paths = index.paths
     candidate_count = len(paths)
     if not paths or len(paths) <= max_paths:
         return EvidencePlan(
-            selected_paths=paths,
+            selected_paths=list(paths),
             dropped_paths=[],
             candidate_count=candidate_count,
             max_paths=max_paths,
@@ -287,22 +353,21 @@ def plan_evidence_paths(
             budget_reason="within-limit",
         )
 
-    ranked: list[tuple[float, str, str]] = []
-    for path in paths:
-        score, reason = _path_priority(path, repo_digest)
-        ranked.append((score, path, reason))
-
-    ranked.sort(key=lambda item: (-item[0], item[1]))
-    selected = ranked[:max_paths]
-    dropped = ranked[max_paths:]
+    # Stream scores through one bounded heap: O(n log k) with k = max_paths plus the
+    # dropped-path preview, so the paths that just missed the cut come out ranked too.
+    scorer = _EvidenceScorer(repo_digest)
+    score = scorer.score
+    keep = max(0, max_paths)
+    top = heapq.nsmallest(keep + _DROPPED_PREVIEW_LIMIT, ((-score(path), path) for path in paths))
+    selected = [path for _, path in top[:keep]]
     return EvidencePlan(
-        selected_paths=[path for _, path, _ in selected],
-        dropped_paths=[path for _, path, _ in dropped],
-        selected_reasons={path: reason for _, path, reason in selected},
+        selected_paths=selected,
+        dropped_paths=[path for _, path in top[keep:]],
+        selected_reasons={path: scorer.reason(path) for path in selected},
         candidate_count=candidate_count,
         max_paths=max_paths,
         selected_count=len(selected),
-        dropped_count=len(dropped),
+        dropped_count=candidate_count - len(selected),
         budget_reason="candidate-count-exceeds-limit",
     )
 
@@ -312,20 +377,45 @@ def apply_evidence_plan(
     plan: EvidencePlan,
     *,
     fetch_content: Callable[[str], str | None] | None = None,
+    fetch_many: Callable[[Sequence[str]], Mapping[str, str | None]] | None = None,
     limits: EvidenceFetchLimits = EvidenceFetchLimits(),
 ) -> RepositoryMaterial:
+    """
+    Reduce ``material`` to the planned paths and append fetched evidence blocks.
+
+    ``fetch_many`` resolves every fetchable path in one batched call (for example a
+    GraphQL query); paths it leaves out of its result fall back to ``fetch_content``,
+    which is prefetched on up to ``limits.max_concurrency`` threads. Block order, byte
+    limits and ``fetch_skipped`` reasons are the same as a sequential fetch.
+    """
     selected_tree = "\n".join(plan.selected_paths)
     package_files = material.package_files
 
-    if fetch_content is not None and limits.max_fetches > 0 and limits.max_total_bytes > 0:
+    can_fetch = fetch_content is not None or fetch_many is not None
+    if can_fetch and limits.max_fetches > 0 and limits.max_total_bytes > 0:
+        candidates = plan.selected_paths[: limits.max_fetches]
+        fetchable = [path for path in candidates if path.count("/") <= limits.max_path_depth]
+        batched: Mapping[str, str | None] = {}
+        if fetch_many is not None:
+            batched = fetch_many(fetchable)
+        if fetch_content is not None:
+            pending = [path for path in fetchable if path not in batched]
+            if len(pending) > 1 and limits.max_concurrency > 1:
+                batched = {**batched, **_prefetch_concurrently(pending, fetch_content, limits.max_concurrency)}
+
         fetched_blocks: list[str] = []
         total_bytes = 0
-        for path in plan.selected_paths[: limits.max_fetches]:
+        for path in candidates:
             if path.count("/") > limits.max_path_depth:
                 plan.fetch_skipped.append({"path": path, "reason": "depth-limited"})
                 continue
 
-            content = fetch_content(path)
+            if path in batched:
+                content = batched[path]
+            elif fetch_content is not None:
+                content = fetch_content(path)
+            else:
+                content = None
             if not content:
                 plan.fetch_skipped.append({"path": path, "reason": "empty-or-unavailable"})
                 continue
@@ -351,9 +441,24 @@ def apply_evidence_plan(
         package_files=package_files,
         default_branch=material.default_branch,
         is_private=material.is_private,
+        prefetched_content=material.prefetched_content,
+        blob_shas=material.blob_shas,
+        tree_complete=material.tree_complete,
+        snapshot_ref=material.snapshot_ref,
     )
 
 
+def _prefetch_concurrently(
+    paths: Sequence[str],
+    fetch_content: Callable[[str], str | None],
+    max_workers: int,
+) -> dict[str, str | None]:
+    # Only I/O runs in parallel; limits and block order are applied by the caller
+    # in plan order, so the assembled output matches a sequential fetch byte for byte.
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths)), thread_name_prefix="evidence-fetch") as pool:
+        return dict(zip(paths, pool.map(fetch_content, paths)))
+
+
 def suggested_evidence_limit(estimated_prompt_tokens: int, available_tokens: int) -> int:
     if available_tokens <= 0:
         return 20
@@ -393,7 +498,7 @@ def chunk_repository_material(material: RepositoryMaterial) -> list[RepoChunk]:
     evidence_chunks = _selected_evidence_chunks(material.package_files)
     evidence_paths = {chunk.path for chunk in evidence_chunks}
 
-    for path in sorted(p for p in material.file_tree.splitlines() if p.strip()):
+    for path in material.path_index.paths:
         if path in evidence_paths:
             continue
         chunks.append(RepoChunk(path=path, content=path, start_line=1, end_line=1))
@@ -408,23 +513,280 @@ def chunk_repository_material(material: RepositoryMaterial) -> list[RepoChunk]:
         chunks.append(RepoChunk(path="package_files.txt", content=remaining_package_content, end_line=end_line))
     return chunks
 
-def extract_chunk_capsules(chunks: Iterable[RepoChunk]) -> list[ChunkCapsule]:
-    capsules: list[ChunkCapsule] = []
-    for chunk in chunks:
-        raw_id = f"{chunk.path}:{chunk.start_line}:{chunk.end_line}"
-        capsule = ChunkCapsule(
-            chunk_id=hashlib.sha256(raw_id.encode("utf-8")).hexdigest()[:16],
-            path=chunk.path,
-            chunk_type=_chunk_type(chunk.path),
-            summary=_summarize(chunk.content),
-            key_symbols=_extract_symbols(chunk.content),
-            dependencies=_extract_dependencies(chunk.content),
-        )
-        capsules.append(capsule)
-    return capsules
+def _extract_capsule(chunk: RepoChunk) -> ChunkCapsule:
+    raw_id = f"{chunk.path}:{chunk.start_line}:{chunk.end_line}"
+    if chunk.content == chunk.path:
+        # Tree-only chunk: the path is all there is to read.
+        symbols: list[str] = []
+        dependencies: list[str] = []
+    else:
+        symbols, dependencies = lex_symbols(chunk.content, language_for_path(chunk.path))
+    return ChunkCapsule(
+        chunk_id=hashlib.sha256(raw_id.encode("utf-8")).hexdigest()[:16],
+        path=chunk.path,
+        chunk_type=_chunk_type(chunk.path),
+        summary=_summarize(chunk.content),
+        key_symbols=symbols[:10],
+        dependencies=dependencies[:20],
+    )
 
 
-def reduce_capsules(capsules: list[ChunkCapsule], topic: str = "Repository") -> RepoDigest:
+def _capsule_key(chunk: RepoChunk) -> tuple[str, int, int, bytes | None]:
+    # Tree-only chunks carry their path as content; the location already identifies them.
+    content_key = (
+        None
+        if chunk.content == chunk.path
+        else hashlib.blake2b(chunk.content.encode("utf-8"), digest_size=16).digest()
+    )
+    return (chunk.path, chunk.start_line, chunk.end_line, content_key)
+
+
+def _available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _timed_capsule(chunk: RepoChunk) -> tuple[ChunkCapsule, float]:
+    started_at = time.perf_counter()
+    capsule = _extract_capsule(chunk)
+    return capsule, time.perf_counter() - started_at
+
+
+class _CapsuleExtractor:
+    """
+    Capsule extraction with an optional process pool for large chunks.
+
+    With ``workers > 1``, chunks of at least ``min_chars`` characters are sent to a
+    process pool (reused across calls) when there are at least two of them; the
+    rest are extracted in-process while the pool works. Results keep chunk order.
+    Workers are spawned rather than forked, because the pipeline's fallback, planning
+    and tree-walk threads and its open sqlite connections must not be copied into them.
+    Every content chunk is timed individually; tree-only chunks are timed as a
+    batch. ``stats`` also reports wall-clock totals for the extraction and for each
+    digest build stage, so serial-equivalent chunk time can be compared with the
+    time actually spent. A pool that cannot start or breaks falls back to
+    in-process extraction.
+    """
+
+    def __init__(self) -> None:
+        self.workers = 0
+        self.min_chars = DEFAULT_PARALLEL_MIN_CHARS
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self.chunks = 0
+        self.parallel_chunks = 0
+        self.tree_chunks = 0
+        self.tree_seconds = 0.0
+        self.content_seconds = 0.0
+        self.parallel_seconds = 0.0
+        self.wall_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.stage_seconds: dict[str, float] = {}
+        self._slowest: list[tuple[float, str, int, bool]] = []
+
+    def configure(self, workers: int, min_chars: int) -> None:
+        with self._lock:
+            # More processes than usable cores only adds pickling and scheduling cost.
+            workers = max(0, min(int(workers), _available_cpus()))
+            if workers != self.workers and self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            self.workers = workers
+            self.min_chars = max(1, int(min_chars))
+            self._reset_stats()
+
+    def _get_pool(self) -> ProcessPoolExecutor | None:
+        with self._lock:
+            if self._pool is None and self.workers > 1:
+                try:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                except (OSError, ValueError, NotImplementedError) as exc:
+                    logger.warning("Parallel capsule extraction disabled: %s", exc)
+                    self.workers = 0
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def extract(self, chunks: list[RepoChunk]) -> list[ChunkCapsule]:
+        large = [index for index, chunk in enumerate(chunks) if len(chunk.content) >= self.min_chars] if self.workers > 1 else []
+        futures: dict[int, Future[tuple[ChunkCapsule, float]]] = {}
+        extract_started_at = time.perf_counter()
+        pool = self._get_pool() if len(large) >= 2 else None
+        if pool is not None:
+            try:
+                futures = {index: pool.submit(_timed_capsule, chunks[index]) for index in large}
+            except (BrokenProcessPool, RuntimeError) as exc:
+                logger.warning("Capsule extraction pool unavailable; extracting in-process: %s", exc)
+                self._discard_pool(pool)
+                for future in futures.values():
+                    future.cancel()
+                futures = {}
+
+        capsules: list[ChunkCapsule | None] = [None] * len(chunks)
+        timings: list[tuple[float, str, int, bool]] = []
+        tree_chunks = 0
+        content_seconds = 0.0
+        started_at = time.perf_counter()
+        for index, chunk in enumerate(chunks):
+            if index in futures:
+                continue
+            if chunk.content == chunk.path:
+                capsules[index] = _extract_capsule(chunk)
+                tree_chunks += 1
+                continue
+            capsules[index], seconds = _timed_capsule(chunk)
+            content_seconds += seconds
+            timings.append((seconds, chunk.path, len(chunk.content), False))
+        tree_seconds = time.perf_counter() - started_at - content_seconds
+
+        wait_started_at = time.perf_counter()
+        for index, future in futures.items():
+            chunk = chunks[index]
+            try:
+                capsules[index], seconds = future.result()
+                parallel = True
+            except (BrokenProcessPool, OSError) as exc:
+                if pool is not None:
+                    logger.warning("Capsule extraction pool failed; extracting in-process: %s", exc)
+                    self._discard_pool(pool)
+                    pool = None
+                capsules[index], seconds = _timed_capsule(chunk)
+                parallel = False
+            timings.append((seconds, chunk.path, len(chunk.content), parallel))
+        finished_at = time.perf_counter()
+
+        with self._lock:
+            self.chunks += len(chunks)
+            self.parallel_chunks += sum(1 for *_, parallel in timings if parallel)
+            self.tree_chunks += tree_chunks
+            self.tree_seconds += tree_seconds
+            self.content_seconds += sum(seconds for seconds, *_ in timings)
+            self.parallel_seconds += sum(seconds for seconds, *_, parallel in timings if parallel)
+            self.wall_seconds += finished_at - extract_started_at
+            self.pool_wait_seconds += finished_at - wait_started_at if futures else 0.0
+            self._slowest = heapq.nlargest(_SLOWEST_CHUNKS, [*self._slowest, *timings])
+        return capsules  # type: ignore[return-value]
+
+    def add_stage_time(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "chunks": self.chunks,
+                "parallel_chunks": self.parallel_chunks,
+                "tree_chunks": self.tree_chunks,
+                # Serial-equivalent chunk time; parallel_seconds is the part done in the pool.
+                "tree_seconds": round(self.tree_seconds, 3),
+                "content_seconds": round(self.content_seconds, 3),
+                "parallel_seconds": round(self.parallel_seconds, 3),
+                # Time actually spent extracting, and the part of it spent waiting on the pool.
+                "wall_seconds": round(self.wall_seconds, 3),
+                "pool_wait_seconds": round(self.pool_wait_seconds, 3),
+                "stage_seconds": {stage: round(seconds, 3) for stage, seconds in self.stage_seconds.items()},
+                "slowest": [
+                    {"path": path, "chars": chars, "ms": round(seconds * 1000, 2), "parallel": parallel}
+                    for seconds, path, chars, parallel in self._slowest
+                ],
+            }
+
+
+_CAPSULE_EXTRACTOR = _CapsuleExtractor()
+
+
+def configure_capsule_extraction(*, workers: int = 0, min_chars: int = DEFAULT_PARALLEL_MIN_CHARS) -> None:
+    """Set the process count (``<= 1`` extracts in-process) and per-chunk size for parallel extraction."""
+    _CAPSULE_EXTRACTOR.configure(workers, min_chars)
+
+
+def capsule_extraction_stats() -> dict[str, object]:
+    return _CAPSULE_EXTRACTOR.stats()
+
+
+class DigestMemo:
+    """
+    Memo shared by the ``build_repo_digest`` calls of one generation run.
+
+    Capsules are keyed by chunk location and a hash of the chunk content, so a
+    rebuild after compaction, retries or evidence fetching only extracts capsules
+    for chunks that are new or changed. Subsystem keys are remembered per path for
+    as long as the set of project roots stays the same, so the reduce step only
+    classifies paths it has not seen.
+    """
+
+    def __init__(self) -> None:
+        self._capsules: dict[tuple[str, int, int, bytes | None], ChunkCapsule] = {}
+        self._project_roots: set[tuple[str, ...]] | None = None
+        self._subsystem_keys: dict[str, str] = {}
+        self.capsule_hits = 0
+        self.capsule_misses = 0
+
+    def lookup(self, key: tuple[str, int, int, bytes | None]) -> ChunkCapsule | None:
+        capsule = self._capsules.get(key)
+        if capsule is None:
+            self.capsule_misses += 1
+        else:
+            self.capsule_hits += 1
+        return capsule
+
+    def store(self, key: tuple[str, int, int, bytes | None], capsule: ChunkCapsule) -> None:
+        self._capsules[key] = capsule
+
+    def seed(self, key: tuple[str, int, int, bytes | None], capsule: ChunkCapsule) -> None:
+        """Remember a capsule restored from a digest snapshot."""
+        self._capsules.setdefault(key, capsule)
+
+    def subsystem_keys(self, project_roots: set[tuple[str, ...]]) -> dict[str, str]:
+        """Return the ``path -> subsystem`` cache valid for ``project_roots``."""
+        if project_roots != self._project_roots:
+            self._project_roots = set(project_roots)
+            self._subsystem_keys = {}
+        return self._subsystem_keys
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "capsule_hits": self.capsule_hits,
+            "capsule_misses": self.capsule_misses,
+            "capsules": len(self._capsules),
+        }
+
+
+def extract_chunk_capsules(chunks: Iterable[RepoChunk], memo: DigestMemo | None = None) -> list[ChunkCapsule]:
+    if memo is None:
+        return _CAPSULE_EXTRACTOR.extract(list(chunks))
+    capsules: list[ChunkCapsule | None] = []
+    missing: list[tuple[int, RepoChunk, tuple[str, int, int, bytes | None]]] = []
+    for chunk in chunks:
+        key = _capsule_key(chunk)
+        capsule = memo.lookup(key)
+        if capsule is None:
+            missing.append((len(capsules), chunk, key))
+        capsules.append(capsule)
+    extracted = _CAPSULE_EXTRACTOR.extract([chunk for _, chunk, _ in missing])
+    for (index, _, key), capsule in zip(missing, extracted):
+        memo.store(key, capsule)
+        capsules[index] = capsule
+    return capsules  # type: ignore[return-value]
+
+
+def reduce_capsules(
+    capsules: list[ChunkCapsule],
+    topic: str = "Repository",
+    memo: DigestMemo | None = None,
+) -> RepoDigest:
     if not capsules:
         return RepoDigest(
             topic=topic,
@@ -443,10 +805,12 @@ def reduce_capsules(capsules: list[ChunkCapsule], topic: str = "Repository") ->
     entry_points: list[str] = []
 
     project_roots = _project_root_candidates(cap.path for cap in capsules)
+    subsystem_keys = memo.subsystem_keys(project_roots) if memo is not None else {}
 
     for cap in capsules:
-        parts = cap.path.split("/")
-        subsystem = _subsystem_key_for_path(cap.path, project_roots)
+        subsystem = subsystem_keys.get(cap.path)
+        if subsystem is None:
+            subsystem = subsystem_keys[cap.path] = _subsystem_key_for_path(cap.path, project_roots)
         by_subsystem.setdefault(subsystem, []).append(cap)
 
         lang = _language_from_path(cap.path)
@@ -495,7 +859,94 @@ def reduce_capsules(capsules: list[ChunkCapsule], topic: str = "Repository") ->
     )
 
 
-def build_repo_digest(material: RepositoryMaterial, topic: str = "Repository") -> RepoDigest:
+def digest_snapshot_key(material: RepositoryMaterial, topic: str) -> str | None:
+    """
+    Return the snapshot key for ``material``, or ``None`` when the source names no snapshot.
+
+    The ``snapshot_ref`` and schema version namespace the key; the digest inputs are hashed
+    as well because evidence planning and compaction rebuild digests from trimmed
+    trees and extra package text on top of the same tree.
+    """
+    if not material.snapshot_ref:
+        return None
+    hasher = hashlib.blake2b(digest_size=20)
+    for part in (
+        str(DIGEST_SCHEMA_VERSION),
+        material.snapshot_ref,
+        topic,
+        material.file_tree,
+        material.readme_content,
+        material.package_files,
+    ):
+        hasher.update(part.encode("utf-8"))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def _snapshot_payload(digest: RepoDigest, chunks: list[RepoChunk], capsules: list[ChunkCapsule]) -> dict:
+    # Tree-only capsules are cheap to rebuild and make up most of a large tree; keep
+    # the content-bearing ones so later rebuilds in the run can reuse them.
+    stored = []
+    for chunk, capsule in zip(chunks, capsules):
+        path, start_line, end_line, content_key = _capsule_key(chunk)
+        if content_key is None:
+            continue
+        stored.append(
+            [
+                path,
+                start_line,
+                end_line,
+                content_key.hex(),
+                capsule.chunk_id,
+                capsule.chunk_type,
+                capsule.summary,
+                capsule.key_symbols,
+                capsule.dependencies,
+            ]
+        )
+    return {
+        "digest": {name: getattr(digest, name) for name in RepoDigest.__dataclass_fields__},
+        "capsules": stored,
+    }
+
+
+def _digest_from_snapshot(snapshot: dict, memo: DigestMemo | None) -> RepoDigest | None:
+    try:
+        digest = RepoDigest(**snapshot["digest"])
+        if memo is not None:
+            for path, start_line, end_line, content_key, chunk_id, chunk_type, summary, symbols, deps in snapshot.get(
+                "capsules", []
+            ):
+                memo.seed(
+                    (path, start_line, end_line, bytes.fromhex(content_key)),
+                    ChunkCapsule(chunk_id, path, chunk_type, summary, list(symbols), list(deps)),
+                )
+    except (KeyError, TypeError, ValueError):
+        return None
+    return digest
+
+
+def build_repo_digest(
+    material: RepositoryMaterial,
+    topic: str = "Repository",
+    memo: DigestMemo | None = None,
+) -> RepoDigest:
+    key = digest_snapshot_key(material, topic) if digest_store_enabled() else None
+    if key is not None:
+        snapshot = load_digest_snapshot(key)
+        digest = _digest_from_snapshot(snapshot, memo) if snapshot is not None else None
+        if digest is not None:
+            return digest
+
+    started_at = time.perf_counter()
     chunks = chunk_repository_material(material)
-    capsules = extract_chunk_capsules(chunks)
-    return reduce_capsules(capsules, topic=topic)
+    chunked_at = time.perf_counter()
+    capsules = extract_chunk_capsules(chunks, memo)
+    extracted_at = time.perf_counter()
+    digest = reduce_capsules(capsules, topic=topic, memo=memo)
+    _CAPSULE_EXTRACTOR.add_stage_time("chunk", chunked_at - started_at)
+    _CAPSULE_EXTRACTOR.add_stage_time("extract", extracted_at - chunked_at)
+    _CAPSULE_EXTRACTOR.add_stage_time("reduce", time.perf_counter() - extracted_at)
+    if key is not None:
+        save_digest_snapshot(key, material.snapshot_ref, DIGEST_SCHEMA_VERSION, _snapshot_payload(digest, chunks, capsules))
+    return digest
@@ -136,6 +136,99 @@ class AnalyzeRepositoryFromDigest(dspy.Signature):
     architecture_overview: str = dspy.OutputField(desc="Architecture overview paragraph")
 
 
+class AnalyzeRepositoryFused(dspy.Signature):
+    """Analyze a repository and plan its llms.txt document in a single pass.
+
+    Produces every field of the staged repository, structure, usage-example,
+    section-plan and section-note signatures. Section names must come from
+    available_sections; section notes use the 'Section: guidance' form.
+    """
+
+    repo_url: str = dspy.InputField(desc="GitHub repository URL")
+    file_tree: str = dspy.InputField(desc="Repository file structure (one path per line)")
+    readme_content: str = dspy.InputField(desc="README.md content (raw)")
+    package_files: str = dspy.InputField(
+        desc="Concatenated contents of pyproject/requirements/package.json files."
+    )
+    available_sections: List[str] = dspy.InputField(
+        desc="Available deterministic section names in the current candidate document"
+    )
+    candidate_entries: List[str] = dspy.InputField(
+        desc="Candidate entries as 'Section | Title | URL | Note' strings"
+    )
+
+    project_purpose: str = dspy.OutputField(
+        desc="Main purpose and goals of the project (2–4 sentences)"
+    )
+    key_concepts: List[str] = dspy.OutputField(
+        desc="Important concepts and terminology (bullet list items)"
+    )
+    architecture_overview: str = dspy.OutputField(
+        desc="High-level architecture overview (1–2 paragraphs)"
+    )
+    important_directories: List[str] = dspy.OutputField(
+        desc="Key directories with brief notes (e.g., src/, docs/, examples/)"
+    )
+    entry_points: List[str] = dspy.OutputField(
+        desc="Likely entry points or commands (e.g., cli.py, main.ts, npm scripts)"
+    )
+    development_info: str = dspy.OutputField(
+        desc="Development or build info (dependencies, scripts, tooling)"
+    )
+    usage_examples: str = dspy.OutputField(
+        desc="Markdown examples (code fences) showing typical usage"
+    )
+    included_sections: List[str] = dspy.OutputField(
+        desc="Subset of available section names to keep in the final document"
+    )
+    preferred_section_order: List[str] = dspy.OutputField(
+        desc="Preferred final section ordering using only available section names"
+    )
+    remember_bullets: List[str] = dspy.OutputField(
+        desc="Short remember bullets for the document header"
+    )
+    section_notes: List[str] = dspy.OutputField(
+        desc="Notes as 'Section: concise guidance' for sections that need synthesized context"
+    )
+
+
+class AnalyzeRepositoryFusedFromDigest(dspy.Signature):
+    """Analyze a repository digest and plan its llms.txt document in a single pass.
+
+    Produces every field of the digest analysis, usage-example, section-plan and
+    section-note signatures. Section names must come from available_sections;
+    section notes use the 'Section: guidance' form.
+    """
+
+    digest_summary: str = dspy.InputField(desc="Compact digest of repository structure")
+    repo_url: str = dspy.InputField(desc="GitHub repository URL")
+    available_sections: List[str] = dspy.InputField(
+        desc="Available deterministic section names in the current candidate document"
+    )
+    candidate_entries: List[str] = dspy.InputField(
+        desc="Candidate entries as 'Section | Title | URL | Note' strings"
+    )
+
+    project_purpose: str = dspy.OutputField(desc="Purpose summary in 1-3 sentences")
+    key_concepts: List[str] = dspy.OutputField(desc="Key concepts as list")
+    architecture_overview: str = dspy.OutputField(desc="Architecture overview paragraph")
+    usage_examples: str = dspy.OutputField(
+        desc="Markdown examples (code fences) showing typical usage"
+    )
+    included_sections: List[str] = dspy.OutputField(
+        desc="Subset of available section names to keep in the final document"
+    )
+    preferred_section_order: List[str] = dspy.OutputField(
+        desc="Preferred final section ordering using only available section names"
+    )
+    remember_bullets: List[str] = dspy.OutputField(
+        desc="Short remember bullets for the document header"
+    )
+    section_notes: List[str] = dspy.OutputField(
+        desc="Notes as 'Section: concise guidance' for sections that need synthesized context"
+    )
+
+
 class SynthesizeRepoGraphNodes(dspy.Signature):
     """Synthesize one repository graph node into specific, evidence-grounded developer guidance.
 
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import subprocess
+from pathlib import Path
+from typing import Protocol
+
+from .github import (
+    PACKAGE_FILE_CANDIDATES,
+    _normalize_repo_path,
+    fetch_file_content,
+    gather_repository_material,
+    is_default_ignored_repo_path,
+    owner_repo_from_url,
+)
+from .models import RepositoryMaterial
+
+logger = logging.getLogger(__name__)
+
+# Directories that exist in working trees but are never part of the committed tree.
+_LOCAL_SKIPPED_DIRS = {
+    ".git",
+    "__pycache__",
+    "node_modules",
+    ".venv",
+    "venv",
+    ".tox",
+    ".nox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+}
+_GIT_SHA = re.compile(r"[0-9a-f]{40}|[0-9a-f]{64}")
+
+
+class RepositorySource(Protocol):
+    """Where repository material and evidence files come from."""
+
+    repo_url: str
+
+    def load_material(self) -> RepositoryMaterial:
+        """Collect the file tree, README and package manifests."""
+
+    def read_file(self, path: str, ref: str) -> str | None:
+        """Return the text of ``path`` at ``ref``, or ``None`` if it does not exist."""
+
+
+class GitHubRepositorySource:
+    """Repository material fetched from the GitHub API."""
+
+    def __init__(self, repo_url: str, token: str | None = None, *, fetch_mode: str = "contents") -> None:
+        self.repo_url = repo_url
+        self.token = token
+        self.fetch_mode = fetch_mode
+        self.owner, self.repo = owner_repo_from_url(repo_url)
+
+    def load_material(self) -> RepositoryMaterial:
+        return gather_repository_material(self.repo_url, self.token, fetch_mode=self.fetch_mode)
+
+    def read_file(self, path: str, ref: str) -> str | None:
+        return fetch_file_content(self.owner, self.repo, path, ref, self.token)
+
+
+class LocalRepositorySource:
+    """
+    Repository material read from a local checkout without any network access.
+
+    ``repo_url`` still names the GitHub repository so generated links point at
+    GitHub. The branch comes from ``.git/HEAD`` unless ``default_branch`` is given.
+    The checkout may be private or unpushed, so the material is marked private and
+    the pipeline trusts its tree instead of probing the generated links.
+    ``snapshot_ref`` is ``commit:`` plus HEAD's commit SHA, or ``listing:`` plus a
+    hash of the path listing when the checkout has no readable HEAD.
+    """
+
+    def __init__(self, root: Path, repo_url: str, *, default_branch: str | None = None) -> None:
+        self.root = Path(root).expanduser().resolve()
+        if not self.root.is_dir():
+            raise FileNotFoundError(f"Local repository path is not a directory: {self.root}")
+        self.repo_url = repo_url
+        self.default_branch = default_branch or _read_head_branch(self.root) or "main"
+
+    def iter_paths(self) -> list[str]:
+        """
+        Return repo-relative file paths.
+
+        Inside a git work tree this is ``git ls-files``: tracked files plus untracked
+        ones ``.gitignore`` does not exclude. Elsewhere, or when git is unavailable,
+        the tree is walked with ``os.scandir``.
+        """
+        listed = _git_listed_paths(self.root)
+        if listed is not None:
+            return sorted(
+                path
+                for path in listed
+                if not is_default_ignored_repo_path(path)
+                and not _LOCAL_SKIPPED_DIRS.intersection(path.split("/")[:-1])
+                and (self.root / path).is_file()
+            )
+        paths: list[str] = []
+        stack = [""]
+        while stack:
+            prefix = stack.pop()
+            try:
+                with os.scandir(self.root / prefix if prefix else self.root) as entries:
+                    for entry in entries:
+                        rel = f"{prefix}/{entry.name}" if prefix else entry.name
+                        if is_default_ignored_repo_path(rel):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in _LOCAL_SKIPPED_DIRS:
+                                stack.append(rel)
+                        elif entry.is_file(follow_symlinks=False) and entry.name != ".git":
+                            # Worktrees and submodules have a ``.git`` pointer file.
+                            paths.append(rel)
+            except OSError as exc:
+                logger.warning("Skipping unreadable directory %s: %s", prefix or ".", exc)
+        return sorted(paths)
+
+    def read_file(self, path: str, ref: str | None = None) -> str | None:
+        try:
+            # Resolving follows symlinks, so a link out of the checkout is refused too.
+            target = (self.root / _normalize_repo_path(path)).resolve()
+            if not target.is_relative_to(self.root):
+                return None
+            return target.read_bytes().decode("utf-8", "replace")
+        except (OSError, RuntimeError):
+            return None
+
+    def load_material(self) -> RepositoryMaterial:
+        package_blobs = []
+        for candidate in PACKAGE_FILE_CANDIDATES:
+            content = self.read_file(candidate)
+            if content:
+                package_blobs.append(f"=== {candidate} ===\n{content}")
+        file_tree = "\n".join(self.iter_paths())
+        return RepositoryMaterial(
+            repo_url=self.repo_url,
+            file_tree=file_tree,
+            readme_content=self.read_file("README.md") or "",
+            package_files="\n\n".join(package_blobs),
+            default_branch=self.default_branch,
+            # Visibility is unknown offline; never assume the repository is public.
+            is_private=True,
+            snapshot_ref=_snapshot_ref(self.root, file_tree),
+        )
+
+
+def _git_listed_paths(root: Path) -> list[str] | None:
+    if _git_dirs(root) is None:
+        return None
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(root), "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            check=True,
+            capture_output=True,
+            timeout=60,
+        )
+    except (OSError, subprocess.SubprocessError) as exc:
+        logger.warning("git ls-files failed in %s; walking the directory instead: %s", root, exc)
+        return None
+    # Paths tracked in the index but deleted from the work tree are listed too; the caller drops them.
+    return list(dict.fromkeys(p for p in result.stdout.decode("utf-8", "replace").split("\0") if p))
+
+
+def _git_dirs(root: Path) -> tuple[Path, Path] | None:
+    """
+    Return ``(git_dir, common_dir)`` for the checkout at ``root``.
+
+    ``.git`` is a directory in a plain clone. In linked worktrees and submodules it is
+    a file holding ``gitdir: <path>``; worktrees keep shared refs in ``commondir``.
+    """
+    dot_git = root / ".git"
+    if dot_git.is_dir():
+        return dot_git, dot_git
+    try:
+        pointer = dot_git.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    if not pointer.startswith("gitdir: "):
+        return None
+    git_dir = (root / pointer[len("gitdir: "):]).resolve()
+    try:
+        common = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+    except OSError:
+        return git_dir, git_dir
+    return git_dir, (git_dir / common).resolve()
+
+
+def _read_head(git_dir: Path) -> str | None:
+    try:
+        return (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+def _read_head_branch(root: Path) -> str | None:
+    dirs = _git_dirs(root)
+    head = _read_head(dirs[0]) if dirs else None
+    if head is None:
+        return None
+    prefix = "ref: refs/heads/"
+    return head[len(prefix):] if head.startswith(prefix) else None
+
+
+def _read_head_commit(root: Path) -> str | None:
+    dirs = _git_dirs(root)
+    head = _read_head(dirs[0]) if dirs else None
+    if dirs is None or head is None:
+        return None
+    if not head.startswith("ref: "):
+        # Detached HEAD holds the commit SHA itself.
+        return head if _GIT_SHA.fullmatch(head) else None
+    ref = head[len("ref: "):]
+    git_dir, common_dir = dirs
+    for base in dict.fromkeys((git_dir, common_dir)):
+        try:
+            sha = (base / ref).read_text(encoding="utf-8").strip()
+            break
+        except OSError:
+            continue
+    else:
+        sha = _read_packed_ref(common_dir, ref)
+    return sha if sha and _GIT_SHA.fullmatch(sha) else None
+
+
+def _read_packed_ref(git_dir: Path, ref: str) -> str | None:
+    try:
+        lines = (git_dir / "packed-refs").read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return None
+    for line in lines:
+        sha, _, name = line.partition(" ")
+        if name == ref:
+            return sha
+    return None
+
+
+def _snapshot_ref(root: Path, file_tree: str) -> str:
+    commit = _read_head_commit(root)
+    if commit:
+        return f"commit:{commit}"
+    # Digest snapshot keys hash the tree listing as well, so this only has to be stable.
+    return "listing:" + hashlib.blake2b(file_tree.encode("utf-8"), digest_size=20).hexdigest()
+
+
+def open_repository_source(
+    repo_url: str,
+    *,
+    local_path: Path | None = None,
+    token: str | None = None,
+    fetch_mode: str = "contents",
+) -> RepositorySource:
+    """Return a local checkout source when ``local_path`` is set, else the GitHub source."""
+    if local_path is not None:
+        return LocalRepositorySource(local_path, repo_url)
+    return GitHubRepositorySource(repo_url, token, fetch_mode=fetch_mode)
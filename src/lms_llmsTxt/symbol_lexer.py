@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+# File extension -> lexer language.
+LANGUAGE_BY_EXTENSION = {
+    ".py": "python",
+    ".pyi": "python",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".mts": "typescript",
+    ".cts": "typescript",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".rs": "rust",
+    ".go": "go",
+    ".java": "java",
+    ".md": "markdown",
+    ".mdx": "markdown",
+}
+
+# Markdown fence info strings -> lexer language.
+_FENCE_LANGUAGES = {
+    "py": "python",
+    "python": "python",
+    "python3": "python",
+    "ts": "typescript",
+    "tsx": "typescript",
+    "typescript": "typescript",
+    "js": "javascript",
+    "jsx": "javascript",
+    "mjs": "javascript",
+    "javascript": "javascript",
+    "rs": "rust",
+    "rust": "rust",
+    "go": "go",
+    "golang": "go",
+    "java": "java",
+}
+
+_IDENT = r"[A-Za-z_][A-Za-z0-9_]*"
+_JS_IDENT = r"[A-Za-z_$][A-Za-z0-9_$]*"
+_LINE_COMMENT = r"//[^\n]*"
+# Block comment and string bodies are written as unrolled loops (runs of plain
+# characters between stars or escapes) so ``re`` scans them without an
+# alternation or a lazy retry per character.
+_BLOCK_COMMENT = r"/\*[^*]*\*+(?:[^/*][^*]*\*+)*/"
+_DQ_STRING = r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+_SQ_STRING = r"'[^'\\\n]*(?:\\.[^'\\\n]*)*'"
+
+
+def _each(kind: str, keywords: tuple[str, ...], tail: str) -> tuple[tuple[str, str], ...]:
+    return tuple((kind, keyword + tail) for keyword in keywords)
+
+
+# Each rule is (kind, pattern). ``skip`` consumes comments and string literals so
+# keywords inside them are never seen; ``symbol`` and ``dependency`` rules capture
+# the name in their only group; ``dependency_block`` captures a parenthesised list
+# of quoted import paths. Rules are tried in order at each position, so import
+# forms that carry their module in a string come before the string rules.
+#
+# Every pattern starts with a literal character and rules are joined without
+# wrapper groups, which lets ``re`` jump straight to candidate positions instead
+# of trying each rule at every character. Word boundaries before keywords are
+# checked after matching; a leading newline anchors line-start rules (the text is
+# scanned with a newline prepended).
+#
+# JS/TS module specifiers are matched from their opening quote with the keyword
+# checked behind it, so ``from``/``import``/``require`` do not turn every f, i and
+# r in the file into a candidate position.
+_JS_MODULE_PREFIXES = ("from ", "from", "import ", "import(", "import (", "require(", "require (")
+
+
+def _js_module_string(quote: str) -> tuple[str, str]:
+    behind = "|".join(rf"(?<=[^\w$.]{re.escape(prefix + quote)})" for prefix in _JS_MODULE_PREFIXES)
+    return ("dependency", rf"{quote}(?:{behind})([^{quote}\n]+){quote}")
+
+
+_JS_RULES: tuple[tuple[str, str], ...] = (
+    ("skip", _LINE_COMMENT),
+    ("skip", _BLOCK_COMMENT),
+    _js_module_string('"'),
+    _js_module_string("'"),
+    ("skip", _DQ_STRING),
+    ("skip", _SQ_STRING),
+    ("skip", r"`[^`\\]*(?:\\.[^`\\]*)*`"),
+    ("symbol", rf"function(?:[ \t]*\*[ \t]*|[ \t]+)({_JS_IDENT})"),
+    ("symbol", rf"class[ \t]+({_JS_IDENT})"),
+    ("symbol", rf"\n(?:export[ \t]+)?(?:const|let|var)[ \t]+({_JS_IDENT})"),
+)
+
+_RULES: dict[str, tuple[tuple[str, str], ...]] = {
+    "python": (
+        ("skip", r"#[^\n]*"),
+        ("skip", r'"""[\s\S]*?"""'),
+        ("skip", r"'''[\s\S]*?'''"),
+        ("skip", _DQ_STRING),
+        ("skip", _SQ_STRING),
+        # ``async def`` is matched at its ``def``; ``async with``/``async for`` define nothing.
+        *_each("symbol", ("def", "class"), rf"[ \t]+({_IDENT})"),
+        ("dependency", r"from[ \t]+(\.*[A-Za-z_][\w.]*|\.+)[ \t]+import\b"),
+        (
+            "dependency",
+            rf"import[ \t]+({_IDENT}(?:\.{_IDENT})*(?:[ \t]+as[ \t]+{_IDENT})?"
+            rf"(?:[ \t]*,[ \t]*{_IDENT}(?:\.{_IDENT})*(?:[ \t]+as[ \t]+{_IDENT})?)*)",
+        ),
+    ),
+    # Plain JavaScript skips the TypeScript-only keywords, which would otherwise make
+    # every i, e and t a candidate position.
+    "javascript": _JS_RULES,
+    "typescript": (
+        *_JS_RULES,
+        *_each("symbol", ("interface", "enum"), rf"[ \t]+({_JS_IDENT})"),
+        ("symbol", rf"type[ \t]+({_JS_IDENT})[ \t]*(?:<[^>\n]*>)?[ \t]*="),
+    ),
+    "rust": (
+        ("skip", _LINE_COMMENT),
+        ("skip", _BLOCK_COMMENT),
+        # Raw strings are matched from their hashes (r#"..."#); a plain r"..." is an ordinary string here.
+        ("skip", r'#(#*)"[\s\S]*?"#\1'),
+        ("skip", r'"[^"\\]*(?:\\.[^"\\]*)*"'),
+        ("skip", r"'(?:[^'\\\n]|\\(?:u\{[0-9a-fA-F]+\}|x[0-9a-fA-F]{2}|.))'"),
+        *_each("symbol", ("fn", "struct", "enum", "trait", "union", "mod", "type"), rf"[ \t]+({_IDENT})"),
+        *_each("symbol", ("const", "static"), rf"[ \t]+(?:mut[ \t]+)?({_IDENT})[ \t]*:"),
+        ("symbol", rf"macro_rules![ \t]*({_IDENT})"),
+        ("dependency", rf"use[ \t]+((?:::)?{_IDENT}(?:::{_IDENT})*)"),
+        ("dependency", rf"extern[ \t]+crate[ \t]+({_IDENT})"),
+    ),
+    "go": (
+        ("skip", _LINE_COMMENT),
+        ("skip", _BLOCK_COMMENT),
+        ("dependency_block", r"import[ \t]*\(([^)]*)\)"),
+        ("dependency", rf'import[ \t]+(?:(?:{_IDENT}|\.)[ \t]+)?"([^"\n]+)"'),
+        ("skip", r"`[^`]*`"),
+        ("skip", _DQ_STRING),
+        ("skip", r"'(?:[^'\\\n]|\\[^'\n]+)'"),
+        ("symbol", rf"\n(?:func[ \t]*(?:\([^)\n]*\)[ \t]*)?|type[ \t]+)({_IDENT})"),
+    ),
+    "java": (
+        ("skip", _LINE_COMMENT),
+        ("skip", _BLOCK_COMMENT),
+        ("skip", r'"""[\s\S]*?"""'),
+        ("skip", _DQ_STRING),
+        ("skip", r"'(?:[^'\\\n]|\\[^'\n]+)'"),
+        ("dependency", rf"import[ \t]+(?:static[ \t]+)?({_IDENT}(?:\.{_IDENT})*(?:\.\*)?)[ \t]*;"),
+        *_each("symbol", ("class", "interface", "enum", "record"), rf"[ \t]+({_IDENT})"),
+    ),
+    # Files in languages without rules of their own (Ruby, PHP, Kotlin, shell, ...) get
+    # the keyword patterns most languages share. Nothing is skipped, so names in
+    # comments and strings count too.
+    "generic": (
+        *_each("symbol", ("def", "class", "function", "const", "let", "var"), rf"[ \t]+({_JS_IDENT})"),
+        ("symbol", rf"pub[ \t]+fn[ \t]+({_IDENT})"),
+        *_each("dependency", ("import", "from", "require", "use"), r"[ \t]+['\"]?([A-Za-z0-9_./:@-]+)"),
+    ),
+}
+
+_FENCE_RE = re.compile(r"^(?P<fence>```|~~~)[ \t]*(?P<info>[\w+#.-]*)[^\n]*\n(?P<body>[\s\S]*?)^(?P=fence)", re.M)
+_GO_IMPORT_PATH_RE = re.compile(r'"([^"\n]+)"')
+_PY_IMPORT_ALIAS_RE = re.compile(r"[ \t]+as[ \t]+\w+")
+_BACKREF_RE = re.compile(r"\\([1-9])")
+# Import roots that name the current crate rather than a dependency.
+_RUST_LOCAL_ROOTS = {"crate", "self", "super"}
+
+
+def _lead(pattern: str) -> str:
+    return pattern[:2] if pattern.startswith("\\") else pattern[:1]
+
+
+@lru_cache(maxsize=None)
+def _scanner(language: str) -> tuple[re.Pattern[str], tuple[str, ...]]:
+    """Return the combined pattern and the rule kind of each of its groups (index 0 unused)."""
+    # Rules sharing a first character only compete with each other, so they are
+    # nested under that character (keeping their order) and each candidate
+    # position is tested against each first character once.
+    by_lead: dict[str, list[tuple[str, str]]] = {}
+    for kind, pattern in _RULES[language]:
+        by_lead.setdefault(_lead(pattern), []).append((kind, pattern))
+    alternatives = []
+    kinds = ["skip"]
+    for lead, rules in by_lead.items():
+        tails = []
+        for kind, pattern in rules:
+            offset = len(kinds) - 1
+            if offset:
+                # Shift back-references past the groups of earlier rules.
+                pattern = _BACKREF_RE.sub(lambda ref: f"\\{int(ref.group(1)) + offset}", pattern)
+            tails.append(pattern[len(lead):])
+            kinds.extend([kind] * re.compile(pattern).groups)
+        alternatives.append(lead + ("(?:" + "|".join(tails) + ")" if len(tails) > 1 else tails[0]))
+    return re.compile("|".join(alternatives)), tuple(kinds)
+
+
+def language_for_path(path: str) -> str | None:
+    """Return the lexer language for ``path``, or ``None`` when it is not lexed."""
+    dot = path.rfind(".")
+    if dot < 0 or "/" in path[dot:]:
+        return None
+    return LANGUAGE_BY_EXTENSION.get(path[dot:].lower())
+
+
+def _dependency_names(language: str, raw: str) -> list[str]:
+    if language == "python":
+        names = [_PY_IMPORT_ALIAS_RE.sub("", part).strip() for part in raw.split(",")]
+        # Relative imports point back into the repository itself.
+        return [name for name in names if name and not name.startswith(".")]
+    if language == "rust":
+        name = raw.lstrip(":")
+        return [] if name.split("::", 1)[0] in _RUST_LOCAL_ROOTS else [name]
+    if language in ("typescript", "javascript"):
+        return [] if raw.startswith(".") else [raw]
+    return [raw]
+
+
+def _lex_code(content: str, language: str, symbols: dict[str, bool], dependencies: dict[str, None]) -> None:
+    scanner, kinds = _scanner(language)
+    text = "\n" + content
+    for match in scanner.finditer(text):
+        group = match.lastindex
+        if group is None or kinds[group] == "skip":
+            continue
+        kind = kinds[group]
+        start = match.start()
+        at_newline = text[start] == "\n"
+        if not at_newline and (text[start - 1].isalnum() or text[start - 1] in "_$."):
+            # The keyword is the tail of a longer identifier or an attribute access.
+            continue
+        value = match.group(group)
+        if kind == "symbol":
+            # Unindented line, whatever modifiers (export, pub, public) precede the keyword.
+            line_start = start + 1 if at_newline else text.rfind("\n", 0, start) + 1
+            top_level = text[line_start] not in " \t"
+            symbols[value] = symbols.get(value, False) or top_level
+        elif kind == "dependency":
+            for name in _dependency_names(language, value):
+                dependencies.setdefault(name, None)
+        else:
+            for name in _GO_IMPORT_PATH_RE.findall(value):
+                dependencies.setdefault(name, None)
+
+
+def lex_symbols(content: str, language: str | None) -> tuple[list[str], list[str]]:
+    """
+    Return ``(symbols, dependencies)`` defined and imported by ``content``.
+
+    One combined regex scan per chunk: comments and string literals are consumed
+    as tokens, so definitions and imports are only recognised in code. Symbols are
+    ordered top-level definitions first, then nested ones, each in source order;
+    dependencies keep source order and leave out relative imports. Markdown is
+    lexed through its fenced code blocks that name a supported language; content
+    whose language is unknown (``None``) falls back to the generic keyword rules.
+    """
+    symbols: dict[str, bool] = {}
+    dependencies: dict[str, None] = {}
+    if language == "markdown":
+        for fence in _FENCE_RE.finditer(content):
+            fence_language = _FENCE_LANGUAGES.get(fence.group("info").lower())
+            if fence_language is not None:
+                _lex_code(fence.group("body"), fence_language, symbols, dependencies)
+    elif language is None:
+        _lex_code(content, "generic", symbols, dependencies)
+    elif language in _RULES:
+        _lex_code(content, language, symbols, dependencies)
+    ordered = [name for name, top in symbols.items() if top] + [name for name, top in symbols.items() if not top]
+    return ordered, list(dependencies)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POSITIVE_TTL_SECONDS = 14 * 24 * 3600
+DEFAULT_NEGATIVE_TTL_SECONDS = 24 * 3600
+
+
+class URLLivenessCache:
+    """
+    On-disk ``url -> (status, alive, checked_at)`` table backed by SQLite.
+
+    Live results stay valid for ``positive_ttl`` seconds and dead ones for the
+    usually shorter ``negative_ttl``, so a site that was briefly down is retried
+    sooner than a healthy one is re-probed. SQLite keeps the file safe to share
+    between concurrent runs.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        positive_ttl: float = DEFAULT_POSITIVE_TTL_SECONDS,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS url_liveness ("
+                "url TEXT PRIMARY KEY, status INTEGER, alive INTEGER NOT NULL, checked_at REAL NOT NULL)"
+            )
+
+    def get(self, url: str) -> bool | None:
+        """Return the cached verdict for ``url``, or ``None`` when unknown or expired."""
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT alive, checked_at FROM url_liveness WHERE url = ?", (url,)
+                ).fetchone()
+            except sqlite3.Error as exc:
+                logger.debug("URL liveness cache read failed: %s", exc)
+                row = None
+            if row is not None:
+                alive, checked_at = bool(row[0]), float(row[1])
+                ttl = self.positive_ttl if alive else self.negative_ttl
+                if self._clock() - checked_at <= ttl:
+                    self.hits += 1
+                    return alive
+            self.misses += 1
+            return None
+
+    def put(self, url: str, alive: bool, status: int | None = None) -> None:
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO url_liveness (url, status, alive, checked_at) VALUES (?, ?, ?, ?)",
+                        (url, status, int(alive), self._clock()),
+                    )
+            except sqlite3.Error as exc:
+                # The cache is an optimization; a locked or read-only file must not fail the run.
+                logger.debug("URL liveness cache write failed: %s", exc)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_LIVENESS_CACHE: URLLivenessCache | None = None
+
+
+def configure_liveness_cache(
+    path: Path | None,
+    *,
+    positive_ttl: float = DEFAULT_POSITIVE_TTL_SECONDS,
+    negative_ttl: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+) -> URLLivenessCache | None:
+    """Enable (or disable with ``None``) the shared liveness cache used by link checks and llms-full."""
+    global _LIVENESS_CACHE
+    current = _LIVENESS_CACHE
+    if current is not None and path is not None and current.path == Path(path):
+        # Reuse the open connection; other threads may still be checking links.
+        current.positive_ttl = positive_ttl
+        current.negative_ttl = negative_ttl
+        return current
+    if current is not None:
+        current.close()
+    try:
+        _LIVENESS_CACHE = (
+            URLLivenessCache(path, positive_ttl=positive_ttl, negative_ttl=negative_ttl) if path is not None else None
+        )
+    except (OSError, sqlite3.Error) as exc:
+        logger.warning("URL liveness cache disabled: %s", exc)
+        _LIVENESS_CACHE = None
+    return _LIVENESS_CACHE
+
+
+def cached_liveness(url: str) -> bool | None:
+    return _LIVENESS_CACHE.get(url) if _LIVENESS_CACHE is not None else None
+
+
+def record_liveness(url: str, alive: bool, status: int | None = None) -> None:
+    if _LIVENESS_CACHE is not None:
+        _LIVENESS_CACHE.put(url, alive, status)
+
+
+def liveness_cache_stats() -> dict[str, int] | None:
+    return _LIVENESS_CACHE.stats() if _LIVENESS_CACHE is not None else None
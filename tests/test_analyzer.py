@@ -431,3 +431,288 @@ def test_dynamic_buckets_make_duplicate_api_links_human_specific(monkeypatch):
     assert ("TypeScript Chat", "lookup the typescript chat API contract, parameters, and return behavior") in entries
     assert len({title for title, _ in entries}) == len(entries)
     assert all(note != "API reference" for _, note in entries)
+
+
+def test_build_dynamic_buckets_validates_concurrently_with_deterministic_order(monkeypatch):
+    import threading
+    import time
+
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def slow_alive(url):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.02 if "b" in url else 0.05)
+        with lock:
+            active["now"] -= 1
+        return "dead" not in url
+
+    monkeypatch.setattr(analyzer, "_url_alive", slow_alive)
+    monkeypatch.setattr(
+        analyzer,
+        "construct_github_file_url",
+        lambda repo_url, path, ref=None, style="blob": f"https://example.com/{path}",
+    )
+    file_tree = "docs/a.md\ndocs/b.md\ndocs/dead.md\ndocs/c.md\nREADME.md"
+
+    concurrent = analyzer.build_dynamic_buckets("https://github.com/o/r", file_tree, default_ref="main")
+    monkeypatch.setattr(analyzer, "_URL_VALIDATION_WORKERS", 1)
+    sequential = analyzer.build_dynamic_buckets("https://github.com/o/r", file_tree, default_ref="main")
+
+    assert concurrent == sequential
+    assert active["peak"] > 1
+    assert all("dead" not in url for _, items in concurrent for _, url, _ in items)
+
+
+def test_build_dynamic_buckets_keeps_pages_unchecked_when_budget_expires(monkeypatch):
+    import threading
+
+    release = threading.Event()
+
+    def hanging_alive(url):
+        if "slow" in url:
+            release.wait(5)
+            return False
+        return "dead" not in url
+
+    monkeypatch.setattr(analyzer, "_url_alive", hanging_alive)
+    monkeypatch.setattr(analyzer, "_URL_VALIDATION_BUDGET_SECONDS", 0.2)
+    monkeypatch.setattr(
+        analyzer,
+        "construct_github_file_url",
+        lambda repo_url, path, ref=None, style="blob": f"https://example.com/{path}",
+    )
+
+    try:
+        buckets = analyzer.build_dynamic_buckets(
+            "https://github.com/o/r", "docs/slow.md\ndocs/dead.md\ndocs/ok.md", default_ref="main"
+        )
+    finally:
+        release.set()
+    urls = [url for _, items in buckets for _, url, _ in items]
+
+    assert "https://example.com/docs/slow.md" in urls
+    assert "https://example.com/docs/ok.md" in urls
+    assert "https://example.com/docs/dead.md" not in urls
+
+
+def test_trust_tree_link_validation_skips_repo_links_but_probes_other_urls(monkeypatch):
+    probed: list[str] = []
+
+    def fake_alive(url):
+        probed.append(url)
+        return False
+
+    def fake_url(repo_url, path, ref=None, style="blob"):
+        if path.startswith("mirror/"):
+            return f"https://mirror.example.com/{path}"
+        return f"https://github.com/o/r/blob/main/{path}"
+
+    monkeypatch.setattr(analyzer, "_url_alive", fake_alive)
+    monkeypatch.setattr(analyzer, "construct_github_file_url", fake_url)
+
+    buckets = analyzer.build_dynamic_buckets(
+        "https://github.com/o/r",
+        "README.md\ndocs/guide.md\nmirror/notes.md",
+        default_ref="main",
+        link_validation="trust-tree",
+    )
+
+    urls = [url for _, items in buckets for _, url, _ in items]
+    assert "https://github.com/o/r/blob/main/docs/guide.md" in urls
+    assert "https://mirror.example.com/mirror/notes.md" not in urls
+    assert probed == ["https://mirror.example.com/mirror/notes.md"]
+
+
+def test_repository_analyzer_plans_evidence_while_lm_analysis_runs(monkeypatch):
+    import threading
+
+    class Empty:
+        pass
+
+    analysis_started = threading.Event()
+
+    def slow_buckets(*args, **kwargs):
+        # Deadlocks (and times out) if bucket building waits for the LM analysis.
+        assert analysis_started.wait(timeout=5)
+        return [("Docs", [("README", "https://example.com/readme", "docs page")])]
+
+    def analyze_repo(**_):
+        analysis_started.set()
+        return Empty()
+
+    ra = analyzer.RepositoryAnalyzer(production_mode=True)
+    _stub_section_synthesis(monkeypatch, ra)
+    monkeypatch.setattr(ra, "analyze_repo", analyze_repo)
+    monkeypatch.setattr(ra, "analyze_structure", lambda **_: Empty())
+    monkeypatch.setattr(ra, "generate_examples", lambda **_: analyzer.dspy.Prediction())
+    monkeypatch.setattr(ra, "plan_sections", lambda **_: analyzer.dspy.Prediction())
+    monkeypatch.setattr(analyzer, "build_dynamic_buckets", slow_buckets)
+
+    result = ra.forward(
+        repo_url="https://github.com/acme/demo",
+        file_tree="README.md\nsrc/main.py",
+        readme_content="# Demo\n\nPrimary service for processing events.",
+        default_branch="main",
+    )
+
+    assert result.document.sections[0].name == "Docs"
+    assert result.trace.selected_evidence == [
+        {"section": "Docs", "title": "README", "url": "https://example.com/readme", "note": "docs page"}
+    ]
+
+
+def test_fused_analyzer_mode_makes_one_call_and_restages_unusable_fields(monkeypatch):
+    calls: list[str] = []
+
+    def fused(**kwargs):
+        calls.append("fused")
+        assert kwargs["available_sections"][0] == "Usage"
+        return analyzer.dspy.Prediction(
+            project_purpose="Fused purpose for processing events.",
+            key_concepts=["events"],
+            architecture_overview="Single service.",
+            important_directories=["src/"],
+            entry_points=None,  # unusable: analyze_structure re-runs for this field only
+            development_info="pip install demo",
+            usage_examples="demo run",
+            included_sections=[],
+            preferred_section_order=["Docs"],
+            remember_bullets=["Fused bullet"],
+            section_notes=[],
+        )
+
+    def staged(name, **fields):
+        def predictor(**_):
+            calls.append(name)
+            return analyzer.dspy.Prediction(**fields)
+
+        return predictor
+
+    ra = analyzer.RepositoryAnalyzer(production_mode=True, mode="fused")
+    monkeypatch.setattr(ra, "analyze_fused", fused)
+    monkeypatch.setattr(ra, "analyze_repo", staged("analyze_repo"))
+    monkeypatch.setattr(
+        ra,
+        "analyze_structure",
+        staged("analyze_structure", important_directories=["lib/"], entry_points=["demo.cli"], development_info="x"),
+    )
+    monkeypatch.setattr(ra, "generate_examples", staged("generate_examples"))
+    monkeypatch.setattr(ra, "plan_sections", staged("plan_sections"))
+    monkeypatch.setattr(ra, "synthesize_section_notes", staged("synthesize_section_notes"))
+    monkeypatch.setattr(
+        analyzer,
+        "build_dynamic_buckets",
+        lambda *args, **kwargs: [("Docs", [("README", "https://example.com/readme", "docs page")])],
+    )
+
+    result = ra.forward(
+        repo_url="https://github.com/acme/demo",
+        file_tree="README.md\nsrc/main.py",
+        readme_content="# Demo",
+        default_branch="main",
+    )
+
+    assert calls == ["fused", "analyze_structure"]
+    assert result.analysis.project_purpose == "Fused purpose for processing events."
+    assert result.structure.important_directories == ["src/"]
+    assert result.structure.entry_points == ["demo.cli"]
+    assert result.document.remember_bullets == ["Fused bullet"]
+    report = result.trace.model_section_planning["fused_analysis"]
+    assert report["used"] is True
+    assert report["staged_fields"] == {"analyze_structure": ["entry_points"]}
+
+
+def test_build_dynamic_buckets_keeps_top_ranked_pages_and_only_links_survivors(monkeypatch):
+    built: list[str] = []
+
+    def fake_construct(repo_url, path, ref=None, style="blob"):
+        built.append(path)
+        return f"https://example.com/{path}"
+
+    monkeypatch.setattr(analyzer, "construct_github_file_url", fake_construct)
+    file_tree = "\n".join(
+        [f"docs/deep/nested/page{i:02d}.md" for i in range(30)]
+        + ["docs/quickstart.md", "docs/install.md", "docs/index.md"]
+    )
+
+    buckets = analyzer.build_dynamic_buckets("https://github.com/o/r", file_tree, validate_urls=False)
+
+    docs = dict(buckets)["Docs"]
+    assert [title for title, _, _ in docs[:3]] == ["Install", "Quickstart", "Docs"]
+    assert [title for title, _, _ in docs[3:]] == [f"Page{i:02d}" for i in range(7)]
+    assert len(built) == 10
+
+
+def test_link_verdict_memo_probes_each_url_once_for_concurrent_requests():
+    import threading
+
+    probes: list[str] = []
+    release = threading.Event()
+    memo = analyzer.LinkVerdictMemo()
+    results: list[bool] = []
+
+    def probe(url):
+        probes.append(url)
+        assert release.wait(timeout=5)
+        return "live" in url
+
+    def request():
+        results.append(memo.check("https://example.com/live", lambda: probe("https://example.com/live")))
+
+    threads = [threading.Thread(target=request) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    dead = memo.check("https://example.com/dead", lambda: probe("https://example.com/dead"))
+
+    assert probes == ["https://example.com/live", "https://example.com/dead"]
+    assert results == [True, True, True]
+    assert dead is False
+
+
+def test_link_verdicts_are_shared_while_each_caller_keeps_its_own_tree(monkeypatch):
+    import threading
+
+    from lms_llmsTxt.fallback import fallback_llms_payload
+
+    probes: list[str] = []
+
+    def alive(url):
+        probes.append(url)
+        return True
+
+    monkeypatch.setattr(analyzer, "_url_alive", alive)
+    full_tree = "README.md\ndocs/guide.md\ndocs/install.md\nsrc/big.py"
+    compacted_tree = "README.md\ndocs/guide.md"
+    memo = analyzer.LinkVerdictMemo()
+    cancel = threading.Event()
+    cancel.set()
+
+    compacted = analyzer.build_dynamic_buckets(
+        "https://github.com/o/r", compacted_tree, default_ref="main", verdict_memo=memo
+    )
+    payload = fallback_llms_payload(
+        "Repo",
+        "https://github.com/o/r",
+        full_tree,
+        "# Repo",
+        default_branch="main",
+        verdict_memo=memo,
+        cancel_event=cancel,
+    )
+    shared_probes = list(probes)
+    unshared = analyzer.build_dynamic_buckets("https://github.com/o/r", compacted_tree, default_ref="main")
+
+    assert compacted == unshared
+    assert sorted(shared_probes) == [
+        "https://github.com/o/r/blob/main/README.md",
+        "https://github.com/o/r/blob/main/docs/guide.md",
+        "https://github.com/o/r/blob/main/docs/install.md",
+        "https://github.com/o/r/blob/main/src/big.py",
+    ]
+    assert payload is None
@@ -78,3 +78,20 @@ def test_build_llms_full_403_hint(monkeypatch):
 
     assert "HTTP 403 Forbidden" in output
     assert "Verify that GITHUB_ACCESS_TOKEN or GH_TOKEN" in output
+
+
+def test_build_llms_full_uses_content_lookup_before_network(monkeypatch):
+    def explode(*args, **kwargs):
+        raise AssertionError("known content must not be refetched")
+
+    monkeypatch.setattr(full_builder, "fetch_raw_file", explode)
+    monkeypatch.setattr(full_builder, "gh_get_file", explode)
+
+    output = full_builder.build_llms_full_from_repo(
+        _curated_link(),
+        prefer_raw=True,
+        default_ref="main",
+        content_lookup=lambda gh, ref: b"cached body\n" if (gh.path, ref) == ("dir/file.py", "main") else None,
+    )
+
+    assert "cached body" in output
@@ -0,0 +1,571 @@
+from __future__ import annotations
+
+import io
+import os
+import tarfile
+import threading
+
+import pytest
+import requests
+
+from lms_llmsTxt import github
+from lms_llmsTxt.rate_limit import GitHubRateLimiter
+
+
+@pytest.fixture(autouse=True)
+def _no_shared_http_cache(monkeypatch):
+    monkeypatch.setattr(github, "_HTTP_CACHE", None)
+    monkeypatch.setattr(github, "_BLOB_STORE", None)
+    monkeypatch.setattr(github, "_RATE_LIMITER", GitHubRateLimiter(sleep=lambda _seconds: None))
+    github.clear_repository_metadata_cache()
+
+
+def _tarball(files: dict[str, bytes], prefix: str = "owner-repo-abc123", commit: str | None = None) -> bytes:
+    buffer = io.BytesIO()
+    pax_headers = {"comment": commit} if commit else {}
+    with tarfile.open(fileobj=buffer, mode="w:gz", format=tarfile.PAX_FORMAT, pax_headers=pax_headers) as tar:
+        for path, data in files.items():
+            info = tarfile.TarInfo(f"{prefix}/{path}")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+class _FakeResponse:
+    def __init__(self, status_code: int = 200, payload: object = None, raw: bytes = b"") -> None:
+        self.status_code = status_code
+        self._payload = payload
+        self.raw = io.BytesIO(raw)
+        self.headers: dict[str, str] = {}
+
+    def json(self) -> object:
+        return self._payload
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise github.requests.HTTPError(str(self.status_code))
+
+    def close(self) -> None:
+        pass
+
+
+def test_gather_repository_material_archive_mode_uses_single_download(monkeypatch):
+    tarball = _tarball(
+        {
+            "README.md": b"# Demo\n\nHello",
+            "pyproject.toml": b"[project]\nname='demo'",
+            "src/demo/cli.py": b"def main():\n    pass\n",
+            "assets/logo.png": b"\x89PNG\0\0",
+            "big/data.txt": b"x" * 64,
+            ".serena/memories/state.md": b"ignored",
+        },
+        commit="0123456789abcdef0123456789abcdef01234567",
+    )
+    requested: list[str] = []
+
+    def fake_get(url, **kwargs):
+        requested.append(url)
+        if url.endswith("/repos/owner/repo"):
+            return _FakeResponse(payload={"default_branch": "main", "private": False})
+        if url.endswith("/tarball/main"):
+            assert kwargs.get("stream") is True
+            return _FakeResponse(raw=tarball)
+        return _FakeResponse(status_code=404)
+
+    monkeypatch.setattr(github._SESSION, "get", fake_get)
+    monkeypatch.setattr(github, "_ARCHIVE_MAX_FILE_BYTES", 32)
+
+    material = github.gather_repository_material(
+        "https://github.com/owner/repo",
+        fetch_mode="archive",
+    )
+
+    assert material.file_tree.splitlines() == [
+        "README.md",
+        "assets/logo.png",
+        "big/data.txt",
+        "pyproject.toml",
+        "src/demo/cli.py",
+    ]
+    assert material.readme_content.startswith("# Demo")
+    assert "=== pyproject.toml ===" in material.package_files
+    assert material.prefetched_content["src/demo/cli.py"].startswith("def main")
+    assert "assets/logo.png" not in material.prefetched_content
+    assert "big/data.txt" not in material.prefetched_content
+    assert material.snapshot_ref == "commit:0123456789abcdef0123456789abcdef01234567"
+    # Oversized files stay in the tree without triggering eager contents requests.
+    assert [url for url in requested if "/contents/" in url] == []
+
+
+def test_fetch_repository_archive_reads_commit_from_wrapper_directory_without_pax_comment(monkeypatch):
+    tarball = _tarball({"README.md": b"# Demo"}, prefix="owner-repo-abc1234")
+    monkeypatch.setattr(github._SESSION, "get", lambda url, **kwargs: _FakeResponse(raw=tarball))
+
+    archive = github.fetch_repository_archive("owner", "repo", "main", None)
+
+    assert archive.commit_sha == "abc1234"
+
+
+def test_archive_with_only_an_abbreviated_commit_names_no_snapshot(monkeypatch):
+    tarball = _tarball({"README.md": b"# Demo"}, prefix="owner-repo-abc1234")
+
+    def fake_get(url, **kwargs):
+        if url.endswith("/repos/owner/repo"):
+            return _FakeResponse(payload={"default_branch": "main"})
+        if url.endswith("/tarball/main"):
+            return _FakeResponse(raw=tarball)
+        return _FakeResponse(status_code=404)
+
+    monkeypatch.setattr(github._SESSION, "get", fake_get)
+
+    material = github.gather_repository_material("https://github.com/owner/repo", fetch_mode="archive")
+
+    assert material.readme_content == "# Demo"
+    assert material.snapshot_ref is None
+
+
+def test_gather_repository_material_archive_failure_falls_back_to_contents(monkeypatch):
+    def fake_get(url, **kwargs):
+        if url.endswith("/repos/owner/repo"):
+            return _FakeResponse(payload={"default_branch": "main", "private": True})
+        if url.endswith("/tarball/main"):
+            return _FakeResponse(status_code=502)
+        if url.endswith("/git/trees/main"):
+            return _FakeResponse(payload={"tree": [{"path": "README.md", "type": "blob"}]})
+        if url.endswith("/contents/README.md"):
+            return _FakeResponse(payload={"content": "# Fallback", "encoding": "utf-8"})
+        return _FakeResponse(status_code=404)
+
+    monkeypatch.setattr(github._SESSION, "get", fake_get)
+
+    material = github.gather_repository_material(
+        "https://github.com/owner/repo",
+        fetch_mode="archive",
+    )
+
+    assert material.file_tree == "README.md"
+    assert material.readme_content == "# Fallback"
+    assert material.is_private is True
+    assert material.prefetched_content == {}
+
+
+def _json_response(status_code: int, body: bytes = b"", headers: dict[str, str] | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.headers.update(headers or {})
+    response.url = "https://api.github.com/repos/owner/repo"
+    return response
+
+
+def test_http_cache_revalidates_and_replays_body_on_304(tmp_path, monkeypatch):
+    github.configure_http_cache(tmp_path / "http")
+    seen_headers: list[dict[str, str]] = []
+    responses = iter(
+        [
+            _json_response(
+                200,
+                b'{"default_branch": "trunk", "private": false}',
+                {"ETag": '"v1"', "Content-Type": "application/json"},
+            ),
+            _json_response(304),
+        ]
+    )
+
+    def fake_get(url, **kwargs):
+        seen_headers.append(dict(kwargs["headers"]))
+        return next(responses)
+
+    monkeypatch.setattr(github._SESSION, "get", fake_get)
+
+    first = github.get_repository_metadata("owner", "repo", token=None)
+    github.clear_repository_metadata_cache()
+    second = github.get_repository_metadata("owner", "repo", token=None)
+
+    assert first == second
+    assert second["default_branch"] == "trunk"
+    assert "If-None-Match" not in seen_headers[0]
+    assert seen_headers[1]["If-None-Match"] == '"v1"'
+    assert github.http_cache_stats() == {"hits": 1, "misses": 1, "evicted": 0}
+
+
+def test_http_cache_keys_are_scoped_by_token(tmp_path):
+    cache = github.configure_http_cache(tmp_path / "http")
+    url = "https://api.github.com/repos/owner/repo/contents/README.md"
+
+    assert cache.key_for(url, {"ref": "main"}, "a") != cache.key_for(url, {"ref": "main"}, "b")
+    assert cache.key_for(url, {"ref": "main"}, None) != cache.key_for(url, {"ref": "dev"}, None)
+
+
+def test_fetch_file_content_serves_known_blob_sha_without_http(tmp_path, monkeypatch):
+    store = github.configure_blob_store(tmp_path / "blobs")
+    calls: list[str] = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        return _FakeResponse(payload={"content": "cHJpbnQoMSkK", "encoding": "base64"})
+
+    monkeypatch.setattr(github._SESSION, "get", fake_get)
+
+    first = github.fetch_file_content("owner", "repo", "a.py", "main", None)
+    sha = github.git_blob_sha(b"print(1)\n")
+    second = github.fetch_file_content("fork", "other", "b.py", "dev", None, blob_sha=sha)
+
+    assert first == second == "print(1)\n"
+    assert len(calls) == 1
+    assert store.stats() == {"hits": 1, "misses": 0, "evicted": 0}
+
+
+def test_blob_store_rejects_corrupted_entries(tmp_path):
+    store = github.configure_blob_store(tmp_path / "blobs")
+    sha = store.put(b"hello")
+    (tmp_path / "blobs" / sha[:2] / sha[2:]).write_bytes(b"tampered")
+
+    assert store.get(sha) is None
+
+
+def test_blob_store_prunes_least_recently_used_blobs_past_its_cap(tmp_path):
+    store = github.configure_blob_store(tmp_path / "blobs", max_bytes=250)
+    old = store.put(b"a" * 100)
+    served = store.put(b"b" * 100)
+    for index, sha in enumerate((old, served)):
+        os.utime(tmp_path / "blobs" / sha[:2] / sha[2:], (1000 + index, 1000 + index))
+    assert store.get(served) is not None
+
+    fresh = store.put(b"c" * 100)
+
+    assert store.get(old) is None
+    assert store.get(served) is not None
+    assert store.get(fresh) is not None
+    assert store.stats()["evicted"] == 1
+
+
+def test_http_cache_prunes_oldest_entries_past_its_cap(tmp_path):
+    cache = github.configure_http_cache(tmp_path / "http", max_bytes=700)
+
+    def response(body: bytes) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = 200
+        resp._content = body
+        resp.headers["ETag"] = '"v1"'
+        return resp
+
+    cache.store("aa-old", response(b"x" * 200))
+    for path in (tmp_path / "http" / "aa").iterdir():
+        os.utime(path, (1000, 1000))
+    cache.store("bb-new", response(b"y" * 200))
+    cache.store("cc-new", response(b"z" * 200))
+
+    assert cache.replay("aa-old") is None
+    assert cache.replay("bb-new").content == b"y" * 200
+    assert cache.replay("cc-new").content == b"z" * 200
+    assert cache.stats()["evicted"] == 2
+
+
+def test_graphql_mode_resolves_readme_and_manifests_in_one_query(monkeypatch):
+    posted: list[dict] = []
+
+    def fake_get(url, **kwargs):
+        if url.endswith("/repos/owner/repo"):
+            return _FakeResponse(payload={"default_branch": "main", "private": True})
+        if url.endswith("/git/trees/main"):
+            tree = [
+                {"path": "README.md", "type": "blob", "sha": "1" * 40},
+                {"path": "package.json", "type": "blob", "sha": "2" * 40},
+                {"path": "logo.png", "type": "blob", "sha": "3" * 40},
+            ]
+            return _FakeResponse(payload={"tree": tree})
+        raise AssertionError(f"unexpected REST call: {url}")
+
+    def fake_post(url, **kwargs):
+        posted.append(kwargs["json"])
+        assert url == "https://api.github.com/graphql"
+        return _FakeResponse(
+            payload={
+                "data": {
+                    "repository": {
+                        "f0": {"text": "# Readme", "isBinary": False, "isTruncated": False},
+                        "f1": {"text": '{"name": "demo"}', "isBinary": False, "isTruncated": False},
+                    }
+                }
+            }
+        )
+
+    monkeypatch.setattr(github._SESSION, "get", fake_get)
+    monkeypatch.setattr(github._SESSION, "post", fake_post)
+
+    material = github.gather_repository_material(
+        "https://github.com/owner/repo",
+        token="token-123",
+        fetch_mode="graphql",
+    )
+
+    assert len(posted) == 1
+    assert '"main:README.md"' in posted[0]["query"]
+    assert '"main:package.json"' in posted[0]["query"]
+    assert material.readme_content == "# Readme"
+    assert material.package_files == '=== package.json ===\n{"name": "demo"}'
+
+
+def test_fetch_file_contents_graphql_maps_missing_and_truncated_blobs(monkeypatch):
+    def fake_post(url, **kwargs):
+        return _FakeResponse(
+            payload={
+                "data": {
+                    "repository": {
+                        "f0": None,
+                        "f1": {"text": None, "isBinary": True, "isTruncated": False},
+                        "f2": {"text": "partial", "isBinary": False, "isTruncated": True},
+                    }
+                }
+            }
+        )
+
+    monkeypatch.setattr(github._SESSION, "post", fake_post)
+
+    result = github.fetch_file_contents_graphql(
+        "owner", "repo", "main", ["missing.md", "image.png", "huge.txt"], "token-123"
+    )
+
+    assert result == {"missing.md": None, "image.png": None}
+
+
+def test_github_request_retries_after_retry_after_on_429(monkeypatch):
+    sleeps: list[float] = []
+    limiter = GitHubRateLimiter(sleep=sleeps.append)
+    monkeypatch.setattr(github, "_RATE_LIMITER", limiter)
+    responses = [
+        _json_response(429, headers={"Retry-After": "7"}),
+        _json_response(200, b'{"default_branch": "main"}'),
+    ]
+
+    def fake_get(url, **kwargs):
+        return responses.pop(0)
+
+    monkeypatch.setattr(github._SESSION, "get", fake_get)
+
+    assert github.get_default_branch("owner", "repo", None) == "main"
+    assert sleeps == [7.0]
+    snapshot = limiter.snapshot()
+    assert snapshot["requests"] == 2
+    assert snapshot["throttled_requests"] == 1
+
+
+def test_rate_limiter_waits_for_reset_when_budget_is_exhausted():
+    now = [1000.0]
+    sleeps: list[float] = []
+    limiter = GitHubRateLimiter(reserve=2, sleep=sleeps.append, clock=lambda: now[0])
+    response = _FakeResponse(200)
+    response.headers = {
+        "X-RateLimit-Limit": "60",
+        "X-RateLimit-Remaining": "2",
+        "X-RateLimit-Reset": "1030",
+    }
+
+    assert limiter.observe(response) is None
+    limiter.acquire()
+
+    assert sleeps == [30.0]
+    assert limiter.snapshot()["buckets"]["core"]["limit"] == 60
+
+
+def test_github_request_does_not_retry_plain_forbidden(monkeypatch):
+    calls: list[str] = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        return _FakeResponse(403)
+
+    monkeypatch.setattr(github._SESSION, "get", fake_get)
+
+    resp = github.github_request("GET", "https://api.github.com/repos/owner/repo")
+
+    assert resp.status_code == 403
+    assert len(calls) == 1
+
+
+def test_truncated_tree_falls_back_to_subtree_walks(monkeypatch):
+    listings = {
+        ("main", True): {"sha": "root", "truncated": True, "tree": [{"path": "README.md", "type": "blob", "sha": "r"}]},
+        ("main", False): {
+            "sha": "root",
+            "tree": [
+                {"path": "README.md", "type": "blob", "sha": "r"},
+                {"path": "src", "type": "tree", "sha": "t-src"},
+                {"path": "docs", "type": "tree", "sha": "t-docs"},
+                {"path": ".agents", "type": "tree", "sha": "t-agents"},
+            ],
+        },
+        ("t-src", True): {"truncated": True, "tree": []},
+        ("t-src", False): {
+            "tree": [
+                {"path": "main.py", "type": "blob", "sha": "m"},
+                {"path": "pkg", "type": "tree", "sha": "t-pkg"},
+            ]
+        },
+        ("t-pkg", True): {"tree": [{"path": "mod.py", "type": "blob", "sha": "p"}]},
+        ("t-docs", True): {"tree": [{"path": "guide/intro.md", "type": "blob", "sha": "d"}]},
+    }
+    requested: list[tuple[str, bool]] = []
+
+    def fake_get(url, params=None, **kwargs):
+        key = (url.rsplit("/", 1)[-1], bool(params))
+        requested.append(key)
+        return _FakeResponse(payload=listings[key])
+
+    monkeypatch.setattr(github._SESSION, "get", fake_get)
+    status = github.TreeWalkStatus()
+
+    entries = github.fetch_file_tree_entries("owner", "repo", "main", None, status=status)
+
+    assert sorted(entry.path for entry in entries) == [
+        "README.md",
+        "docs/guide/intro.md",
+        "src/main.py",
+        "src/pkg/mod.py",
+    ]
+    assert status.truncated and status.complete
+    assert status.tree_sha == "root"
+    assert ("t-agents", True) not in requested
+
+
+def test_oversized_subtree_is_listed_non_recursively_without_a_discarded_request(monkeypatch):
+    monkeypatch.setattr(github, "_TREE_ENTRY_LIMIT", 2)
+    listings = {
+        ("main", True): {
+            "truncated": True,
+            "tree": [
+                {"path": "big", "type": "tree", "sha": "t-big"},
+                {"path": "big/a.py", "type": "blob", "sha": "a"},
+                {"path": "big/b.py", "type": "blob", "sha": "b"},
+            ],
+        },
+        ("main", False): {
+            "tree": [
+                {"path": "big", "type": "tree", "sha": "t-big"},
+                {"path": "small", "type": "tree", "sha": "t-small"},
+            ]
+        },
+        ("t-big", False): {
+            "tree": [
+                {"path": "a.py", "type": "blob", "sha": "a"},
+                {"path": "b.py", "type": "blob", "sha": "b"},
+                {"path": "c.py", "type": "blob", "sha": "c"},
+            ]
+        },
+        ("t-small", True): {"tree": [{"path": "s.py", "type": "blob", "sha": "s"}]},
+    }
+    requested: list[tuple[str, bool]] = []
+
+    def fake_get(url, params=None, **kwargs):
+        key = (url.rsplit("/", 1)[-1], bool(params))
+        requested.append(key)
+        return _FakeResponse(payload=listings[key])
+
+    monkeypatch.setattr(github._SESSION, "get", fake_get)
+
+    entries = github.fetch_file_tree_entries("owner", "repo", "main", None)
+
+    assert sorted(entry.path for entry in entries) == ["big/a.py", "big/b.py", "big/c.py", "small/s.py"]
+    assert ("t-big", True) not in requested
+    assert ("t-small", True) in requested
+
+
+def test_root_files_are_fetched_while_subtrees_are_still_walked(monkeypatch):
+    subtree_released = threading.Event()
+    readme_fetched = threading.Event()
+
+    def fake_get(url, params=None, **kwargs):
+        if url.endswith("/repos/owner/repo"):
+            return _FakeResponse(payload={"default_branch": "main"})
+        if url.endswith("/git/trees/main"):
+            if params:
+                return _FakeResponse(payload={"truncated": True, "tree": []})
+            return _FakeResponse(
+                payload={
+                    "tree": [
+                        {"path": "README.md", "type": "blob", "sha": "r"},
+                        {"path": "lib", "type": "tree", "sha": "t-lib"},
+                    ]
+                }
+            )
+        if url.endswith("/git/trees/t-lib"):
+            # The subtree listing only finishes once the README fetch has happened.
+            assert readme_fetched.wait(timeout=5)
+            subtree_released.set()
+            return _FakeResponse(payload={"tree": [{"path": "mod.py", "type": "blob", "sha": "m"}]})
+        return _FakeResponse(404)
+
+    def fake_content(owner, repo, path, ref, token, *, blob_sha=None):
+        if path == "README.md":
+            readme_fetched.set()
+            return "# Streamed"
+        return None
+
+    monkeypatch.setattr(github._SESSION, "get", fake_get)
+    monkeypatch.setattr(github, "fetch_file_content", fake_content)
+
+    material = github.gather_repository_material("https://github.com/owner/repo")
+
+    assert subtree_released.is_set()
+    assert material.readme_content == "# Streamed"
+    assert material.file_tree == "README.md\nlib/mod.py"
+    assert material.tree_complete is True
+
+
+def test_failed_subtree_marks_material_tree_incomplete(monkeypatch):
+    def fake_get(url, params=None, **kwargs):
+        if url.endswith("/repos/owner/repo"):
+            return _FakeResponse(payload={"default_branch": "main"})
+        if url.endswith("/git/trees/main"):
+            if params:
+                return _FakeResponse(payload={"truncated": True, "tree": []})
+            return _FakeResponse(payload={"tree": [{"path": "lib", "type": "tree", "sha": "t-lib"}]})
+        if url.endswith("/git/trees/t-lib"):
+            return _FakeResponse(500)
+        return _FakeResponse(404)
+
+    monkeypatch.setattr(github._SESSION, "get", fake_get)
+
+    material = github.gather_repository_material("https://github.com/owner/repo")
+
+    assert material.file_tree == ""
+    assert material.tree_complete is False
+
+
+def test_repository_metadata_is_fetched_once_per_repo(monkeypatch):
+    calls: list[str] = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        return _FakeResponse(payload={"default_branch": "trunk"})
+
+    monkeypatch.setattr(github._SESSION, "get", fake_get)
+
+    assert github.get_default_branch("Owner", "Repo", None) == "trunk"
+    urls = [github.construct_github_file_url("https://github.com/owner/repo", f"docs/{i}.md") for i in range(3)]
+
+    assert calls == ["https://api.github.com/repos/Owner/Repo"]
+    assert urls[0] == "https://github.com/owner/repo/blob/trunk/docs/0.md"
+
+
+def test_repository_metadata_cache_does_not_replay_anonymous_404_to_token(monkeypatch):
+    calls: list[str | None] = []
+
+    def fake_get(url, **kwargs):
+        auth = kwargs["headers"].get("Authorization")
+        calls.append(auth)
+        if auth is None:
+            return _FakeResponse(status_code=404)
+        return _FakeResponse(payload={"default_branch": "main", "private": True})
+
+    monkeypatch.setattr(github._SESSION, "get", fake_get)
+
+    with pytest.raises(FileNotFoundError):
+        github.get_repository_metadata("owner", "private-repo", None)
+    with pytest.raises(FileNotFoundError):
+        github.get_repository_metadata("owner", "private-repo", None)
+    metadata = github.get_repository_metadata("owner", "private-repo", "secret")
+
+    assert metadata["is_private"] is True
+    assert calls == [None, "Bearer secret"]
@@ -92,7 +92,7 @@ def test_semantic_graph_http_error_preserves_response_body(monkeypatch: pytest.M
     def fake_post(*args, **kwargs):
         return Response()
 
-    monkeypatch.setattr("lms_llmsTxt.graph_semantic_synthesizer.requests.post", fake_post)
+    monkeypatch.setattr("lms_llmsTxt.graph_semantic_synthesizer._SESSION.post", fake_post)
 
     with pytest.raises(SemanticGraphSynthesisError, match="unsupported response_format"):
         build_semantic_repo_graph(_digest(), _material(), _config())
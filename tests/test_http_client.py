@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from lms_llmsTxt.http_client import DEFAULT_TIMEOUT, PooledSession
+
+
+class _RecordingAdapter(HTTPAdapter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.timeouts: list[object] = []
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        self.timeouts.append(timeout)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"hello"
+        response.url = request.url
+        response.request = request
+        return response
+
+
+def test_pooled_session_applies_default_timeout_and_counts_per_host():
+    session = PooledSession(pool_maxsize=4)
+    adapter = _RecordingAdapter()
+    session.mount("https://", adapter)
+    session.mount("https://api.github.com/", adapter)
+
+    session.get("https://api.github.com/repos/owner/repo")
+    session.get("https://api.github.com/repos/owner/repo", timeout=3)
+    session.get("https://docs.example.com/page")
+
+    assert adapter.timeouts == [DEFAULT_TIMEOUT, 3, DEFAULT_TIMEOUT]
+    stats = session.stats()
+    assert list(stats) == ["api.github.com", "docs.example.com"]
+    assert stats["api.github.com"]["requests"] == 2
+    assert stats["api.github.com"]["bytes"] == 10
+    assert stats["docs.example.com"]["errors"] == 0
+
+
+def test_pooled_session_resize_remounts_adapters_with_pool_size():
+    session = PooledSession(pool_maxsize=2)
+    session.resize(24)
+
+    adapter = session.get_adapter("https://api.github.com/repos/owner/repo")
+
+    assert adapter._pool_maxsize == 24
+    assert adapter.max_retries.total == 2
+
+
+def test_pooled_session_only_retries_github_api_gets():
+    session = PooledSession()
+
+    github_policy = session.get_adapter("https://api.github.com/repos/owner/repo").max_retries
+    liveness_policy = session.get_adapter("https://github.com/owner/repo/blob/main/README.md").max_retries
+    lmstudio_policy = session.get_adapter("http://localhost:1234/v1/chat/completions").max_retries
+
+    assert github_policy.total == 2
+    assert not github_policy.is_retry("POST", 503)
+    assert not github_policy.is_retry("HEAD", 503)
+    assert liveness_policy.total == 0
+    assert lmstudio_policy.total == 0
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import pytest
+
+from lms_llmsTxt import lm_cache
+from lms_llmsTxt.analyzer import dspy
+from lms_llmsTxt.lm_cache import CachedPredict, LMResponseCache, lm_cache_key
+from lms_llmsTxt.signatures import AnalyzeRepository
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_cache():
+    yield
+    lm_cache.configure_lm_cache(None)
+
+
+def test_cached_predict_serves_repeated_inputs_without_calling_the_model(tmp_path):
+    lm_cache.configure_lm_cache(tmp_path / "lm.sqlite3", model="demo-model")
+    calls: list[dict] = []
+
+    def predictor(**kwargs):
+        calls.append(kwargs)
+        return dspy.Prediction(
+            reasoning="not cached",
+            project_purpose=f"Purpose of {kwargs['repo_url']}",
+            key_concepts=["events"],
+            architecture_overview="One service.",
+        )
+
+    cached = CachedPredict(predictor, AnalyzeRepository)
+    inputs = {"repo_url": "https://github.com/o/r", "file_tree": "README.md", "readme_content": "# R"}
+
+    first = cached(**inputs)
+    second = cached(**{**inputs, "readme_content": "# R\r\n"})
+    changed = cached(**{**inputs, "file_tree": "README.md\nsrc/app.py"})
+
+    assert len(calls) == 2
+    assert second.project_purpose == first.project_purpose
+    assert second.key_concepts == ["events"]
+    assert changed.project_purpose == "Purpose of https://github.com/o/r"
+    stats = lm_cache.lm_cache_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert stats["signatures"] == {"AnalyzeRepository": {"hits": 1, "misses": 2}}
+
+
+def test_cache_key_depends_on_model_signature_and_digest():
+    inputs = {"file_tree": "a.py"}
+    assert lm_cache_key("A", "m1", inputs) != lm_cache_key("A", "m2", inputs)
+    assert lm_cache_key("A", "m1", inputs) != lm_cache_key("B", "m1", inputs)
+    assert lm_cache_key("A", "m1", inputs, "digest-1") != lm_cache_key("A", "m1", inputs, "digest-2")
+
+
+def test_cached_predict_does_not_store_unusable_responses(tmp_path):
+    lm_cache.configure_lm_cache(tmp_path / "lm.sqlite3", model="demo-model")
+    responses = iter(
+        [
+            {"project_purpose": "", "key_concepts": ["events"], "architecture_overview": "One service."},
+            {"project_purpose": "Events.", "key_concepts": "['events']", "architecture_overview": "One service."},
+            {"project_purpose": "Events.", "key_concepts": ["events"], "architecture_overview": "One service."},
+            {"project_purpose": "Events.", "key_concepts": ["events"], "architecture_overview": "One service."},
+        ]
+    )
+    calls: list[dict] = []
+
+    def predictor(**kwargs):
+        calls.append(kwargs)
+        return dspy.Prediction(**next(responses))
+
+    cached = CachedPredict(predictor, AnalyzeRepository)
+    inputs = {"repo_url": "https://github.com/o/r", "file_tree": "README.md", "readme_content": "# R"}
+
+    cached(**inputs)  # empty field
+    cached(**inputs)  # list field left as unparsed text
+    cached(**inputs)  # usable, written
+    replayed = cached(**inputs)
+    lm_cache.set_lm_cache_digest("other-digest")
+    cached(**inputs)  # same inputs, different digest
+
+    assert len(calls) == 4
+    assert replayed.project_purpose == "Events."
+
+    def complete(**kwargs):
+        return dspy.Prediction(project_purpose="P", key_concepts=["c"], architecture_overview="A")
+
+    rejected = CachedPredict(complete, AnalyzeRepository, validate=lambda outputs: False)
+    rejected(**{**inputs, "file_tree": "other"})
+    rejected(**{**inputs, "file_tree": "other"})
+    assert lm_cache.lm_cache_stats()["hits"] == 1
+
+
+def test_response_cache_evicts_least_recently_used_entries(tmp_path):
+    now = [0.0]
+    cache = LMResponseCache(tmp_path / "lm.sqlite3", max_bytes=120, clock=lambda: now[0])
+    for key in ("a", "b", "c"):
+        now[0] += 1
+        cache.put(key, "Sig", "m", {"text": key * 30})
+    assert cache.get("a", "Sig") is None
+    now[0] += 1
+    assert cache.get("b", "Sig") == {"text": "b" * 30}
+
+    now[0] += 1
+    cache.put("d", "Sig", "m", {"text": "d" * 30})
+
+    assert cache.get("c", "Sig") is None
+    assert cache.get("b", "Sig") is not None
+    assert cache.stats()["evictions"] == 2
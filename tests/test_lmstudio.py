@@ -6,7 +6,7 @@ import pytest
 import requests
 
 from lms_llmsTxt.config import AppConfig
-from lms_llmsTxt import pipeline
+from lms_llmsTxt import pipeline, sources
 import lms_llmsTxt.lmstudio as lmstudio
 from lms_llmsTxt.lmstudio import LMStudioConnectivityError
 from lms_llmsTxt.models import AnalyzerTrace
@@ -39,7 +39,7 @@ def test_fetch_models_prefers_v1(monkeypatch):
             raise requests.RequestException("legacy endpoint disabled")
         raise AssertionError(f"Unexpected URL {url}")
 
-    monkeypatch.setattr(lmstudio.requests, "get", fake_get)
+    monkeypatch.setattr(lmstudio._SESSION, "get", fake_get)
     config = AppConfig(
         lm_model="model-a",
         lm_api_base="http://localhost:1234/v1",
@@ -65,7 +65,7 @@ def test_choose_lmstudio_test_model_prefers_small_available_text_model(monkeypat
             }
         )
 
-    monkeypatch.setattr(lmstudio.requests, "get", fake_get)
+    monkeypatch.setattr(lmstudio._SESSION, "get", fake_get)
     config = AppConfig(
         lm_model="missing-large-model",
         lm_api_base="http://localhost:1234/v1",
@@ -87,7 +87,7 @@ def test_choose_lmstudio_test_model_skips_excluded_configured_model(monkeypatch)
             }
         )
 
-    monkeypatch.setattr(lmstudio.requests, "get", fake_get)
+    monkeypatch.setattr(lmstudio._SESSION, "get", fake_get)
     config = AppConfig(
         lm_model="qwen_qwen3-vl-4b-instruct",
         lm_api_base="http://localhost:1234/v1",
@@ -109,7 +109,7 @@ def test_choose_lmstudio_test_model_skips_excluded_preferred_model(monkeypatch):
             }
         )
 
-    monkeypatch.setattr(lmstudio.requests, "get", fake_get)
+    monkeypatch.setattr(lmstudio._SESSION, "get", fake_get)
     config = AppConfig(
         lm_model=None,
         lm_api_base="http://localhost:1234/v1",
@@ -132,7 +132,7 @@ def test_choose_lmstudio_test_model_honors_loaded_preferred_model(monkeypatch):
             payload={"data": [{"id": "small-model-1b"}, {"id": "requested-model"}]}
         )
 
-    monkeypatch.setattr(lmstudio.requests, "get", fake_get)
+    monkeypatch.setattr(lmstudio._SESSION, "get", fake_get)
     config = AppConfig(
         lm_model="missing-large-model",
         lm_api_base="http://localhost:1234/v1",
@@ -164,8 +164,8 @@ def test_ensure_ready_attempts_documented_load_for_missing_model(monkeypatch):
         posts.append((url, json))
         return _FakeResponse()
 
-    monkeypatch.setattr(lmstudio.requests, "get", fake_get)
-    monkeypatch.setattr(lmstudio.requests, "post", fake_post)
+    monkeypatch.setattr(lmstudio._SESSION, "get", fake_get)
+    monkeypatch.setattr(lmstudio._SESSION, "post", fake_post)
     monkeypatch.setattr(lmstudio, "_LMSTUDIO_SDK", None, raising=False)
     monkeypatch.setattr(lmstudio, "_load_model_cli", lambda config: False)
 
@@ -192,7 +192,7 @@ def test_ensure_ready_requires_configured_model(monkeypatch):
     def fake_get(url, headers=None, timeout=None):
         raise AssertionError("LM Studio should not be queried before model config is validated")
 
-    monkeypatch.setattr(lmstudio.requests, "get", fake_get)
+    monkeypatch.setattr(lmstudio._SESSION, "get", fake_get)
 
     config = AppConfig(
         lm_model=None,
@@ -226,7 +226,7 @@ def test_ensure_ready_failure(monkeypatch):
     def fake_get(url, headers=None, timeout=None):
         return _FakeResponse(payload={"data": []})
 
-    monkeypatch.setattr(lmstudio.requests, "get", fake_get)
+    monkeypatch.setattr(lmstudio._SESSION, "get", fake_get)
     monkeypatch.setattr(lmstudio, "_load_model_sdk", lambda config: False)
     monkeypatch.setattr(lmstudio, "_load_model_rest", lambda config: False)
     monkeypatch.setattr(lmstudio, "_load_model_cli", lambda config: False)
@@ -253,7 +253,7 @@ def test_configure_lmstudio_uses_schema_only_json_adapter(monkeypatch):
             self.args = args
             self.kwargs = kwargs
 
-    monkeypatch.setattr(lmstudio.requests, "get", fake_get)
+    monkeypatch.setattr(lmstudio._SESSION, "get", fake_get)
     monkeypatch.setattr(lmstudio.dspy, "LM", FakeLM)
     monkeypatch.setattr(lmstudio.dspy, "configure", lambda **kwargs: configured.update(kwargs))
 
@@ -363,6 +363,52 @@ def test_pipeline_unloads_model(tmp_path, monkeypatch):
     assert Path(artifacts.llms_full_path).exists()
 
 
+def test_pipeline_reads_local_evidence_through_the_run_source(tmp_path, monkeypatch):
+    repo_url = "https://github.com/example/repo"
+    checkout = tmp_path / "checkout"
+    (checkout / "docs").mkdir(parents=True)
+    (checkout / "README.md").write_text("# Title\n\nSummary", encoding="utf-8")
+    (checkout / "docs" / "guide.md").write_text("Guide body", encoding="utf-8")
+
+    opened: list[Path] = []
+
+    class CountingSource(sources.LocalRepositorySource):
+        def __init__(self, root, *args, **kwargs):
+            opened.append(root)
+            super().__init__(root, *args, **kwargs)
+
+    class FakeAnalyzer:
+        def __call__(self, *args, **kwargs):
+            return type("Result", (), {"llms_txt_content": "# Generated\n"})()
+
+    looked_up: dict[str, bytes | None] = {}
+
+    def fake_full(content, *, content_lookup, default_ref, **_):
+        ref = pipeline.GhRef("example", "repo", "docs/guide.md")
+        looked_up["docs/guide.md"] = content_lookup(ref, default_ref)
+        return content
+
+    monkeypatch.setattr(sources, "LocalRepositorySource", CountingSource)
+    monkeypatch.setattr(pipeline, "LocalRepositorySource", CountingSource)
+    monkeypatch.setattr(pipeline, "RepositoryAnalyzer", lambda *a, **k: FakeAnalyzer())
+    monkeypatch.setattr(pipeline, "configure_lmstudio_lm", lambda *a, **k: None)
+    monkeypatch.setattr(pipeline, "unload_lmstudio_model", lambda cfg: None)
+    monkeypatch.setattr(pipeline, "build_llms_full_from_repo", fake_full)
+
+    config = AppConfig(
+        lm_model="model",
+        lm_api_base="http://localhost:1234/v1",
+        lm_api_key="key",
+        output_dir=tmp_path / "artifacts",
+        local_repo_path=checkout,
+    )
+
+    pipeline.run_generation(repo_url, config, build_ctx=False)
+
+    assert opened == [checkout]
+    assert looked_up == {"docs/guide.md": b"Guide body"}
+
+
 def test_pipeline_runs_evidence_planning_before_compaction(tmp_path, monkeypatch):
     repo_url = "https://github.com/example/repo"
     repo_root = tmp_path / "artifacts"
@@ -409,7 +455,7 @@ def test_pipeline_runs_evidence_planning_before_compaction(tmp_path, monkeypatch
     monkeypatch.setattr(pipeline, "build_context_budget", lambda *a, **k: next(decisions))
     monkeypatch.setattr(pipeline, "suggested_evidence_limit", lambda *a, **k: 2)
     monkeypatch.setattr(
-        pipeline,
+        sources,
         "fetch_file_content",
         lambda owner, repo, path, ref, token: f"selected content for {path}",
     )
@@ -446,6 +492,176 @@ def test_pipeline_runs_evidence_planning_before_compaction(tmp_path, monkeypatch
     assert 'Selective evidence planning ran before deterministic compaction.' in trace_text
 
 
+def test_pipeline_shares_link_verdicts_across_compaction_and_cancels_speculative_fallback(tmp_path, monkeypatch):
+    import dataclasses
+    import threading
+
+    from lms_llmsTxt import analyzer as analyzer_module
+
+    repo_url = "https://github.com/example/repo"
+    full_tree = "\n".join(["README.md", "docs/guide.md", "src/cli.py", "src/internal/worker.py"])
+    fake_material = pipeline.RepositoryMaterial(
+        repo_url=repo_url,
+        file_tree=full_tree,
+        readme_content="# Title\n\nSummary",
+        package_files="",
+        default_branch="main",
+        is_private=False,
+    )
+    probes: list[str] = []
+    analyzer_buckets: list[object] = []
+    fallback_results: list[object] = []
+    events: list[str] = []
+
+    def alive(url):
+        probes.append(url)
+        return True
+
+    class FakeAnalyzer:
+        def __call__(self, **kwargs):
+            # The same build arguments the analyzer's evidence planning passes.
+            analyzer_buckets.append(
+                analyzer_module.build_dynamic_buckets(
+                    kwargs["repo_url"],
+                    kwargs["file_tree"],
+                    default_ref=kwargs["default_branch"],
+                    is_private=kwargs["is_private"],
+                    github_token=kwargs["github_token"],
+                    link_style=kwargs["link_style"],
+                    link_validation=kwargs["link_validation"],
+                    verdict_memo=kwargs["verdict_memo"],
+                )
+            )
+            return type("Result", (), {"llms_txt_content": "# Generated\n", "trace": AnalyzerTrace()})()
+
+    class FakeBudget:
+        def __init__(self, decision):
+            self.estimated_prompt_tokens = 10
+            self.available_tokens = 10
+            self.decision = decision
+
+    decisions = iter(
+        [
+            FakeBudget(pipeline.BudgetDecision.NEEDS_COMPACTION),
+            FakeBudget(pipeline.BudgetDecision.APPROVED),
+        ]
+    )
+    real_fallback = pipeline.fallback_llms_payload
+
+    def recording_fallback(**kwargs):
+        events.append("fallback")
+        # Run only once the LM path has finished, so the analyzer probes first.
+        assert kwargs["cancel_event"].wait(timeout=5)
+        result = real_fallback(**kwargs)
+        fallback_results.append(result)
+        return result
+
+    monkeypatch.setattr(pipeline, "prepare_repository_material", lambda *a, **k: fake_material)
+    monkeypatch.setattr(pipeline, "RepositoryAnalyzer", lambda *args, **kwargs: FakeAnalyzer())
+    monkeypatch.setattr(pipeline, "configure_lmstudio_lm", lambda *a, **k: events.append("configure"))
+    monkeypatch.setattr(pipeline, "build_context_budget", lambda *a, **k: next(decisions))
+    monkeypatch.setattr(
+        pipeline,
+        "compact_material",
+        lambda material, *args, **kwargs: dataclasses.replace(material, file_tree="README.md\ndocs/guide.md"),
+    )
+    monkeypatch.setattr(pipeline, "fallback_llms_payload", recording_fallback)
+    monkeypatch.setattr(pipeline, "unload_lmstudio_model", lambda cfg: None)
+    monkeypatch.setattr(analyzer_module, "_url_alive", alive)
+
+    config = AppConfig(
+        lm_model="model",
+        lm_api_base="http://localhost:1234/v1",
+        lm_api_key="key",
+        output_dir=tmp_path / "artifacts",
+    )
+    artifacts = pipeline.run_generation(repo_url, config, build_ctx=False, build_full=False)
+
+    for _ in range(100):
+        if fallback_results:
+            break
+        threading.Event().wait(0.05)
+    run_probes = list(probes)
+    assert artifacts.used_fallback is False
+    assert events[:2] == ["configure", "fallback"]
+    # The analyzer keeps the compacted tree's sections; the fallback probes only the links it adds.
+    assert analyzer_buckets == [
+        analyzer_module.build_dynamic_buckets(repo_url, "README.md\ndocs/guide.md", default_ref="main")
+    ]
+    assert fallback_results == [None]
+    assert len(run_probes) == len(set(run_probes)) == 4
+
+
+def _count_pipeline_lm_calls(tmp_path, monkeypatch, analyzer_mode):
+    from lms_llmsTxt import analyzer as analyzer_module
+
+    repo_url = "https://github.com/example/repo"
+    fake_material = pipeline.RepositoryMaterial(
+        repo_url=repo_url,
+        file_tree="README.md\ndocs/guide.md\nsrc/main.py",
+        readme_content="# Title\n\nSummary of the demo project.",
+        package_files="[project]\nname='demo'",
+        default_branch="main",
+        is_private=False,
+    )
+    outputs = {
+        "project_purpose": "Demo project for processing events.",
+        "key_concepts": ["events"],
+        "architecture_overview": "Single service.",
+        "important_directories": ["src/"],
+        "entry_points": ["src/main.py"],
+        "development_info": "pip install demo",
+        "usage_examples": "demo run",
+        "included_sections": [],
+        "preferred_section_order": [],
+        "remember_bullets": ["Demo bullet"],
+        "section_notes": [],
+    }
+    calls: list[str] = []
+    real_analyzer = analyzer_module.RepositoryAnalyzer
+
+    def counting_analyzer(*args, **kwargs):
+        instance = real_analyzer(*args, **kwargs)
+        for name in (
+            "analyze_repo",
+            "analyze_repo_digest",
+            "analyze_structure",
+            "generate_examples",
+            "plan_sections",
+            "synthesize_section_notes",
+            "analyze_fused",
+            "analyze_fused_digest",
+        ):
+            setattr(instance, name, lambda _name=name, **_: calls.append(_name) or analyzer_module.dspy.Prediction(**outputs))
+        return instance
+
+    monkeypatch.setattr(pipeline, "prepare_repository_material", lambda *a, **k: fake_material)
+    monkeypatch.setattr(pipeline, "RepositoryAnalyzer", counting_analyzer)
+    monkeypatch.setattr(pipeline, "configure_lmstudio_lm", lambda *a, **k: None)
+    monkeypatch.setattr(pipeline, "build_llms_full_from_repo", lambda content, **_: content)
+    monkeypatch.setattr(analyzer_module, "_url_alive", lambda url: True)
+    monkeypatch.setattr(pipeline, "unload_lmstudio_model", lambda cfg: None)
+
+    config = AppConfig(
+        lm_model="model",
+        lm_api_base="http://localhost:1234/v1",
+        lm_api_key="key",
+        output_dir=tmp_path / analyzer_mode,
+        analyzer_mode=analyzer_mode,
+    )
+    artifacts = pipeline.run_generation(repo_url, config, build_ctx=False, build_full=False)
+    assert artifacts.used_fallback is False
+    return calls
+
+
+def test_pipeline_fused_analyzer_mode_cuts_lm_calls(tmp_path, monkeypatch):
+    staged = _count_pipeline_lm_calls(tmp_path, monkeypatch, "staged")
+    fused = _count_pipeline_lm_calls(tmp_path, monkeypatch, "fused")
+
+    assert staged == ["analyze_repo_digest", "generate_examples", "plan_sections", "synthesize_section_notes"]
+    assert fused == ["analyze_fused_digest"]
+
+
 def test_unload_prefers_sdk(monkeypatch):
     handle_unloaded = {}
 
@@ -534,7 +750,7 @@ def test_generate_graph_auto_attempts_dspy_enrichment_for_large_repo_tree(tmp_pa
         enrichment_called["value"] = True
         return graph
 
-    monkeypatch.setattr(pipeline, "fetch_file_content", lambda *a, **k: "def selected():\n    return 'graph evidence'\n")
+    monkeypatch.setattr(sources, "fetch_file_content", lambda *a, **k: "def selected():\n    return 'graph evidence'\n")
     monkeypatch.setattr(pipeline, "enrich_repo_graph_with_dspy", fake_enrich_graph)
 
     config = AppConfig(
@@ -585,7 +801,7 @@ def test_generate_graph_auto_attempts_dspy_enrichment_for_small_evidence(tmp_pat
     monkeypatch.setattr(pipeline, "RepositoryAnalyzer", lambda: FakeAnalyzer())
     monkeypatch.setattr(pipeline, "configure_lmstudio_lm", lambda *a, **k: None)
     monkeypatch.setattr(pipeline, "unload_lmstudio_model", lambda cfg: None)
-    monkeypatch.setattr(pipeline, "fetch_file_content", lambda *a, **k: "def main():\n    return 'graph evidence'\n")
+    monkeypatch.setattr(sources, "fetch_file_content", lambda *a, **k: "def main():\n    return 'graph evidence'\n")
     monkeypatch.setattr(pipeline, "enrich_repo_graph_with_dspy", fake_enrich_graph)
 
     config = AppConfig(
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from lms_llmsTxt.models import RepositoryMaterial
+from lms_llmsTxt.path_index import RepoPathIndex
+
+
+def test_path_index_columns_and_prefix_lookup():
+    index = RepoPathIndex.for_tree("src/b.py\nREADME.md\n\nsrc/a/x.md\n docs/guide.MD \nsrc/b.py")
+
+    assert index.paths == ("README.md", "docs/guide.MD", "src/a/x.md", "src/b.py")
+    assert index.depths == (0, 1, 2, 1)
+    assert index.line_count == 5
+    assert index.with_prefix("src/") == ("src/a/x.md", "src/b.py")
+    assert index.with_prefix("missing/") == ()
+    assert index.with_extension(".md") == ("README.md", "docs/guide.MD", "src/a/x.md")
+    assert "src/b.py" in index and "src" not in index
+    assert index.head(2) == ("src/b.py", "README.md")
+
+
+def test_material_path_index_is_shared_and_follows_tree_changes():
+    material = RepositoryMaterial(
+        repo_url="https://github.com/owner/repo",
+        file_tree="a.py\nb.py",
+        readme_content="",
+        package_files="",
+        default_branch="main",
+        is_private=False,
+    )
+
+    first = material.path_index
+    assert material.path_index is first
+
+    material.file_tree = "a.py"
+    assert material.path_index.paths == ("a.py",)
@@ -1,5 +1,10 @@
+import threading
+import time
+from dataclasses import replace
+
 from lms_llmsTxt.models import RepositoryMaterial
 from lms_llmsTxt.repo_digest import (
+    DigestMemo,
     EvidenceFetchLimits,
     apply_evidence_plan,
     build_repo_digest,
@@ -8,6 +13,7 @@ from lms_llmsTxt.repo_digest import (
     plan_evidence_paths,
     reduce_capsules,
     suggested_evidence_limit,
+    _path_priority,
 )
 
 
@@ -26,6 +32,35 @@ def test_digest_pipeline_is_stable():
     assert digest1.subsystems == digest2.subsystems
 
 
+def test_digest_memo_only_extracts_changed_chunks_and_matches_fresh_build():
+    material = RepositoryMaterial(
+        repo_url="https://github.com/example/repo",
+        file_tree="packages/api/package.json\npackages/api/src/server.ts\nsrc/main.py\nREADME.md",
+        readme_content="# Repo\n\nSample",
+        package_files="=== selected evidence: src/main.py ===\nimport os\ndef main(): pass",
+        default_branch="main",
+        is_private=False,
+    )
+    changed = RepositoryMaterial(
+        repo_url=material.repo_url,
+        file_tree=material.file_tree,
+        readme_content="# Repo\n\nSample, revised",
+        package_files=material.package_files,
+        default_branch="main",
+        is_private=False,
+    )
+    memo = DigestMemo()
+
+    first = build_repo_digest(material, topic="Repo", memo=memo)
+    misses_after_first = memo.capsule_misses
+    second = build_repo_digest(changed, topic="Repo", memo=memo)
+
+    assert first == build_repo_digest(material, topic="Repo")
+    assert second == build_repo_digest(changed, topic="Repo")
+    assert memo.capsule_misses == misses_after_first + 1
+    assert memo.capsule_hits == misses_after_first - 1
+
+
 def test_extract_capsules_and_reduce_empty():
     material = RepositoryMaterial(
         repo_url="x",
@@ -131,3 +166,230 @@ def test_suggested_evidence_limit_shrinks_under_budget_pressure():
     assert suggested_evidence_limit(estimated_prompt_tokens=500, available_tokens=1000) == 80
     assert suggested_evidence_limit(estimated_prompt_tokens=4000, available_tokens=1000) < 80
     assert suggested_evidence_limit(estimated_prompt_tokens=4000, available_tokens=1000) >= 20
+
+
+def test_apply_evidence_plan_batch_fetch_matches_sequential_output():
+    material = RepositoryMaterial(
+        repo_url="https://github.com/example/repo",
+        file_tree="README.md\ndocs/guide.md\nsrc/cli.py\nsrc/a/b/c/deep.py",
+        readme_content="# Repo",
+        package_files="[project]\nname='repo'",
+        default_branch="main",
+        is_private=False,
+    )
+    digest = build_repo_digest(material, topic="Repo")
+    limits = EvidenceFetchLimits(max_fetches=4, max_bytes_per_fetch=40, max_total_bytes=90, max_path_depth=2)
+    contents = {"README.md": "readme " * 10, "docs/guide.md": "", "src/cli.py": "cli " * 20}
+
+    sequential_plan = plan_evidence_paths(material, digest, max_paths=4)
+    sequential = apply_evidence_plan(material, sequential_plan, fetch_content=contents.get, limits=limits)
+
+    batches: list[list[str]] = []
+    batched_plan = plan_evidence_paths(material, digest, max_paths=4)
+    batched = apply_evidence_plan(
+        material,
+        batched_plan,
+        fetch_many=lambda paths: batches.append(list(paths)) or {path: contents.get(path) for path in paths},
+        limits=limits,
+    )
+
+    assert batches == [[path for path in batched_plan.selected_paths if path.count("/") <= 2]]
+    assert batched.package_files == sequential.package_files
+    assert batched_plan.fetch_skipped == sequential_plan.fetch_skipped
+    assert batched_plan.fetched_paths == sequential_plan.fetched_paths
+
+
+def test_apply_evidence_plan_concurrent_fetch_is_byte_identical():
+    paths = [f"docs/page{index}.md" for index in range(8)]
+    material = RepositoryMaterial(
+        repo_url="https://github.com/example/repo",
+        file_tree="\n".join(paths),
+        readme_content="# Repo",
+        package_files="",
+        default_branch="main",
+        is_private=False,
+    )
+    digest = build_repo_digest(material, topic="Repo")
+    threads: set[str] = set()
+
+    def fetch_content(path: str) -> str | None:
+        threads.add(threading.current_thread().name)
+        # Later paths finish first so completion order differs from plan order.
+        time.sleep(0.002 * (8 - int(path[-4])))
+        return None if path.endswith("3.md") else f"{path} body " * 6
+
+    results = []
+    for concurrency in (1, 4):
+        plan = plan_evidence_paths(material, digest, max_paths=8)
+        reduced = apply_evidence_plan(
+            material,
+            plan,
+            fetch_content=fetch_content,
+            limits=EvidenceFetchLimits(max_fetches=8, max_bytes_per_fetch=50, max_total_bytes=180, max_concurrency=concurrency),
+        )
+        results.append((reduced.package_files, plan.fetched_paths, plan.fetch_skipped))
+
+    assert results[0] == results[1]
+    assert any(name.startswith("evidence-fetch") for name in threads)
+
+
+def test_nested_project_roots_resolve_to_the_deepest_manifest():
+    material = RepositoryMaterial(
+        repo_url="https://github.com/example/repo",
+        file_tree="\n".join(
+            [
+                "packages/app/package.json",
+                "packages/app/src/main.ts",
+                "packages/app/plugins/chart/package.json",
+                "packages/app/plugins/chart/src/render/index.ts",
+            ]
+        ),
+        readme_content="",
+        package_files="",
+        default_branch="main",
+        is_private=False,
+    )
+
+    digest = build_repo_digest(material, topic="Repo")
+    paths_by_subsystem = {sub["name"]: sub["paths"] for sub in digest.subsystems}
+
+    assert paths_by_subsystem["packages/app/plugins/chart/src/render"] == ["packages/app/plugins/chart/src/render/index.ts"]
+    assert "packages/app/src/main.ts" in paths_by_subsystem["packages/app/src"]
+
+
+def test_plan_evidence_paths_keeps_top_k_and_a_bounded_dropped_preview():
+    from lms_llmsTxt import repo_digest
+
+    material = RepositoryMaterial(
+        repo_url="https://github.com/example/repo",
+        file_tree="\n".join(
+            ["README.md", "src/app/cli.py", "src/app/core.py", "docs/guide.md"]
+            + [f"src/app/mod_{index:03d}.py" for index in range(200)]
+        ),
+        readme_content="# Repo",
+        package_files="",
+        default_branch="main",
+        is_private=False,
+    )
+    digest = build_repo_digest(material, topic="Repo")
+
+    plan = plan_evidence_paths(material, digest, max_paths=3)
+
+    assert set(plan.selected_paths) == {"README.md", "docs/guide.md", "src/app/cli.py"}
+    assert set(plan.selected_reasons) == set(plan.selected_paths)
+    assert plan.dropped_count == 201
+    assert len(plan.dropped_paths) == repo_digest._DROPPED_PREVIEW_LIMIT
+    assert "src/app/core.py" in plan.dropped_paths
+    assert "README.md" not in plan.dropped_paths
+    # Same ordering as a full sort over every candidate.
+    ranked = sorted(
+        material.path_index.paths,
+        key=lambda path: (-_path_priority(path, digest)[0], path),
+    )
+    assert plan.dropped_paths == ranked[3 : 3 + repo_digest._DROPPED_PREVIEW_LIMIT]
+
+
+def test_build_repo_digest_reuses_snapshot_for_unchanged_tree(tmp_path, monkeypatch):
+    from lms_llmsTxt import repo_digest
+    from lms_llmsTxt.digest_store import configure_digest_store, digest_store_stats
+
+    material = RepositoryMaterial(
+        repo_url="https://github.com/example/repo",
+        file_tree="README.md\nsrc/app/cli.py\nsrc/app/core.py",
+        readme_content="# Repo\n\nfrom app import main",
+        package_files="[project]\nname='repo'",
+        default_branch="main",
+        is_private=False,
+        snapshot_ref="tree:abc123",
+    )
+    configure_digest_store(tmp_path / "repo-digests.sqlite3")
+    try:
+        fresh = build_repo_digest(material, topic="Repo")
+
+        def no_chunking(_material):
+            raise AssertionError("snapshot should skip chunking")
+
+        monkeypatch.setattr(repo_digest, "chunk_repository_material", no_chunking)
+        memo = DigestMemo()
+        assert build_repo_digest(material, topic="Repo", memo=memo) == fresh
+        assert memo.stats()["capsules"] == 2  # README and package files
+        monkeypatch.undo()
+
+        changed = replace(material, readme_content="# Repo v2")
+        assert build_repo_digest(changed, topic="Repo").digest_id != fresh.digest_id
+        assert digest_store_stats() == {"hits": 1, "misses": 2, "writes": 2}
+    finally:
+        configure_digest_store(None)
+
+
+def test_parallel_capsule_extraction_matches_sequential_order_and_reports_timing(monkeypatch):
+    from lms_llmsTxt import repo_digest
+    from lms_llmsTxt.repo_digest import RepoChunk, capsule_extraction_stats, configure_capsule_extraction
+
+    monkeypatch.setattr(repo_digest, "_available_cpus", lambda: 2)
+
+    body = "import os\nfrom pkg import thing\ndef handler(event):\n    return event\n"
+    chunks = [
+        RepoChunk(path="src/a.py", content=body * 40, end_line=160),
+        RepoChunk(path="src/tree_only.py", content="src/tree_only.py"),
+        RepoChunk(path="src/b.py", content=body * 50, end_line=200),
+        RepoChunk(path="README.md", content="# Repo", end_line=1),
+    ]
+    sequential = extract_chunk_capsules(chunks)
+
+    configure_capsule_extraction(workers=2, min_chars=1000)
+    try:
+        parallel = extract_chunk_capsules(chunks, DigestMemo())
+        stats = capsule_extraction_stats()
+    finally:
+        configure_capsule_extraction(workers=0)
+
+    assert parallel == sequential
+    assert stats["chunks"] == 4
+    assert stats["parallel_chunks"] == 2
+    assert stats["tree_chunks"] == 1
+    assert {entry["path"] for entry in stats["slowest"]} == {"src/a.py", "src/b.py", "README.md"}
+    assert all(entry["parallel"] == (entry["path"] != "README.md") for entry in stats["slowest"])
+    assert stats["parallel_seconds"] <= stats["content_seconds"]
+    assert stats["wall_seconds"] >= stats["pool_wait_seconds"] > 0
+
+
+def test_capsule_extraction_stats_report_digest_stage_totals():
+    from lms_llmsTxt.repo_digest import capsule_extraction_stats, configure_capsule_extraction
+
+    material = RepositoryMaterial(
+        repo_url="https://github.com/example/repo",
+        file_tree="README.md\nsrc/app/cli.py",
+        readme_content="# Repo\n\nfrom app import main",
+        package_files="",
+        default_branch="main",
+        is_private=False,
+    )
+    configure_capsule_extraction(workers=0)
+    build_repo_digest(material, topic="Repo")
+    build_repo_digest(material, topic="Repo")
+    stats = capsule_extraction_stats()
+
+    assert set(stats["stage_seconds"]) == {"chunk", "extract", "reduce"}
+    assert stats["chunks"] == 6  # three chunks per build, no memo between them
+    assert stats["stage_seconds"]["extract"] >= stats["wall_seconds"] >= 0
+    assert stats["pool_wait_seconds"] == 0
+
+
+def test_digest_carries_symbols_and_dependencies_from_evidence_code():
+    material = RepositoryMaterial(
+        repo_url="https://github.com/example/repo",
+        file_tree="README.md\nsrc/app/server.py\nsrc/app/util.py",
+        readme_content="# Repo",
+        package_files=(
+            "=== selected evidence: src/app/server.py ===\n"
+            "import requests\n# import commented\n\ndef serve():\n    return requests.get('x')\n"
+        ),
+        default_branch="main",
+        is_private=False,
+    )
+
+    digest = build_repo_digest(material, topic="Repo")
+
+    assert digest.key_dependencies == ["requests"]
+    assert any("serve" in subsystem["key_symbols"] for subsystem in digest.subsystems)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import subprocess
+
+from lms_llmsTxt import analyzer, pipeline
+from lms_llmsTxt.config import AppConfig
+from lms_llmsTxt.sources import GitHubRepositorySource, LocalRepositorySource, open_repository_source
+
+
+def _write(root, rel: str, text: str) -> None:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_local_source_builds_material_from_working_tree(tmp_path):
+    _write(tmp_path, "README.md", "# Demo")
+    _write(tmp_path, "pyproject.toml", "[project]\nname = 'demo'\n")
+    _write(tmp_path, "src/demo/__init__.py", "")
+    _write(tmp_path, ".git/HEAD", "ref: refs/heads/trunk\n")
+    _write(tmp_path, ".git/config", "[core]\n")
+    _write(tmp_path, ".agents/notes.md", "private")
+    _write(tmp_path, "node_modules/pkg/index.js", "")
+
+    source = LocalRepositorySource(tmp_path, "https://github.com/owner/demo")
+    material = source.load_material()
+
+    assert material.file_tree.splitlines() == ["README.md", "pyproject.toml", "src/demo/__init__.py"]
+    assert material.readme_content == "# Demo"
+    assert material.package_files == "=== pyproject.toml ===\n[project]\nname = 'demo'\n"
+    assert material.default_branch == "trunk"
+    assert material.repo_url == "https://github.com/owner/demo"
+
+
+def test_local_source_keys_material_on_head_commit_or_listing(tmp_path):
+    commit = "0123456789abcdef0123456789abcdef01234567"
+    repo_root = tmp_path / "repo"
+    _write(repo_root, "README.md", "# Demo")
+    _write(repo_root, ".git/HEAD", "ref: refs/heads/main\n")
+    _write(repo_root, ".git/packed-refs", f"# pack-refs with: peeled\n{commit} refs/heads/main\n")
+    plain_root = tmp_path / "plain"
+    _write(plain_root, "README.md", "# Demo")
+
+    packed = LocalRepositorySource(repo_root, "https://github.com/owner/demo").load_material()
+    first = LocalRepositorySource(plain_root, "https://github.com/owner/demo").load_material()
+    _write(plain_root, "docs/new.md", "new")
+    second = LocalRepositorySource(plain_root, "https://github.com/owner/demo").load_material()
+
+    assert packed.snapshot_ref == f"commit:{commit}"
+    assert first.snapshot_ref and first.snapshot_ref.startswith("listing:")
+    assert second.snapshot_ref != first.snapshot_ref
+
+
+def test_local_source_links_survive_without_network(tmp_path, monkeypatch):
+    _write(tmp_path, "README.md", "# Demo")
+    _write(tmp_path, "docs/guide.md", "guide")
+    _write(tmp_path, "docs/install.md", "install")
+
+    def offline(*args, **kwargs):
+        raise AssertionError("local mode must not probe links")
+
+    monkeypatch.setattr(analyzer, "_url_alive", offline)
+    monkeypatch.setattr(analyzer, "_github_path_exists", offline)
+    material = LocalRepositorySource(tmp_path, "https://github.com/owner/demo").load_material()
+    config = AppConfig(local_repo_path=tmp_path, link_validation_mode="network")
+
+    buckets = analyzer.build_dynamic_buckets(
+        material.repo_url,
+        material.file_tree,
+        default_ref=material.default_branch,
+        is_private=material.is_private,
+        github_token="token",
+        link_validation=pipeline._link_validation_mode(config),
+    )
+
+    assert material.is_private is True
+    assert sorted(url for _, items in buckets for _, url, _ in items) == [
+        "https://github.com/owner/demo/blob/main/README.md",
+        "https://github.com/owner/demo/blob/main/docs/guide.md",
+        "https://github.com/owner/demo/blob/main/docs/install.md",
+    ]
+
+
+def test_local_source_reads_files_inside_the_checkout_only(tmp_path):
+    repo_root = tmp_path / "repo"
+    _write(repo_root, "docs/guide.md", "guide")
+    _write(tmp_path, "secret.txt", "outside")
+
+    source = LocalRepositorySource(repo_root, "https://github.com/owner/demo")
+
+    assert source.read_file("docs/guide.md", "main") == "guide"
+    assert source.read_file("missing.md", "main") is None
+    assert source.read_file("../secret.txt", "main") is None
+    (repo_root / "docs" / "escape.md").symlink_to(tmp_path / "secret.txt")
+    assert source.read_file("docs/escape.md", "main") is None
+
+
+def test_local_source_lists_git_files_and_honours_gitignore(tmp_path):
+    _write(tmp_path, "README.md", "# Demo")
+    _write(tmp_path, ".gitignore", "build/\n.env\n")
+    _write(tmp_path, "src/app.py", "print('hi')\n")
+    _write(tmp_path, "notes/draft.md", "untracked but not ignored")
+    _write(tmp_path, "build/out.js", "generated")
+    _write(tmp_path, ".env", "SECRET=1")
+    git = ["git", "-C", str(tmp_path), "-c", "user.name=t", "-c", "user.email=t@example.com"]
+    subprocess.run([*git, "init", "-q", "-b", "main"], check=True)
+    subprocess.run([*git, "add", "README.md", ".gitignore", "src/app.py"], check=True)
+    subprocess.run([*git, "commit", "-q", "-m", "init"], check=True)
+    head = subprocess.run([*git, "rev-parse", "HEAD"], check=True, capture_output=True, text=True).stdout.strip()
+
+    material = LocalRepositorySource(tmp_path, "https://github.com/owner/demo").load_material()
+
+    assert material.file_tree.splitlines() == [".gitignore", "README.md", "notes/draft.md", "src/app.py"]
+    assert material.snapshot_ref == f"commit:{head}"
+
+
+def test_local_source_follows_gitdir_file_of_a_linked_worktree(tmp_path):
+    commit = "0123456789abcdef0123456789abcdef01234567"
+    common = tmp_path / "main" / ".git"
+    _write(common, "refs/heads/feature", f"{commit}\n")
+    _write(common, "worktrees/feature/HEAD", "ref: refs/heads/feature\n")
+    _write(common, "worktrees/feature/commondir", "../..\n")
+    worktree = tmp_path / "feature"
+    _write(worktree, ".git", f"gitdir: {common / 'worktrees' / 'feature'}\n")
+    _write(worktree, "README.md", "# Demo")
+
+    material = LocalRepositorySource(worktree, "https://github.com/owner/demo").load_material()
+
+    assert material.file_tree == "README.md"
+    assert material.default_branch == "feature"
+    assert material.snapshot_ref == f"commit:{commit}"
+
+
+def test_open_repository_source_prefers_local_path(tmp_path):
+    assert isinstance(
+        open_repository_source("https://github.com/owner/demo", local_path=tmp_path),
+        LocalRepositorySource,
+    )
+    assert isinstance(open_repository_source("https://github.com/owner/demo"), GitHubRepositorySource)
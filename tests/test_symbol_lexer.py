@@ -0,0 +1,130 @@
+from lms_llmsTxt.symbol_lexer import language_for_path, lex_symbols
+
+
+def test_python_skips_strings_and_comments_and_orders_top_level_first():
+    source = '''"""Docs mention def fake() and import fakemod."""
+import os, sys as system
+from collections.abc import Mapping
+from .local import thing
+# def commented(): pass
+class Runner:
+    def run(self):
+        text = "class NotReal: import nope"
+        return f'def alsofake {text}'
+
+async def main():
+    pass
+undef = 1
+'''
+
+    symbols, dependencies = lex_symbols(source, "python")
+
+    assert symbols == ["Runner", "main", "run"]
+    assert dependencies == ["os", "sys", "collections.abc"]
+
+
+def test_python_async_blocks_are_not_symbols():
+    source = "async def run():\n    async with lock:\n        pass\n    async for x in y:\n        pass\n"
+
+    assert lex_symbols(source, "python") == (["run"], [])
+
+
+def test_typescript_reads_module_strings_and_modifiers():
+    source = """import React, { useState } from "react";
+import type { Props } from './local';
+const fs = require('fs');
+// import nothing from "commented";
+const message = "class Fake {}";
+export default function App() {
+  const inner = 1;
+}
+export interface Options { a: string }
+type Alias<T> = Props<T>;
+const lazy = import("@scope/lazy");
+const template = `function notReal() ${message}`;
+"""
+
+    symbols, dependencies = lex_symbols(source, "typescript")
+
+    assert dependencies == ["react", "fs", "@scope/lazy"]
+    assert {"App", "Options", "Alias", "fs", "message", "lazy", "template"} <= set(symbols)
+    assert "inner" not in symbols and "Fake" not in symbols and "notReal" not in symbols
+
+
+def test_javascript_reads_module_strings_without_typescript_keywords():
+    source = """export * from "pkg-reexport";
+import "side-effect";
+const x = notrequire("nope");
+interface = 1;
+"""
+
+    assert lex_symbols(source, "javascript") == (["x"], ["pkg-reexport", "side-effect"])
+
+
+def test_rust_go_and_java_definitions_and_imports():
+    rust = """use std::collections::HashMap;
+use serde::{Deserialize, Serialize};
+use crate::internal::Thing;
+pub struct Config<'a> { name: &'a str }
+impl<'a> Config<'a> {
+    pub fn new(name: &'a str) -> Self { let c = 'x'; let s = r#"fn fake() "quoted""#; Self { name } }
+}
+macro_rules! shout { () => {} }
+"""
+    go = """package main
+
+import (
+    "fmt"
+    nethttp "net/http"
+)
+
+type Server struct{}
+func (s *Server) Start() error { return nil }
+func main() { x := "func fake()"; _ = `type Raw` }
+"""
+    java = """import java.util.List;
+import static org.junit.Assert.*;
+/* class Commented {} */
+public class Service {
+    private static final String S = "class Fake";
+}
+"""
+
+    assert lex_symbols(rust, "rust") == (["Config", "shout", "new"], ["std::collections::HashMap", "serde"])
+    assert lex_symbols(go, "go") == (["Server", "Start", "main"], ["fmt", "net/http"])
+    assert lex_symbols(java, "java") == (["Service"], ["java.util.List", "org.junit.Assert.*"])
+
+
+def test_markdown_reads_only_fenced_code_in_supported_languages():
+    readme = """# Title
+Use this import helper from your app.
+```python
+from mylib import Client
+def demo(): pass
+```
+```bash
+import nothing
+```
+"""
+
+    assert lex_symbols(readme, "markdown") == (["demo"], ["mylib"])
+    assert language_for_path("src/app.tsx") == "typescript"
+    assert language_for_path("docs.v2/Makefile") is None
+
+
+def test_unknown_languages_fall_back_to_generic_keyword_patterns():
+    ruby = """require 'json'
+require_relative "helpers"
+class Greeter
+  def greet(name)
+    undefined_thing = name
+  end
+end
+"""
+    php = "<?php\nuse App\\Models\\User;\nfunction render($user) {}\n"
+
+    assert language_for_path("lib/greeter.rb") is None
+    assert lex_symbols(ruby, None) == (["Greeter", "greet"], ["json"])
+    assert lex_symbols("import foo.bar\nfrom baz import qux\n", None)[1] == ["foo.bar", "baz", "qux"]
+    assert lex_symbols(php, None) == (["render"], ["App"])
+    assert lex_symbols("pub fn start() {}", None) == (["start"], [])
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pytest
+
+from lms_llmsTxt import analyzer, url_liveness
+from lms_llmsTxt.url_liveness import URLLivenessCache
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_cache():
+    yield
+    url_liveness.configure_liveness_cache(None)
+
+
+def test_liveness_cache_applies_positive_and_negative_ttls(tmp_path):
+    now = [1_000.0]
+    cache = URLLivenessCache(tmp_path / "live.sqlite3", positive_ttl=100, negative_ttl=10, clock=lambda: now[0])
+    cache.put("https://ok.example", True, 200)
+    cache.put("https://dead.example", False, 404)
+
+    now[0] += 50
+    assert cache.get("https://ok.example") is True
+    assert cache.get("https://dead.example") is None
+    assert cache.get("https://unknown.example") is None
+    assert cache.stats() == {"hits": 1, "misses": 2}
+
+    reopened = URLLivenessCache(tmp_path / "live.sqlite3", positive_ttl=100, negative_ttl=10, clock=lambda: now[0])
+    assert reopened.get("https://ok.example") is True
+
+
+def test_url_alive_probes_once_and_reuses_cached_verdict(tmp_path, monkeypatch):
+    url_liveness.configure_liveness_cache(tmp_path / "live.sqlite3")
+    probes: list[str] = []
+
+    def fake_probe(url):
+        probes.append(url)
+        return 404
+
+    monkeypatch.setattr(analyzer, "_probe_url", fake_probe)
+
+    assert analyzer._url_alive("https://docs.example/missing") is False
+    assert analyzer._url_alive("https://docs.example/missing") is False
+    assert probes == ["https://docs.example/missing"]